@@ -1,22 +1,42 @@
 if "bpy" in locals():
     import importlib
+    importlib.reload(export_cache)
+    importlib.reload(export_profiler)
+    importlib.reload(name_scope)
     importlib.reload(license_templates)
     importlib.reload(node_group_gatherer)
+    importlib.reload(node_group_reuse)
     importlib.reload(node_settings)
+    importlib.reload(node_settings_emitter)
+    importlib.reload(node_settings_resolver)
+    importlib.reload(node_tree_snapshot)
+    importlib.reload(node_tree_fingerprint)
+    importlib.reload(node_tree_payload)
     importlib.reload(node_tree_exporter)
     importlib.reload(ntp_operator)
     importlib.reload(ntp_options)
+    importlib.reload(api)
     importlib.reload(utils)
     importlib.reload(compositor)
     importlib.reload(geometry)
     importlib.reload(shader)
 else:
+    from . import export_cache
+    from . import export_profiler
+    from . import name_scope
     from . import license_templates
     from . import node_group_gatherer
+    from . import node_group_reuse
     from . import node_settings
+    from . import node_settings_emitter
+    from . import node_settings_resolver
+    from . import node_tree_snapshot
+    from . import node_tree_fingerprint
+    from . import node_tree_payload
     from . import node_tree_exporter
     from . import ntp_operator
     from . import ntp_options
+    from . import api
     from . import utils
     from . import compositor
     from . import geometry
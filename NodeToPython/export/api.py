@@ -0,0 +1,111 @@
+"""
+Python API for exporting node trees from scripts, without filling the
+scene's NodeToPython slots or running the export operator. Works in
+background mode (blender -b), i.e.
+
+    from NodeToPython.export import api
+
+    result = api.export([bpy.data.materials["Material"]])
+    print(result.script)
+
+    options = api.ExportOptions(mode='ADDON', dir_path="/tmp", name="Assets")
+    print(api.export(bpy.data.node_groups, options).path)
+"""
+import bpy
+
+from .node_group_gatherer import NodeGroupGatherer, NTPObject
+from .ntp_operator import ExportSession
+from .ntp_options import NTP_PG_Options
+
+def _default_value(prop):
+    """
+    Gets the default value of a property declared on NTP_PG_Options
+
+    Parameters:
+    prop: deferred property from the property group's annotations
+
+    Returns:
+    default value of the property
+    """
+    keywords = prop.keywords
+    if "default" in keywords:
+        return keywords["default"]
+    if prop.function is bpy.props.EnumProperty:
+        return keywords["items"][0][0]
+    if prop.function is bpy.props.StringProperty:
+        return ""
+    if prop.function is bpy.props.BoolProperty:
+        return False
+    return 0
+
+class ExportOptions():
+    """
+    Export options as a plain Python object, with the same names and
+    defaults as the NodeToPython options panel (NTP_PG_Options)
+    """
+    def __init__(self, **options):
+        """
+        Parameters:
+        options: option values overriding the defaults
+        """
+        for name, prop in NTP_PG_Options.__annotations__.items():
+            setattr(self, name, _default_value(prop))
+        for name, value in options.items():
+            if name not in NTP_PG_Options.__annotations__:
+                raise TypeError(f"Unknown export option \"{name}\"")
+            setattr(self, name, value)
+
+class ExportResult():
+    """
+    Output of an export
+    """
+    def __init__(self):
+        # Generated script, in script mode
+        self.script: str = ""
+
+        # Path of the add-on zip file or blend file, in add-on and blend
+        # file mode
+        self.path: str = ""
+
+        # Path of the profile report, if the export was profiled
+        self.profile_path: str = ""
+
+        # Messages reported during the export
+        self.reports: list[tuple[set[str], str]] = []
+
+def export(
+    data_blocks: list[NTPObject],
+    options: ExportOptions | None = None
+) -> ExportResult:
+    """
+    Exports node groups, scenes, lights, line styles, materials and worlds
+
+    Parameters:
+    data_blocks (list[NTPObject]): data blocks to export
+    options (ExportOptions | None): export options, defaults if None
+
+    Returns:
+    (ExportResult): generated script or written file, and reports
+
+    Raises:
+    RuntimeError: if the export was cancelled
+    """
+    if options is None:
+        options = ExportOptions()
+
+    gatherer = NodeGroupGatherer()
+    gatherer.gather_data_blocks(list(data_blocks))
+
+    result = ExportResult()
+    session = ExportSession(
+        lambda type, message: result.reports.append((type, message))
+    )
+    if session.export(gatherer, options) != {'FINISHED'}:
+        messages = [message for type, message in result.reports
+                    if 'ERROR' in type or 'WARNING' in type]
+        raise RuntimeError("\n".join(messages) or "Export was cancelled")
+
+    result.script = session._script
+    result.path = session._output_path
+    result.profile_path = session._profile_path
+    return result
@@ -0,0 +1,116 @@
+import os
+
+class CodeEmitter():
+    """
+    Buffers generated code in memory, one buffer per output module, so
+    every module is written out exactly once when the export is done
+    """
+    def __init__(self, indentation: str = "    "):
+        # String used for each indentation level
+        self._indentation: str = indentation
+
+        # Indentation level -> indentation string
+        self._indent_strs: list[str] = [""]
+
+        # Module name -> generated lines
+        self._modules: dict[str, list[str]] = {}
+
+        # Lines of the module currently being generated
+        self._lines: list[str] = self._modules.setdefault("", [])
+
+        # Lines that were being written to before each capture in progress
+        self._captured_lines: list[list[str]] = []
+
+    def set_module(self, module: str) -> None:
+        """
+        Switches the module subsequent lines are written to, creating its
+        buffer if it doesn't exist yet
+
+        Parameters:
+        module (str): name of the module
+        """
+        self._lines = self._modules.setdefault(module, [])
+
+    def indent_str(self, indent_level: int) -> str:
+        """
+        Gets the indentation string for an indentation level
+
+        Parameters:
+        indent_level (int): indentation level
+
+        Returns:
+        (str): indentation string
+        """
+        while len(self._indent_strs) <= indent_level:
+            self._indent_strs.append(
+                self._indent_strs[-1] + self._indentation
+            )
+        return self._indent_strs[indent_level]
+
+    def write(self, string: str, indent_level: int) -> None:
+        """
+        Writes a line to the current module
+
+        Parameters:
+        string (str): line to write
+        indent_level (int): indentation level of the line
+        """
+        if indent_level < len(self._indent_strs):
+            indent_str = self._indent_strs[indent_level]
+        else:
+            indent_str = self.indent_str(indent_level)
+        self._lines.append(f"{indent_str}{string}\n")
+
+    def append(self, code: str) -> None:
+        """
+        Appends already generated and indented code to the current module
+
+        Parameters:
+        code (str): code to append
+        """
+        if code != "":
+            self._lines.append(code)
+
+    def begin_capture(self) -> None:
+        """
+        Starts collecting subsequent lines separately, so they can be
+        written out later than they were generated
+        """
+        self._captured_lines.append(self._lines)
+        self._lines = []
+
+    def end_capture(self) -> str:
+        """
+        Stops collecting lines started by the matching begin_capture()
+
+        Returns:
+        (str): code generated since the capture began
+        """
+        code = "".join(self._lines)
+        self._lines = self._captured_lines.pop()
+        return code
+
+    def getvalue(self, module: str = "") -> str:
+        """
+        Gets the generated code of a module
+
+        Parameters:
+        module (str): name of the module
+
+        Returns:
+        (str): generated code
+        """
+        return "".join(self._modules.get(module, []))
+
+    def flush(self, dir_path: str) -> None:
+        """
+        Writes every module to a Python file in a directory
+
+        Parameters:
+        dir_path (str): directory to write the modules to
+        """
+        for module, lines in self._modules.items():
+            if module == "":
+                continue
+            with open(os.path.join(dir_path, f"{module}.py"), 'w') as file:
+                file.write("".join(lines))
@@ -1,10 +1,12 @@
 import bpy
 
 from ..node_group_gatherer import NodeGroupType
-from ..node_settings import NTPNodeSetting, ST
+from ..node_settings import node_settings, NTPNodeSetting, ST
+from ..node_settings_resolver import resolve_node_settings
 from ..node_tree_exporter import NodeTreeExporter, INDEX, NODE_TREE_NAMES
+from ..node_tree_snapshot import NodeSnapshot
 from ..ntp_node_tree import NTP_NodeTree
-from ..ntp_operator import NTP_OT_Export, NodeTreeInfo
+from ..ntp_operator import ExportSession, NodeTreeInfo
 from ..utils import *
 
 BASE_NAME = "base_name"
@@ -16,18 +18,18 @@ COMP_OP_RESERVED_NAMES = {BASE_NAME, END_NAME, NODE}
 class CompositorExporter(NodeTreeExporter):
     def __init__(
         self,
-        ntp_operator: NTP_OT_Export,
+        ntp_operator: ExportSession,
         node_tree_info: NodeTreeInfo
     ):
         if not node_tree_info._group_type.is_compositor():
-            ntp_operator.report(
+            ntp_operator._report(
                 {'ERROR'},
                 f"Cannot initialize CompositorExporter with group type "
                 f"{node_tree_info._group_type}"
             )
         NodeTreeExporter.__init__(self, ntp_operator, node_tree_info)
         for name in COMP_OP_RESERVED_NAMES:
-            self._used_vars[name] = 0
+            self._names.reserve(name)
     
     def _create_scene(self):
         indent_level = self._get_obj_creation_indent()
@@ -78,26 +80,19 @@ class CompositorExporter(NodeTreeExporter):
             "use_stamp_note"
         ]
 
-        for attr in regular_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {getattr(scene, attr)}",
-                indent_level
-            )
-        for attr in enum_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {enum_to_py_str(getattr(scene, attr))}",
-                indent_level
-            )
-        for attr in vec3_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {vec3_to_py_str(getattr(scene, attr))}",
-                indent_level
-            )
-        for attr in str_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {str_to_py_str(getattr(scene, attr))}",
-                indent_level
-            )
+        reference = self._get_reference_obj("scenes")
+        self._set_obj_settings(
+            scene, reference, regular_attrs, str, indent_level
+        )
+        self._set_obj_settings(
+            scene, reference, enum_attrs, enum_to_py_str, indent_level
+        )
+        self._set_obj_settings(
+            scene, reference, vec3_attrs, vec3_to_py_str, indent_level
+        )
+        self._set_obj_settings(
+            scene, reference, str_attrs, str_to_py_str, indent_level
+        )
         self._write("", 0)
 
     # NodeTreeExporter interface
@@ -112,9 +107,6 @@ class CompositorExporter(NodeTreeExporter):
     ) -> None:
         nt_name = ntp_node_tree._node_tree.name
 
-        self._node_tree_info._func = self._operator._create_var(
-            f"{ntp_node_tree._var}_node_group"
-        )
         #initialize node group
         self._write(f"def {self._node_tree_info._func}("
                     f"{NODE_TREE_NAMES}: dict[typing.Callable, str]):", 
@@ -139,6 +131,7 @@ class CompositorExporter(NodeTreeExporter):
             self._write(f"{ntp_node_tree._var}.nodes.remove({NODE})", 
                         self._operator._inner_indent_level + 1)
         else:
+            self._reuse_existing_node_group()
             self._write((f"{ntp_node_tree._var} = bpy.data.node_groups.new("
                          f"type = \'CompositorNodeTree\', "
                          f"name = {str_to_py_str(nt_name)})"))
@@ -164,24 +157,35 @@ class CompositorExporter(NodeTreeExporter):
             if getattr(ntp_node_tree._node_tree, bool_setting) is True:
                 self._write(f"{ntp_node_tree._var}.{bool_setting} = True")
 
-    def _process_node(self, node: bpy.types.Node, ntp_nt: NTP_NodeTree) -> None:
-        if bpy.app.version < (4, 5, 0):
+    if bpy.app.version < (4, 5, 0):
+        def _get_node_attributes(
+            self, 
+            node: NodeSnapshot
+        ) -> tuple[NTPNodeSetting, ...]:
             if node.bl_idname == 'CompositorNodeColorBalance':
-                self._set_color_balance_settings(node)
-        NodeTreeExporter._process_node(self, node, ntp_nt)
+                return self._get_color_balance_attributes(node)
+            return NodeTreeExporter._get_node_attributes(self, node)
 
-    if bpy.app.version < (4, 5, 0):
-        def _set_color_balance_settings(
+        def _get_color_balance_attributes(
             self, 
-            node: bpy.types.CompositorNodeColorBalance
-        ) -> None:
+            node: NodeSnapshot
+        ) -> tuple[NTPNodeSetting, ...]:
             """
-            Sets the color balance settings so we only set the active variables,
+            Gets the color balance settings so we only set the active variables,
             preventing conflict
 
+            Parameters:
             node (CompositorNodeColorBalance): the color balance node
+
+            Returns:
+            (tuple[NTPNodeSetting, ...]): settings for the node's correction
+                method
             """
             correction_method = getattr(node, "correction_method")
+            key = f"{node.bl_idname}.{correction_method}"
+            if key in self._operator._node_attributes:
+                return self._operator._node_attributes[key]
+
             if correction_method == 'LIFT_GAMMA_GAIN':
                 lst = [
                     NTPNodeSetting("correction_method", ST.ENUM),                 
@@ -212,10 +216,14 @@ class CompositorExporter(NodeTreeExporter):
                     NTPNodeSetting("output_tint", ST.FLOAT, max_version_=(4, 5, 0))
                 ]
             else:
-                self._operator.report({'ERROR'},
+                self._operator._report({'ERROR'},
                             f"Unknown color balance correction method "
                             f"{enum_to_py_str(correction_method)}")
-                return
+                return NodeTreeExporter._get_node_attributes(self, node)
 
-            color_balance_info = self._node_settings['CompositorNodeColorBalance']
-            self._node_settings['CompositorNodeColorBalance'] = color_balance_info._replace(attributes_ = lst)
\ No newline at end of file
+            color_balance_info = node_settings['CompositorNodeColorBalance']
+            attributes = resolve_node_settings(
+                color_balance_info._replace(attributes_ = lst),
+                tuple(bpy.app.version)
+            )
+            return self._validate_node_attributes(node, key, attributes)
\ No newline at end of file
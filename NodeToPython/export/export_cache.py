@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import tomllib
+
+from .name_scope import NameScope
+
+# Directory next to the generated add-ons holding the caches
+CACHE_DIR_NAME = ".ntp_cache"
+
+# Bump whenever the layout of cache files changes
+CACHE_FORMAT = 2
+
+def _read_ntp_version() -> str:
+    """
+    Reads NodeToPython's version from its manifest, so code generated by
+    other versions isn't reused
+
+    Returns:
+    (str): the version, or an empty string if the manifest can't be read
+    """
+    manifest_path = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "blender_manifest.toml"
+    )
+    try:
+        with open(manifest_path, 'rb') as file:
+            return str(tomllib.load(file).get("version", ""))
+    except (OSError, tomllib.TOMLDecodeError):
+        return ""
+
+NTP_VERSION = _read_ntp_version()
+
+def cache_key(*parts) -> str:
+    """
+    Hashes everything that affects the code generated for a node tree into
+    a cache key
+
+    Parameters:
+    parts: plain Python values with a stable repr
+
+    Returns:
+    (str): the cache key
+    """
+    data = repr((NTP_VERSION, CACHE_FORMAT, parts)).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class ExportCache():
+    """
+    Generated code of node trees from previous exports of an add-on, stored
+    on disk by cache key, so unchanged node trees don't have to be
+    generated again
+
+    Variable names created for a node tree depend on the names used across
+    the export, so each entry also keeps what the export's scope had for 
+    the node tree's names, and is only reused if that's still the same
+    """
+    def __init__(self, dir_path: str, name: str):
+        # Path of the cache file
+        self._path: str = os.path.join(
+            dir_path, CACHE_DIR_NAME, f"{name}.json"
+        )
+
+        # Cache key -> (generated code, reports, elided bytes, the export 
+        # scope's usage counts of the node tree's names) from the previous 
+        # export
+        self._entries: dict[str, tuple[str, list, int, dict]] = {}
+
+        # Cache key -> (generated code, reports, elided bytes, the export 
+        # scope's usage counts of the node tree's names) used by this export
+        self._used: dict[str, tuple[str, list, int, dict]] = {}
+
+        # Number of node trees reused from the cache
+        self.hits: int = 0
+
+        # Number of node trees generated and added to the cache
+        self.misses: int = 0
+
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Reads the cache file, starting with an empty cache if it's missing
+        or unreadable
+        """
+        try:
+            with open(self._path, 'r', encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+            return
+        if not isinstance(data.get("entries"), dict):
+            return
+        for key, (code, reports, elided_bytes, parent_counts) in (
+            data["entries"].items()
+        ):
+            reports = [(set(type), message) for type, message in reports]
+            self._entries[key] = (code, reports, elided_bytes, parent_counts)
+
+    def get(
+        self, 
+        key: str, 
+        export_names: NameScope
+    ) -> tuple[str, list, int, dict] | None:
+        """
+        Gets the generated code, reports and elided bytes of a node tree
+
+        Parameters:
+        key (str): cache key of the node tree
+        export_names (NameScope): names used across the export
+
+        Returns:
+        (tuple[str, list, int, dict] | None): generated code, reports, 
+            elided bytes and the export scope's usage counts of the node 
+            tree's names, or None if the node tree isn't cached
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        for name, count in entry[3].items():
+            if export_names.count(name) != count:
+                return None
+        self.hits += 1
+        self._used[key] = entry
+        return entry
+
+    def put(
+        self, 
+        key: str, 
+        code: str, 
+        reports: list, 
+        elided_bytes: int,
+        parent_counts: dict[str, int | None]
+    ) -> None:
+        """
+        Adds the generated code of a node tree
+
+        Parameters:
+        key (str): cache key of the node tree
+        code (str): generated code
+        reports (list[tuple[set[str], str]]): reports made while generating
+        elided_bytes (int): bytes elided while generating
+        parent_counts (dict[str, int | None]): the export scope's usage 
+            counts of the names used in the node tree's scope
+        """
+        self.misses += 1
+        self._used[key] = (code, reports, elided_bytes, parent_counts)
+
+    def save(self) -> None:
+        """
+        Writes the node trees used by this export to the cache file,
+        dropping entries that are no longer used. The file is left alone
+        if nothing changed
+        """
+        if self._used.keys() == self._entries.keys():
+            return
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        entries = {}
+        for key, (code, reports, elided_bytes, parent_counts) in (
+            self._used.items()
+        ):
+            reports = [(sorted(type), message) for type, message in reports]
+            entries[key] = (code, reports, elided_bytes, parent_counts)
+        with open(self._path, 'w', encoding="utf-8") as file:
+            json.dump({"format": CACHE_FORMAT, "entries": entries}, file)
@@ -0,0 +1,295 @@
+import contextlib
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+
+# Suffix of the report written next to the export's output
+PROFILE_FILE_SUFFIX = "_profile.json"
+
+# Number of node types, functions and allocation sites listed in the report
+NUM_HOTTEST = 20
+
+class ExportProfiler():
+    """
+    Times the phases of an export, both export-wide and per node tree, and
+    counts what was generated for each node tree. Can also profile function
+    calls with cProfile, or trace memory allocations with tracemalloc
+
+    Phases nest, i.e. a node tree's "nodes" phase includes saving its images.
+    Time spent paused, i.e. while Blender runs between steps of the export,
+    isn't counted in the total or in any phase
+    """
+    def __init__(self, tool: str):
+        # 'TIMING', 'CPROFILE' or 'TRACEMALLOC'
+        self._tool: str = tool
+
+        # Export-wide phase -> seconds spent in it
+        self._phases: dict[str, float] = {}
+
+        # Node tree name -> phase -> seconds spent in it
+        self._tree_phases: dict[str, dict[str, float]] = {}
+
+        # Node tree name -> counter -> count, i.e. nodes, links and lines
+        self._tree_counts: dict[str, dict[str, int]] = {}
+
+        # Node type -> (number of nodes, seconds spent generating them)
+        self._node_types: dict[str, list] = {}
+
+        # Phase -> peak bytes allocated while in it, with tracemalloc
+        self._peak_bytes: dict[str, int] = {}
+
+        # Phases in progress, innermost last, with tracemalloc
+        self._open_phases: list[str] = []
+
+        # Function call profile, with cProfile
+        self._profile: cProfile.Profile | None = None
+
+        # Allocation snapshot at the end of the export, with tracemalloc
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+        self._start_time: float = 0.0
+        self._total_seconds: float = 0.0
+
+        # Seconds spent paused so far, and when the current pause started
+        self._paused_seconds: float = 0.0
+        self._pause_time: float | None = None
+
+    def start(self) -> None:
+        """
+        Starts profiling the export
+        """
+        self._start_time = time.perf_counter()
+        if self._tool == 'CPROFILE':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self._tool == 'TRACEMALLOC':
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        """
+        Stops profiling the export
+        """
+        self.resume()
+        self._total_seconds = (time.perf_counter() - self._start_time
+                               - self._paused_seconds)
+        if self._profile is not None:
+            self._profile.disable()
+        elif self._tool == 'TRACEMALLOC' and tracemalloc.is_tracing():
+            self._record_peak()
+            self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def pause(self) -> None:
+        """
+        Pauses profiling, i.e. while the export waits for the next UI frame
+        """
+        if self._pause_time is not None:
+            return
+        self._pause_time = time.perf_counter()
+        if self._profile is not None:
+            self._profile.disable()
+        elif self._tool == 'TRACEMALLOC' and tracemalloc.is_tracing():
+            self._record_peak()
+
+    def resume(self) -> None:
+        """
+        Resumes profiling after pause()
+        """
+        if self._pause_time is None:
+            return
+        self._paused_seconds += time.perf_counter() - self._pause_time
+        self._pause_time = None
+        if self._profile is not None:
+            self._profile.enable()
+        elif self._tool == 'TRACEMALLOC' and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def _record_peak(self) -> None:
+        """
+        Attributes the peak allocated since the last reset to every phase
+        in progress, then resets it
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for phase in self._open_phases + ["total"]:
+            self._peak_bytes[phase] = max(self._peak_bytes.get(phase, 0), peak)
+        tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def phase(self, name: str, node_tree: str | None = None):
+        """
+        Times a phase of the export
+
+        Parameters:
+        name (str): name of the phase
+        node_tree (str | None): name of the node tree the phase belongs to,
+            or None for export-wide phases
+        """
+        if node_tree is None:
+            phases = self._phases
+        else:
+            phases = self._tree_phases.setdefault(node_tree, {})
+        if self._tool == 'TRACEMALLOC':
+            self._record_peak()
+            self._open_phases.append(name)
+        start = time.perf_counter()
+        paused_seconds = self._paused_seconds
+        try:
+            yield
+        finally:
+            seconds = (time.perf_counter() - start
+                       - (self._paused_seconds - paused_seconds))
+            phases[name] = phases.get(name, 0.0) + seconds
+            if self._tool == 'TRACEMALLOC':
+                self._record_peak()
+                self._open_phases.pop()
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        """
+        Records an export-wide phase timed elsewhere
+
+        Parameters:
+        name (str): name of the phase
+        seconds (float): seconds spent in it
+        """
+        self._phases[name] = self._phases.get(name, 0.0) + seconds
+
+    def count(self, node_tree: str, counter: str, amount: int) -> None:
+        """
+        Counts something generated for a node tree
+
+        Parameters:
+        node_tree (str): name of the node tree
+        counter (str): what's counted, i.e. "nodes"
+        amount (int): amount to add
+        """
+        counts = self._tree_counts.setdefault(node_tree, {})
+        counts[counter] = counts.get(counter, 0) + amount
+
+    def add_node(self, bl_idname: str, seconds: float) -> None:
+        """
+        Records the time spent generating a node
+
+        Parameters:
+        bl_idname (str): type of the node
+        seconds (float): seconds spent generating it
+        """
+        stats = self._node_types.get(bl_idname)
+        if stats is None:
+            self._node_types[bl_idname] = [1, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+
+    def _hottest_node_types(self) -> list[dict]:
+        hottest = sorted(self._node_types.items(),
+                         key=lambda item: item[1][1], reverse=True)
+        return [{"bl_idname": bl_idname, "count": count, "seconds": seconds}
+                for bl_idname, (count, seconds) in hottest[:NUM_HOTTEST]]
+
+    def _node_tree_totals(self) -> list[dict]:
+        node_trees = []
+        for name in self._tree_phases.keys() | self._tree_counts.keys():
+            phases = self._tree_phases.get(name, {})
+            node_tree = {
+                "name": name,
+                "seconds": phases.get("snapshot", 0.0)
+                           + phases.get("fingerprint", 0.0)
+                           + phases.get("generate", 0.0),
+                "phases": phases
+            }
+            node_tree.update(self._tree_counts.get(name, {}))
+            node_trees.append(node_tree)
+        return sorted(node_trees, key=lambda node_tree: node_tree["seconds"],
+                      reverse=True)
+
+    def _top_functions(self) -> list[dict]:
+        stats = pstats.Stats(self._profile).stats
+        top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [{"function": f"{file}:{line}({func})", "calls": calls,
+                 "seconds": seconds, "cumulative_seconds": cumulative}
+                for (file, line, func), (_, calls, seconds, cumulative, _)
+                in top[:NUM_HOTTEST]]
+
+    def _top_allocations(self) -> list[dict]:
+        statistics = self._snapshot.statistics('lineno')
+        return [{"location": str(stat.traceback), "bytes": stat.size,
+                 "blocks": stat.count}
+                for stat in statistics[:NUM_HOTTEST]]
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+        (dict): the profile, as plain values
+        """
+        node_trees = self._node_tree_totals()
+        tree_phases: dict[str, float] = {}
+        for node_tree in node_trees:
+            for name, seconds in node_tree["phases"].items():
+                tree_phases[name] = tree_phases.get(name, 0.0) + seconds
+
+        profile = {
+            "tool": self._tool,
+            "total_seconds": self._total_seconds,
+            "phases": self._phases,
+            "node_tree_phases": tree_phases,
+            "node_trees": node_trees,
+            "hottest_node_types": self._hottest_node_types(),
+        }
+        if self._profile is not None:
+            profile["top_functions"] = self._top_functions()
+        if self._snapshot is not None:
+            profile["peak_bytes"] = self._peak_bytes
+            profile["top_allocations"] = self._top_allocations()
+        return profile
+
+    def write(self, path: str) -> None:
+        """
+        Writes the profile to a JSON file
+
+        Parameters:
+        path (str): path of the JSON file
+        """
+        with open(path, 'w', encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def summarize(self) -> list[str]:
+        """
+        Summarizes the profile for reporting
+
+        Returns:
+        (list[str]): summary lines
+        """
+        profile = self.to_dict()
+        # Generation is broken down into the node tree phases
+        phases = {**profile["phases"], **profile["node_tree_phases"]}
+        phases.pop("generate", None)
+        slowest = sorted(phases.items(), key=lambda item: item[1],
+                         reverse=True)[:4]
+        lines = [
+            f"Export took {self._total_seconds:.3f} s, slowest phases: "
+            + ", ".join(f"{name} {seconds:.3f} s" for name, seconds in slowest)
+        ]
+        if profile["node_trees"]:
+            node_tree = profile["node_trees"][0]
+            lines.append(
+                f"Slowest node tree: {node_tree['name']} "
+                f"({node_tree['seconds']:.3f} s, "
+                f"{node_tree.get('nodes', 0)} nodes, "
+                f"{node_tree.get('links', 0)} links, "
+                f"{node_tree.get('lines', 0)} lines)"
+            )
+        if profile["hottest_node_types"]:
+            lines.append(
+                "Hottest node types: " + ", ".join(
+                    f"{node_type['bl_idname']} ({node_type['count']} nodes, "
+                    f"{node_type['seconds'] * 1000:.1f} ms)"
+                    for node_type in profile["hottest_node_types"][:3]
+                )
+            )
+        if "peak_bytes" in profile:
+            lines.append(f"Peak memory: "
+                         f"{profile['peak_bytes'].get('total', 0) / 2**20:.1f}"
+                         f" MiB")
+        return lines
@@ -2,7 +2,8 @@ import bpy
 
 from ..node_group_gatherer import NodeGroupType
 from ..node_tree_exporter import NodeTreeExporter, NODE_TREE_NAMES
-from ..ntp_operator import NTP_OT_Export, NodeTreeInfo
+from ..node_tree_snapshot import NodeTreeSnapshot
+from ..ntp_operator import ExportSession, NodeTreeInfo
 from ..utils import *
 
 from .node_tree import NTP_GeoNodeTree, NTP_NodeTree
@@ -23,24 +24,24 @@ class GeometryNodesExporter(NodeTreeExporter):
 
     def __init__(
         self,
-        ntp_operator: NTP_OT_Export,
+        ntp_operator: ExportSession,
         node_tree_info: NodeTreeInfo
     ):
         if not node_tree_info._group_type.is_geometry():
-            ntp_operator.report(
+            ntp_operator._report(
                 {'ERROR'},
                 f"Cannot initialize GeometryNodesExporter with group type "
                 f"{node_tree_info._group_type}"
             )
         NodeTreeExporter.__init__(self, ntp_operator, node_tree_info)
         for name in GEO_OP_RESERVED_NAMES:
-            self._used_vars[name] = 0
+            self._names.reserve(name)
 
-    def _set_node_tree_properties(self, node_tree: bpy.types.NodeTree) -> None:
+    def _set_node_tree_properties(self, node_tree: NodeTreeSnapshot) -> None:
         NodeTreeExporter._set_node_tree_properties(self, node_tree)
         self._set_geo_tree_properties(node_tree)
 
-    def _set_geo_tree_properties(self, node_tree: bpy.types.GeometryNodeTree) -> None:
+    def _set_geo_tree_properties(self, node_tree: NodeTreeSnapshot) -> None:
         is_mod = node_tree.is_modifier
         is_tool = node_tree.is_tool
         nt_var = self._node_tree_vars[node_tree]
@@ -76,7 +77,7 @@ class GeometryNodesExporter(NodeTreeExporter):
 
     def _initialize_ntp_node_tree(
         self, 
-        node_tree: bpy.types.NodeTree,
+        node_tree: NodeTreeSnapshot,
         nt_var: str
     ) -> NTP_NodeTree:
         return NTP_GeoNodeTree(node_tree, nt_var)
@@ -87,14 +88,13 @@ class GeometryNodesExporter(NodeTreeExporter):
         ntp_node_tree: NTP_NodeTree
     ) -> None:
         nt_name = ntp_node_tree._node_tree.name
-        self._node_tree_info._func = self._operator._create_var(
-            f"{ntp_node_tree._var}_node_group"
-        )
         #initialize node group
         self._write(f"def {self._node_tree_info._func}("
                     f"{NODE_TREE_NAMES}: dict[typing.Callable, str]):", 
                     self._operator._outer_indent_level)
         self._write(f'"""Initialize {nt_name} node group"""')
+        self._reuse_existing_node_group()
         self._write(f"{ntp_node_tree._var} = bpy.data.node_groups.new("
                     f"type=\'GeometryNodeTree\', "
-                    f"name={str_to_py_str(nt_name)})\n")
\ No newline at end of file
+                    f"name={str_to_py_str(nt_name)})")
+        self._write("", 0)
\ No newline at end of file
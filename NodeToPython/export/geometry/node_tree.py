@@ -1,9 +1,10 @@
 import bpy
 
+from ..node_tree_snapshot import NodeTreeSnapshot
 from ..ntp_node_tree import NTP_NodeTree
 
 class NTP_GeoNodeTree(NTP_NodeTree):
-    def __init__(self, node_tree: bpy.types.GeometryNodeTree, var: str):
+    def __init__(self, node_tree: NodeTreeSnapshot, var: str):
         super().__init__(node_tree, var)
         self._zone_inputs["GeometryNodeSimulationInput"] = []
         self._zone_inputs["GeometryNodeRepeatInput"] = []
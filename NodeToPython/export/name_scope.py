@@ -0,0 +1,83 @@
+from .utils import clean_string
+
+class NameScope():
+    """
+    Allocates unique variable names, numbering repeated names with _1, _2...
+    suffixes
+
+    Names a scope hasn't used are looked up in its parent scope, if any, so
+    a child scope per node tree function avoids the names used across the
+    whole export without copying them. Names created in a child scope
+    aren't seen by its parent
+    """
+    def __init__(self, parent: "NameScope | None" = None):
+        # Scope names fall through to, if any
+        self._parent: NameScope | None = parent
+
+        # Name -> usage count of names used in this scope
+        self._counts: dict[str, int] = {}
+
+    def count(self, name: str) -> int | None:
+        """
+        Gets the usage count of a name
+
+        Parameters:
+        name (str): the name
+
+        Returns:
+        (int | None): usage count, or None if the name isn't used
+        """
+        count = self._counts.get(name)
+        if count is None and self._parent is not None:
+            return self._parent.count(name)
+        return count
+
+    def reserve(self, name: str) -> None:
+        """
+        Reserves a name, so created variables are numbered instead of
+        using it
+
+        Parameters:
+        name (str): the name
+        """
+        self._counts[name] = 0
+
+    def create_var(self, name: str) -> str:
+        """
+        Creates a unique variable name
+
+        Parameters:
+        name (str): basic string we'd like to create the variable name out of
+
+        Returns:
+        clean_name (str): the variable name
+        """
+        clean_name = clean_string(name or "unnamed")
+        count = self.count(clean_name)
+        if count is None:
+            self._counts[clean_name] = 0
+            return clean_name
+        count += 1
+        self._counts[clean_name] = count
+        return f"{clean_name}_{count}"
+
+    def items(self) -> list[tuple[str, int]]:
+        """
+        Returns:
+        (list[tuple[str, int]]): sorted (name, usage count) pairs of the
+            names used in this scope, not including the parent's
+        """
+        return sorted(self._counts.items())
+
+    def parent_counts(self) -> dict[str, int | None]:
+        """
+        Gets what the parent scope has for the names used in this scope, 
+        which is all the names created in this scope depend on
+
+        Returns:
+        (dict[str, int | None]): name -> usage count in the parent scope, 
+            or None if the parent doesn't use it
+        """
+        if self._parent is None:
+            return {}
+        return {name: self._parent.count(name) for name in self._counts}
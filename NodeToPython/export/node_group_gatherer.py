@@ -1,5 +1,6 @@
 import bpy
 
+import time
 from enum import Enum, auto
 
 class NodeGroupType(Enum):
@@ -49,6 +50,13 @@ NTPObject = (
     | bpy.types.World
 )
 
+# Node tree type -> group type of node groups of that type
+NODE_TREE_GROUP_TYPES = {
+    'CompositorNodeTree': NodeGroupType.COMPOSITOR_NODE_GROUP,
+    'GeometryNodeTree':   NodeGroupType.GEOMETRY_NODE_GROUP,
+    'ShaderNodeTree':     NodeGroupType.SHADER_NODE_GROUP,
+}
+
 def get_base_node_tree(
     ntp_obj: NTPObject, group_type: NodeGroupType
  ) -> bpy.types.NodeTree:
@@ -72,7 +80,11 @@ class NodeGroupGatherer:
             NodeGroupType.WORLD : [],
         }
 
+        # Seconds spent gathering data blocks
+        self.seconds: float = 0.0
+
     def gather_node_groups(self, context: bpy.types.Context):
+        start = time.perf_counter()
         for group_slot in getattr(context.scene, "ntp_compositor_node_group_slots"):
             if group_slot.node_tree is not None:
                 self.node_groups[NodeGroupType.COMPOSITOR_NODE_GROUP].append(
@@ -114,6 +126,40 @@ class NodeGroupGatherer:
             if world_slot.world is not None:
                 self.node_groups[NodeGroupType.WORLD].append(world_slot.world)
 
+        self.seconds += time.perf_counter() - start
+
+    def gather_data_blocks(self, data_blocks: list[NTPObject]) -> None:
+        """
+        Gathers data blocks passed in directly, rather than from the scene's 
+        NodeToPython slots
+
+        Parameters:
+        data_blocks (list[NTPObject]): node groups, scenes, lights, line 
+            styles, materials and worlds to export
+        """
+        start = time.perf_counter()
+        for data_block in data_blocks:
+            if isinstance(data_block, bpy.types.NodeTree):
+                if data_block.bl_idname not in NODE_TREE_GROUP_TYPES:
+                    raise ValueError(f"Unsupported node tree type "
+                                     f"{data_block.bl_idname}")
+                group_type = NODE_TREE_GROUP_TYPES[data_block.bl_idname]
+            elif isinstance(data_block, bpy.types.Scene):
+                group_type = NodeGroupType.SCENE
+            elif isinstance(data_block, bpy.types.Light):
+                group_type = NodeGroupType.LIGHT
+            elif isinstance(data_block, bpy.types.FreestyleLineStyle):
+                group_type = NodeGroupType.LINE_STYLE
+            elif isinstance(data_block, bpy.types.Material):
+                group_type = NodeGroupType.MATERIAL
+            elif isinstance(data_block, bpy.types.World):
+                group_type = NodeGroupType.WORLD
+            else:
+                raise TypeError(f"Can't export {type(data_block).__name__} "
+                                f"{data_block!r}")
+            self.node_groups[group_type].append(data_block)
+        self.seconds += time.perf_counter() - start
+
     def get_number_node_groups(self) -> int:
         result = 0
         for lst in self.node_groups.values():
@@ -131,4 +177,70 @@ class NodeGroupGatherer:
             
         raise AssertionError("Expected this to be unreachable")
 
+# Slot collections of a scene the data blocks to export are gathered from
+SLOT_COLLECTIONS = [
+    "ntp_compositor_node_group_slots",
+    "ntp_scene_slots",
+    "ntp_geometry_node_group_slots",
+    "ntp_light_slots",
+    "ntp_line_style_slots",
+    "ntp_material_slots",
+    "ntp_shader_node_group_slots",
+    "ntp_world_slots",
+]
+
+# Data collections slots can point into. Deleting a data block clears the
+# slots pointing to it without calling their update callbacks
+SLOT_DATA_COLLECTIONS = [
+    "node_groups",
+    "scenes",
+    "lights",
+    "linestyles",
+    "materials",
+    "worlds",
+]
+
+# Key of the last gather for the UI, see gather_cached()
+_cached_key: tuple | None = None
+
+# Result of the last gather for the UI
+_cached_gatherer: NodeGroupGatherer | None = None
+
+def _gather_key(context: bpy.types.Context) -> tuple:
+    scene = context.scene
+    return (
+        scene.as_pointer(),
+        *(len(getattr(scene, slots)) for slots in SLOT_COLLECTIONS),
+        *(len(getattr(bpy.data, data)) for data in SLOT_DATA_COLLECTIONS)
+    )
+
+def gather_cached(context: bpy.types.Context) -> NodeGroupGatherer:
+    """
+    Gathers the data blocks in the scene's NodeToPython slots, reusing the 
+    last result until the slots change. Meant for drawing the UI, which 
+    happens constantly. Exports should gather with a new NodeGroupGatherer
+
+    Parameters:
+    context (Context): the context to gather from
+
+    Returns:
+    (NodeGroupGatherer): the gathered data blocks, not to be modified
+    """
+    global _cached_key, _cached_gatherer
+    key = _gather_key(context)
+    if _cached_gatherer is None or key != _cached_key:
+        _cached_gatherer = NodeGroupGatherer()
+        _cached_gatherer.gather_node_groups(context)
+        _cached_key = key
+    return _cached_gatherer
+
+def invalidate_gathered(*args) -> None:
+    """
+    Forgets the data blocks gathered by gather_cached(). Takes any 
+    arguments, so it can be called from update callbacks and app handlers
+    """
+    global _cached_key, _cached_gatherer
+    _cached_key = None
+    _cached_gatherer = None
+
 classes = []
\ No newline at end of file
@@ -0,0 +1,115 @@
+# Custom property generated node groups store their fingerprint in
+FINGERPRINT_PROPERTY = "ntp_fingerprint"
+
+# Custom property generated node groups store a hash of their contents in,
+# so node groups edited since they were generated aren't reused
+SIGNATURE_PROPERTY = "ntp_signature"
+
+# Name of the generated function finding a node group to reuse
+REUSE_FUNC = "ntp_reuse_node_group"
+
+# Name of the generated function stamping a generated node group
+STAMP_FUNC = "ntp_stamp_node_group"
+
+# Name of the generated function hashing a node group's contents
+SIGNATURE_FUNC = "ntp_node_group_signature"
+
+# Key of the fingerprint -> node groups index in the node tree names dict,
+# which is created anew each time the node groups are generated
+INDEX_KEY = "ntp_node_groups"
+
+# Node properties that only change how a node looks in the editor
+LAYOUT_PROPERTIES = ("hide", "location", "location_absolute", "select",
+                     "show_options", "show_preview", "show_texture", "width")
+
+# Source of the generated reuse functions, indented with four spaces. The
+# blend file's node groups are indexed by fingerprint the first time a node
+# group is looked up in each run, instead of in every node group function
+REUSE_SOURCE = f'''\
+def {SIGNATURE_FUNC}(node_group: bpy.types.NodeTree) -> str:
+    """
+    Hashes the contents of a node group, to tell if it was edited since it
+    was generated
+    """
+    import hashlib
+
+    def to_value(value):
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            return value
+        if isinstance(value, bpy.types.bpy_struct):
+            return getattr(value, "name", None)
+        if isinstance(value, set):
+            return sorted(value)
+        try:
+            return [to_value(item) for item in value]
+        except TypeError:
+            return None
+
+    def properties(struct):
+        return [
+            (prop.identifier, to_value(getattr(struct, prop.identifier)))
+            for prop in struct.bl_rna.properties
+            if not prop.is_readonly
+            and prop.identifier not in {LAYOUT_PROPERTIES!r}
+        ]
+
+    contents = [properties(item) for item in node_group.interface.items_tree]
+    for node in node_group.nodes:
+        contents.append((node.bl_idname, properties(node)))
+        for socket in node.inputs:
+            value = getattr(socket, "default_value", None)
+            contents.append((socket.identifier, to_value(value)))
+    for link in node_group.links:
+        contents.append((
+            link.from_node.name,
+            link.from_socket.identifier,
+            link.to_node.name,
+            link.to_socket.identifier,
+            link.is_muted
+        ))
+    return hashlib.sha256(repr(contents).encode()).hexdigest()
+
+def {REUSE_FUNC}(
+    fingerprint: str,
+    name: str,
+    node_tree_names: dict
+) -> bpy.types.NodeTree | None:
+    """
+    Finds a node group generated from the same contents and not edited
+    since, preferring one with the given name
+    """
+    node_groups = node_tree_names.get("{INDEX_KEY}")
+    if node_groups is None:
+        node_groups = {{}}
+        for node_group in bpy.data.node_groups:
+            stamp = node_group.get("{FINGERPRINT_PROPERTY}")
+            if stamp is not None:
+                node_groups.setdefault(stamp, []).append(node_group)
+        node_tree_names["{INDEX_KEY}"] = node_groups
+
+    candidates = sorted(
+        node_groups.get(fingerprint, []),
+        key=lambda node_group: node_group.name != name
+    )
+    for node_group in candidates:
+        signature = {SIGNATURE_FUNC}(node_group)
+        if node_group.get("{SIGNATURE_PROPERTY}") == signature:
+            return node_group
+    return None
+
+def {STAMP_FUNC}(
+    node_group: bpy.types.NodeTree,
+    fingerprint: str,
+    node_tree_names: dict
+) -> None:
+    """
+    Stores a generated node group's fingerprint and the hash of its
+    contents, so it's reused until it's edited
+    """
+    node_group["{FINGERPRINT_PROPERTY}"] = fingerprint
+    node_group["{SIGNATURE_PROPERTY}"] = {SIGNATURE_FUNC}(node_group)
+    node_groups = node_tree_names.get("{INDEX_KEY}")
+    if node_groups is not None:
+        node_groups.setdefault(fingerprint, []).append(node_group)
+
+'''
@@ -0,0 +1,269 @@
+from typing import Callable
+
+from .node_settings import NTPNodeSetting, ST
+from .utils import *
+
+# Settings types written directly, as an expression converting the value
+_VALUE_EXPRESSIONS: dict[ST, str] = {
+    ST.ENUM:     "enum_to_py_str(attr)",
+    ST.ENUM_SET: "str(attr)",
+    ST.STRING:   "str_to_py_str(attr)",
+    ST.BOOL:     "str(attr)",
+    ST.INT:      "str(attr)",
+    ST.FLOAT:    "str(attr)",
+    ST.VEC1:     "vec1_to_py_str(attr)",
+    ST.VEC2:     "vec2_to_py_str(attr)",
+    ST.VEC3:     "vec3_to_py_str(attr)",
+    ST.VEC4:     "vec4_to_py_str(attr)",
+    ST.COLOR:    "color_to_py_str(attr)",
+    ST.EULER:    "vec3_to_py_str(attr)",
+}
+
+# Settings types referencing data in the blend file -> bpy.data collection
+_BLEND_FILE_DATA: dict[ST, str] = {
+    ST.MATERIAL:   "materials",
+    ST.OBJECT:     "objects",
+    ST.COLLECTION: "collections",
+}
+
+# Settings types handled by an exporter method taking the node and setting name
+_NODE_METHODS: dict[ST, str] = {
+    ST.COLOR_RAMP:    "_color_ramp_settings",
+    ST.CURVE_MAPPING: "_curve_mapping_settings",
+    ST.NODE_TREE:     "_node_tree_settings",
+}
+
+# Settings types handled by an exporter method taking the value and setting string
+_VALUE_METHODS: dict[ST, str] = {
+    ST.IMAGE_USER:                           "_image_user_settings",
+    ST.INDEX_SWITCH_ITEMS:                   "_index_switch_items",
+    ST.ENUM_DEFINITION:                      "_enum_definition",
+    ST.BAKE_ITEMS:                           "_bake_items",
+    ST.CAPTURE_ATTRIBUTE_ITEMS:              "_capture_attribute_items",
+    ST.MENU_SWITCH_ITEMS:                    "_menu_switch_items",
+    ST.FOREACH_GEO_ELEMENT_GENERATION_ITEMS: "_foreach_geo_element_generation_items",
+    ST.FOREACH_GEO_ELEMENT_INPUT_ITEMS:      "_foreach_geo_element_input_items",
+    ST.FOREACH_GEO_ELEMENT_MAIN_ITEMS:       "_foreach_geo_element_main_items",
+    ST.FORMAT_STRING_ITEMS:                  "_format_string_items",
+    ST.CLOSURE_INPUT_ITEMS:                  "_closure_input_items",
+    ST.CLOSURE_OUTPUT_ITEMS:                 "_closure_output_items",
+    ST.COLOR_MANAGED_DISPLAY_SETTINGS:       "_color_managed_display_settings",
+    ST.COLOR_MANAGED_VIEW_SETTINGS:          "_color_managed_view_settings",
+    ST.COMPOSITOR_FILE_OUTPUT_ITEMS:         "_compositor_file_output_items",
+    ST.EVALUATE_CLOSURE_INPUT_ITEMS:         "_evaluate_closure_input_items",
+    ST.EVALUATE_CLOSURE_OUTPUT_ITEMS:        "_evaluate_closure_output_items",
+    ST.FIELD_TO_GRID_ITEMS:                  "_field_to_grid_items",
+    ST.GEOMETRY_VIEWER_ITEMS:                "_geometry_viewer_items",
+    ST.COMBINE_BUNDLE_ITEMS:                 "_combine_bundle_items",
+    ST.SEPARATE_BUNDLE_ITEMS:                "_separate_bundle_items",
+}
+
+_NAMESPACE = {
+    "enum_to_py_str": enum_to_py_str,
+    "str_to_py_str": str_to_py_str,
+    "vec1_to_py_str": vec1_to_py_str,
+    "vec2_to_py_str": vec2_to_py_str,
+    "vec3_to_py_str": vec3_to_py_str,
+    "vec4_to_py_str": vec4_to_py_str,
+    "color_to_py_str": color_to_py_str,
+}
+
+# (version resolved settings, elide defaults, compact) -> compiled emitter 
+# function
+_settings_emitters: dict[
+    tuple[tuple[NTPNodeSetting, ...], bool, bool], Callable
+] = {}
+
+# Version resolved settings -> compiled formatter function
+_settings_formatters: dict[tuple[NTPNodeSetting, ...], Callable] = {}
+
+def _compile(lines: list[str], func_name: str) -> Callable:
+    """
+    Compiles generated source into a function
+
+    Parameters:
+    lines (list[str]): source of the function
+    func_name (str): name of the function defined by the source
+
+    Returns:
+    (Callable): the compiled function
+    """
+    namespace = dict(_NAMESPACE)
+    code = compile("\n".join(lines), f"<ntp settings {func_name}>", "exec")
+    exec(code, namespace)
+    return namespace[func_name]
+
+def _value_lines(
+    attr_info: NTPNodeSetting, 
+    elide: bool, 
+    compact: bool
+) -> list[str]:
+    """
+    Generates the source for writing out a setting with a plain value
+
+    Parameters:
+    attr_info (NTPNodeSetting): the setting to write out
+    elide (bool): whether to skip values equal to the reference settings
+    compact (bool): whether to add the setting to the exporter's settings 
+        table instead of writing a line
+
+    Returns:
+    (list[str]): lines writing out the setting
+    """
+    name = attr_info.name_
+    expression = _VALUE_EXPRESSIONS[attr_info.st_]
+    if compact:
+        body = [f"value = {expression}"]
+        if elide:
+            body += [f"if reference is not None and reference.get('{name}') == value:",
+                     f"    exporter._operator._elide(f\"{{node_var}}.{name} = {{value}}\")",
+                      "else:",
+                     f"    rows.append(f\"({{index}}, '{name}', {{value}})\")"]
+        else:
+            body.append(f"rows.append(f\"({{index}}, '{name}', {{value}})\")")
+    elif not elide:
+        body = [f"write(f\"{{node_var}}.{name} = {{{expression}}}\")"]
+    else:
+        body = [f"value = {expression}",
+                f"line = f\"{{node_var}}.{name} = {{value}}\"",
+                f"if reference is not None and reference.get('{name}') == value:",
+                 "    exporter._operator._elide(line)",
+                 "else:",
+                 "    write(line)"]
+
+    if attr_info.st_ == ST.ENUM:
+        return ["if attr != '':"] + [f"    {line}" for line in body]
+    return body
+
+def _setting_lines(
+    attr_info: NTPNodeSetting, 
+    elide: bool, 
+    compact: bool
+) -> list[str]:
+    """
+    Generates the source for writing out a single setting
+
+    Parameters:
+    attr_info (NTPNodeSetting): the setting to write out
+    elide (bool): whether to skip values equal to the reference settings
+    compact (bool): whether plain values go in the exporter's settings 
+        table
+
+    Returns:
+    (list[str]): lines of the emitter function body, or an empty list if
+        the setting type isn't supported
+    """
+    name = attr_info.name_
+    st = attr_info.st_
+
+    if st in _VALUE_EXPRESSIONS:
+        body = _value_lines(attr_info, elide, compact)
+    elif st in _BLEND_FILE_DATA:
+        body = [f"exporter._set_if_in_blend_file(attr, node_var + '.{name}', "
+                f"'{_BLEND_FILE_DATA[st]}')"]
+    elif st in _NODE_METHODS:
+        body = [f"exporter.{_NODE_METHODS[st]}(node, '{name}')"]
+    elif st == ST.IMAGE:
+        body = ["if exporter._operator._addon_dir != \"\":",
+                "    if attr.source in {'FILE', 'GENERATED', 'TILED'}:",
+                "        if exporter._save_image(attr):",
+                f"            exporter._load_image(attr, node_var + '.{name}')",
+                "else:",
+                f"    exporter._set_if_in_blend_file(attr, node_var + '.{name}', "
+                "'images')"]
+    elif st == ST.SIM_OUTPUT_ITEMS or st == ST.REPEAT_OUTPUT_ITEMS:
+        is_sim = st == ST.SIM_OUTPUT_ITEMS
+        body = [f"exporter._output_zone_items(attr, node_var + '.{name}', "
+                f"{is_sim})"]
+    elif st in _VALUE_METHODS:
+        body = [f"exporter.{_VALUE_METHODS[st]}(attr, node_var + '.{name}')"]
+    else:
+        return []
+
+    lines = [f"attr = getattr(node, '{name}', None)",
+             "if attr is not None:"]
+    lines.extend(f"    {line}" for line in body)
+    return lines
+
+def get_settings_emitter(
+    attributes: tuple[NTPNodeSetting, ...],
+    elide: bool = False,
+    compact: bool = False
+) -> Callable:
+    """
+    Gets a function writing out the given node settings, compiling it the
+    first time these settings are requested. Settings are already resolved
+    for a Blender version, so emitters are cached per version as well.
+
+    The emitter is called as emit(exporter, node, node_var, reference), 
+    where reference maps setting names to the values formatted by 
+    get_settings_formatter() for a newly created node (or is None)
+
+    In compact mode, plain values are added to the exporter's settings table
+    rather than written, up to the first setting handled by an exporter 
+    method, and later settings are still written in order. The table is 
+    applied after everything written per node, so values like the active
+    index of zone items are set once the items exist
+
+    Parameters:
+    attributes (tuple[NTPNodeSetting, ...]): version resolved node settings
+    elide (bool): whether to skip values equal to the reference settings
+    compact (bool): whether to fill the exporter's settings table
+
+    Returns:
+    (Callable): function writing out the settings of a node
+    """
+    key = (attributes, elide, compact)
+    emitter = _settings_emitters.get(key)
+    if emitter is not None:
+        return emitter
+
+    lines = ["def emit(exporter, node, node_var, reference):",
+             "    write = exporter._write"]
+    if compact:
+        lines += ["    rows = exporter._setting_rows",
+                  "    index = exporter._node_indices[node]"]
+    for attr_info in attributes:
+        setting_lines = _setting_lines(attr_info, elide, compact)
+        lines.extend(f"    {line}" for line in setting_lines)
+        if setting_lines and attr_info.st_ not in _VALUE_EXPRESSIONS:
+            compact = False
+
+    emitter = _compile(lines, "emit")
+    _settings_emitters[key] = emitter
+    return emitter
+
+def get_settings_formatter(
+    attributes: tuple[NTPNodeSetting, ...]
+) -> Callable:
+    """
+    Gets a function converting the plain values of the given node settings 
+    into strings, compiling it the first time these settings are requested
+
+    The formatter is called as format_settings(node), and returns a 
+    dictionary of setting names to strings
+
+    Parameters:
+    attributes (tuple[NTPNodeSetting, ...]): version resolved node settings
+
+    Returns:
+    (Callable): function formatting the settings of a node
+    """
+    formatter = _settings_formatters.get(attributes)
+    if formatter is not None:
+        return formatter
+
+    lines = ["def format_settings(node):",
+             "    values = {}"]
+    for attr_info in attributes:
+        if attr_info.st_ not in _VALUE_EXPRESSIONS:
+            continue
+        lines += [f"    attr = getattr(node, '{attr_info.name_}', None)",
+                   "    if attr is not None:",
+                  f"        values['{attr_info.name_}'] = "
+                  f"{_VALUE_EXPRESSIONS[attr_info.st_]}"]
+    lines.append("    return values")
+
+    formatter = _compile(lines, "format_settings")
+    _settings_formatters[attributes] = formatter
+    return formatter
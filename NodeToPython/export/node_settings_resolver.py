@@ -0,0 +1,43 @@
+import bpy
+
+from .node_settings import node_settings, NodeInfo, NTPNodeSetting
+
+# Blender version -> (node bl_idname -> settings valid in that version)
+_resolved_node_settings: dict[tuple, dict[str, tuple[NTPNodeSetting, ...]]] = {}
+
+def resolve_node_settings(
+    node_info: NodeInfo, 
+    version: tuple
+) -> tuple[NTPNodeSetting, ...]:
+    """
+    Filters a node's settings down to the ones valid in a Blender version
+
+    Parameters:
+    node_info (NodeInfo): settings info for the node
+    version (tuple): Blender version to resolve the settings for
+
+    Returns:
+    (tuple[NTPNodeSetting, ...]): settings valid in the given version
+    """
+    return tuple(
+        attr_info for attr_info in node_info.attributes_
+        if max(attr_info.min_version_, node_info.min_version_) <= version
+        and version < min(attr_info.max_version_, node_info.max_version_)
+    )
+
+def get_resolved_node_settings() -> dict[str, tuple[NTPNodeSetting, ...]]:
+    """
+    Gets the node settings table for the running Blender version, building
+    it the first time it's requested
+
+    Returns:
+    (dict[str, tuple[NTPNodeSetting, ...]]): node bl_idname -> settings 
+        valid in the running Blender version
+    """
+    version = tuple(bpy.app.version)
+    if version not in _resolved_node_settings:
+        _resolved_node_settings[version] = {
+            bl_idname: resolve_node_settings(node_info, version)
+            for bl_idname, node_info in node_settings.items()
+        }
+    return _resolved_node_settings[version]
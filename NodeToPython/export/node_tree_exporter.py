@@ -1,15 +1,23 @@
 import abc
-import copy
+import contextlib
 import os
-from typing import Callable
+import time
+from typing import Callable, Generator
 
 import bpy
 
-from .node_settings import node_settings, ST
+from .name_scope import NameScope
+from .node_group_reuse import REUSE_FUNC, STAMP_FUNC
+from .node_settings import NTPNodeSetting, ST
+from .node_settings_emitter import get_settings_emitter
+from .node_settings_resolver import *
+from .node_tree_payload import PAYLOAD_MODULE
+from .node_tree_snapshot import NODES_PER_STEP, NodeSnapshot, NodeTreeSnapshot
 from .ntp_node_tree import *
-from .ntp_operator import NTP_OT_Export, NodeTreeInfo, NODE_TREE_NAMES
+from .ntp_operator import ExportSession, NodeTreeInfo, NODE_TREE_NAMES
 from .utils import *
 
+ATTR = "attr"
 BASE_DIR = "base_dir"
 DATA_DST = "data_dst"
 DATA_SRC = "data_src"
@@ -22,8 +30,12 @@ LIB_RELPATH = "lib_relpath"
 LIB_PATH = "lib_path"
 NODE = "node"
 NODE_GROUP = "node_group"
-
+NODE_LIST = "node_list"
+NEW_LINK = "new_link"
+NEW_NODE = "new_node"
+VALUE = "value"
 RESERVED_NAMES = {
+    ATTR,
     BASE_DIR,
     DATA_DST,
     DATA_SRC,
@@ -35,7 +47,11 @@ RESERVED_NAMES = {
     LIB_RELPATH,
     LIB_PATH,
     NODE_TREE_NAMES,
-    NODE_GROUP
+    NODE_GROUP,
+    NODE_LIST,
+    NEW_LINK,
+    NEW_NODE,
+    VALUE
 }
 
 NO_DEFAULT_SOCKETS = {
@@ -68,22 +84,26 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
 
     def __init__(
         self, 
-        ntp_op: NTP_OT_Export,
+        ntp_op: ExportSession,
         node_tree_info: NodeTreeInfo
     ):
         # Operator executing the conversion
-        self._operator : NTP_OT_Export = ntp_op
+        self._operator : ExportSession = ntp_op
         
         # Info for the node tree being exported
         self._node_tree_info : NodeTreeInfo = node_tree_info
 
-        # Dictionary to keep track of variables->usage count pairs
-        self._used_vars: dict[str, int] = copy.copy(self._operator._used_vars)
+        # Variable names used in the node tree's function, starting out 
+        # with the names used across the export so far
+        self._names: NameScope = NameScope(self._operator._names)
         for name in RESERVED_NAMES:
-            self._used_vars[name] = 0
+            self._names.reserve(name)
 
         # Variable name to be used for object
         self._obj_var : str = self._create_var(self._node_tree_info._obj.name)
+
+        # Variable name to be used for the node tree, see _create_func_name()
+        self._nt_var : str = ""
     
         # Class name for the operator, if it exists
         if self._operator._mode == 'ADDON' and self._node_tree_info._is_base:
@@ -95,25 +115,66 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
                 self._class_name
             )
 
+        # Whether the node group's function reuses an existing node group
+        self._reuses_node_group: bool = False
+
         # Dictionary to keep track of node->variable name pairs
-        self._node_vars: dict[bpy.types.Node, str] = {}
+        self._node_vars: dict[NodeSnapshot, str] = {}
+
+        # Should generated nodes be stored in a list instead of variables
+        self._use_node_list: bool = False
+
+        # Node -> index into the generated node list, for compact output
+        self._node_indices: dict[NodeSnapshot, int] = {}
+
+        # Rows of the node settings table while generating compact output
+        self._setting_rows: list[str] | None = None
+
+        # Rows of the input socket defaults table while generating compact
+        # output
+        self._default_rows: list[str] | None = None
 
         # Dictionary to keep track of node tree->variable name pairs
-        self._node_tree_vars: dict[bpy.types.NodeTree, str] = {}
+        self._node_tree_vars: dict[NodeTreeSnapshot, str] = {}
 
         # Write functions after nodes are mostly initialized and linked up
         self._write_after_links: list[Callable] = []
-    
-        # Copy of node settings (may have to modify for some nodes)
-        self._node_settings = node_settings
+
+    def _create_func_name(self) -> None:
+        """
+        Creates the variable name of the node tree and the name of the 
+        function generating it. Function names have to be unique across the 
+        whole export, so they're created for every node tree, in export 
+        order, before any code is generated
+        """
+        self._nt_var = self._create_var(self._node_tree_info._snapshot.name)
+        self._node_tree_info._func = self._operator._create_var(
+            f"{self._nt_var}_node_group"
+        )
 
     def export(self) -> None:
+        """
+        Generates the node tree's code all at once
+        """
+        for _ in self.export_steps():
+            pass
+
+    def export_steps(self) -> Generator[None, None, None]:
+        """
+        Generates the node tree's code step by step
+
+        Yields:
+        None, after every NODES_PER_STEP nodes or links generated
+        """
         # TODO: cleanup
         if self._operator._mode == 'SCRIPT':
             self._import_essential_libs()
 
         if self._node_tree_info._group_type.is_group():
-            self._process_node_tree()
+            if self._operator._use_payload:
+                yield from self._process_node_tree_into_payload()
+            else:
+                yield from self._process_node_tree()
 
         if self._operator._mode == 'ADDON' and self._node_tree_info._is_base:
             self._init_operator(self._obj_var, self._node_tree_info._obj.name)
@@ -132,7 +193,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
             
         if self._node_tree_info._group_type.is_obj():
             self._create_obj()
-            self._process_node_tree()
+            yield from self._process_node_tree()
 
         if self._operator._mode == 'ADDON' and self._node_tree_info._is_base:
             self._call_node_tree_creation(self._node_tree_info._base_tree, 2)
@@ -143,6 +204,83 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
     def _write(self, string: str, indent_level: int = -1):
         self._operator._write(string, indent_level)
 
+    def _profile(self, phase: str) -> contextlib.AbstractContextManager:
+        """
+        Times a phase of generating the node tree, if the export is being 
+        profiled
+
+        Parameters:
+        phase (str): name of the phase
+
+        Returns:
+        (AbstractContextManager): context manager timing the phase
+        """
+        return self._operator._profile(phase, self._node_tree_info._obj.name)
+
+    def _write_or_elide(
+        self, 
+        string: str, 
+        is_default: bool, 
+        indent_level: int = -1
+    ) -> None:
+        """
+        Writes a line, unless it only sets a value Blender already defaults to
+
+        Parameters:
+        string (str): line to write
+        is_default (bool): whether the line sets a default value
+        indent_level (int): indentation level of the line
+        """
+        if is_default:
+            self._operator._elide(string, indent_level)
+        else:
+            self._operator._write(string, indent_level)
+
+    def _set_obj_settings(
+        self, 
+        obj: bpy.types.ID, 
+        reference: bpy.types.ID | None,
+        attrs: list[str], 
+        to_py_str: Callable, 
+        indent_level: int
+    ) -> None:
+        """
+        Sets settings of the object the node tree belongs to
+
+        Parameters:
+        obj (ID): object we're copying settings from
+        reference (ID | None): newly created object to compare against, 
+            if default values should be elided
+        attrs (list[str]): names of the settings
+        to_py_str (Callable): converts a setting value into a string
+        indent_level (int): indentation level of the settings
+        """
+        for attr in attrs:
+            value = to_py_str(getattr(obj, attr))
+            is_default = (reference is not None and 
+                          to_py_str(getattr(reference, attr)) == value)
+            self._write_or_elide(
+                f"{self._obj_var}.{attr} = {value}", 
+                is_default, 
+                indent_level
+            )
+
+    def _get_reference_obj(self, data: str, *args) -> bpy.types.ID | None:
+        """
+        Gets a newly created object to compare object settings against
+
+        Parameters:
+        data (str): name of the bpy.data collection of the object
+        args: extra arguments for creating the object
+
+        Returns:
+        (ID | None): reference object, or None if default values shouldn't 
+            be elided
+        """
+        if self._operator._reference_defaults is None:
+            return None
+        return self._operator._reference_defaults.get_obj(data, *args)
+
     def _create_var(self, name: str) -> str:
         """
         Creates a unique variable name for a node tree
@@ -153,16 +291,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         Returns:
         clean_name (str): variable name for the node tree
         """
-        if name == "":
-            name = "unnamed"
-        clean_name = clean_string(name)
-        var = clean_name
-        if var in self._used_vars:
-            self._used_vars[var] += 1
-            return f"{clean_name}_{self._used_vars[var]}"
-        else:
-            self._used_vars[var] = 0
-            return clean_name
+        return self._names.create_var(name)
     
     def _init_operator(self, idname: str, label: str) -> None:
         """
@@ -220,20 +349,76 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
     
     def _initialize_ntp_node_tree(
         self, 
-        node_tree: bpy.types.NodeTree,
+        node_tree: NodeTreeSnapshot,
         nt_var: str
     ) -> NTP_NodeTree:
         return NTP_NodeTree(node_tree, nt_var)
 
-    def _process_node_tree(self) -> None:
+    def _reuse_existing_node_group(self) -> None:
+        """
+        Returns early from the node group's function if the blend file 
+        already has a node group generated from the same contents, which 
+        hasn't been edited since
+        """
+        if not self._operator._reuse_node_groups:
+            return
+        self._reuses_node_group = True
+        fingerprint = str_to_py_str(self._node_tree_info._fingerprint.hex())
+        name = str_to_py_str(self._node_tree_info._snapshot.name)
+        self._write("# Reuse the node group if it was already generated")
+        self._write(f"{NODE_GROUP} = {REUSE_FUNC}({fingerprint}, {name}, "
+                    f"{NODE_TREE_NAMES})")
+        self._write(f"if {NODE_GROUP} is not None:")
+        self._write(f"return {NODE_GROUP}",
+                    self._operator._inner_indent_level + 1)
+        self._write("", 0)
+
+    def _stamp_fingerprint(self, nt_var: str) -> None:
+        """
+        Stores the node group's fingerprint and a hash of its contents in
+        custom properties once it's generated, so generating it again can 
+        reuse it until it's edited
+
+        Parameters:
+        nt_var (str): variable name of the node group
+        """
+        if not self._reuses_node_group:
+            return
+        fingerprint = str_to_py_str(self._node_tree_info._fingerprint.hex())
+        self._write(f"{STAMP_FUNC}({nt_var}, {fingerprint}, "
+                    f"{NODE_TREE_NAMES})")
+
+    def _process_node_tree_into_payload(self) -> Generator[None, None, None]:
+        """
+        Generates the node group's function into the add-on's payload, 
+        leaving a stub in its module that loads it the first time it's called
+
+        Yields:
+        None, after every NODES_PER_STEP nodes or links generated
+        """
+        emitter = self._operator._emitter
+        emitter.begin_capture()
+        yield from self._process_node_tree()
+        func = self._node_tree_info._func
+        self._operator._payload[func] = emitter.end_capture()
+
+        self._write(f"def {func}("
+                    f"{NODE_TREE_NAMES}: dict[typing.Callable, str]):", 0)
+        self._write(f"return {PAYLOAD_MODULE}.load(globals(), "
+                    f"{str_to_py_str(func)})({NODE_TREE_NAMES})\n", 1)
+
+    def _process_node_tree(self) -> Generator[None, None, None]:
         """
         Generates a Python function to recreate a compositor node tree
 
         Parameters:
         node_tree (NodeTree): node tree to be recreated
+
+        Yields:
+        None, after every NODES_PER_STEP nodes or links generated
         """
-        node_tree = self._node_tree_info._base_tree
-        nt_var = self._create_var(node_tree.name)
+        node_tree = self._node_tree_info._snapshot
+        nt_var = self._nt_var
         self._node_tree_vars[node_tree] = nt_var
 
         ntp_nt = self._initialize_ntp_node_tree(node_tree, nt_var)
@@ -242,27 +427,126 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
 
         self._set_node_tree_properties(node_tree)
         
-        self._tree_interface_settings(ntp_nt)
+        with self._profile("interface"):
+            self._tree_interface_settings(ntp_nt)
 
         #initialize nodes
         self._write(f"# Initialize {nt_var} nodes\n")
 
-        for node in node_tree.nodes:
-            self._process_node(node, ntp_nt)
+        with self._profile("nodes"):
+            if self._operator._compact_output:
+                yield from self._process_nodes_compact(node_tree, ntp_nt)
+            else:
+                self._use_node_list = (
+                    len(node_tree.nodes) > self._operator._max_node_variables
+                )
+                if self._use_node_list:
+                    self._write(f"{NODE_LIST} = []\n")
+
+                yield from self._process_nodes(node_tree.nodes, ntp_nt)
 
-        for zone_list in ntp_nt._zone_inputs.values():
-            self._process_zones(zone_list)
+        with self._profile("zones"):
+            for zone_list in ntp_nt._zone_inputs.values():
+                self._process_zones(zone_list)
         
         #set look of nodes
-        self._set_parents(node_tree)
-        self._set_locations(node_tree)
-        self._set_dimensions(node_tree)
+        with self._profile("layout"):
+            yield from self._set_parents(node_tree)
+            yield from self._set_locations(node_tree)
+            yield from self._set_dimensions(node_tree)
 
         #create connections
-        self._init_links(node_tree)
-        
+        with self._profile("links"):
+            yield from self._init_links(node_tree)
+
+        self._stamp_fingerprint(nt_var)
         self._write(f"return {nt_var}\n")
     
+    def _process_nodes_compact(
+        self, 
+        node_tree: NodeTreeSnapshot, 
+        ntp_nt: NTP_NodeTree
+    ) -> Generator[None, None, None]:
+        """
+        Creates nodes and sets their settings and input defaults from 
+        tables of literals, rather than a statement per node and setting. 
+        Anything that doesn't fit in a table is still written per node
+
+        Parameters:
+        node_tree (NodeTreeSnapshot): node tree we're obtaining nodes from
+        ntp_nt (NTP_NodeTree): the node tree the nodes belong to
+
+        Yields:
+        None, after every NODES_PER_STEP nodes generated
+        """
+        self._use_node_list = True
+        node_rows = []
+        for i, node in enumerate(node_tree.nodes):
+            self._node_indices[node] = i
+            self._node_vars[node] = f"{NODE_LIST}[{i}]"
+            node_rows.append(f"({str_to_py_str(node.bl_idname)}, "
+                             f"{str_to_py_str(node.name)})")
+
+        self._write(f"{NODE_LIST} = []")
+        self._write(f"{NEW_NODE} = {ntp_nt._var}.nodes.new")
+        yield from self._write_table(ITEM, node_rows, [
+            f"{NODE} = {NEW_NODE}({ITEM}[0])",
+            f"{NODE}.name = {ITEM}[1]",
+            f"{NODE_LIST}.append({NODE})"
+        ])
+
+        # Settings and input defaults are set after everything written per 
+        # node, once items, zones and node groups have created what they 
+        # refer to, i.e. the items active indices point at
+        self._setting_rows = []
+        self._default_rows = []
+        yield from self._process_nodes(node_tree.nodes, ntp_nt)
+
+        yield from self._write_table(
+            f"{INDEX}, {ATTR}, {VALUE}", self._setting_rows, 
+            [f"setattr({NODE_LIST}[{INDEX}], {ATTR}, {VALUE})"]
+        )
+        yield from self._write_table(
+            f"{INDEX}, {ITEM}, {VALUE}", self._default_rows,
+            [f"{NODE_LIST}[{INDEX}].inputs[{ITEM}].default_value = {VALUE}"]
+        )
+        self._setting_rows = None
+        self._default_rows = None
+
+    def _write_table(
+        self, 
+        targets: str, 
+        rows: list[str], 
+        body: list[str],
+        iterable: str = "{}"
+    ) -> Generator[None, None, None]:
+        """
+        Writes a loop over a table of literal rows
+
+        Parameters:
+        targets (str): loop variables each row is unpacked into
+        rows (list[str]): rows of the table
+        body (list[str]): lines of the loop body
+        iterable (str): expression wrapping the table, with {} in place of 
+            the table
+
+        Yields:
+        None, after every NODES_PER_STEP rows
+        """
+        if len(rows) == 0:
+            return
+        before, after = iterable.split("{}")
+        inner_indent_level = self._operator._inner_indent_level
+        self._write(f"for {targets} in {before}(")
+        for i, row in enumerate(rows, 1):
+            self._write(f"{row},", inner_indent_level + 1)
+            if i % NODES_PER_STEP == 0:
+                yield
+        self._write(f"){after}:")
+        for line in body:
+            self._write(line, inner_indent_level + 1)
+        self._write("", 0)
+
     @abc.abstractmethod
     def _initialize_node_tree(
         self, 
@@ -270,7 +554,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
     ) -> None:
         pass
 
-    def _set_node_tree_properties(self, node_tree: bpy.types.NodeTree) -> None:
+    def _set_node_tree_properties(self, node_tree: NodeTreeSnapshot) -> None:
         nt_var = self._node_tree_vars[node_tree]
 
         color_tag_str = enum_to_py_str(node_tree.color_tag)
@@ -290,68 +574,87 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         Parameters:
         ntp_nt (NTP_NodeTree): the node tree to set the interface for
         """
-        if len(ntp_nt._node_tree.interface.items_tree) == 0:
+        items_tree = ntp_nt._node_tree.interface.items_tree
+        if len(items_tree) == 0:
             return
         
         self._write(f"# {ntp_nt._var} interface\n")
-        panel_dict: dict[bpy.types.NodeTreeInterfacePanel, str] = {}
-        items_processed: set[bpy.types.NodeTreeInterfaceItem] = set()
 
-        self._process_items(None, panel_dict, items_processed, ntp_nt)
+        # Panel -> its items in order, None for the top level. items_tree 
+        # lists items in depth-first order, so items keep their order within
+        # their panel
+        panel_items: dict[bpy.types.NodeTreeInterfacePanel | None, 
+                          list[bpy.types.NodeTreeInterfaceItem]] = {None: []}
+        for item in items_tree:
+            parent = item.parent if item.parent.index != -1 else None
+            panel_items.setdefault(parent, []).append(item)
+
+        panel_dict: dict[bpy.types.NodeTreeInterfacePanel, str] = {}
+        self._process_items(panel_items, panel_dict, ntp_nt)
 
     def _process_items(
             self, 
-            parent: bpy.types.NodeTreeInterfacePanel | None, 
+            panel_items: dict[bpy.types.NodeTreeInterfacePanel | None, 
+                              list[bpy.types.NodeTreeInterfaceItem]],
             panel_dict: dict[bpy.types.NodeTreeInterfacePanel, str], 
-            items_processed: set[bpy.types.NodeTreeInterfaceItem], 
             ntp_nt: NTP_NodeTree
     ) -> None:
         """
-        Recursive function to process all node tree interface items in a 
-        given layer
+        Creates all node tree interface items in a single depth-first 
+        traversal, each panel followed by its items
 
         Helper function to _tree_interface_settings()
 
         Parameters:
-        parent (NodeTreeInterfacePanel): parent panel of the layer
-            (possibly None to signify the base)
+        panel_items (dict[NodeTreeInterfacePanel | None, 
+            list[NodeTreeInterfaceItem]]): panel -> its items in order, None 
+            for the top level
         panel_dict (dict[NodeTreeInterfacePanel, str]: panel -> variable
-        items_processed (set[NodeTreeInterfacePanel]): set of already
-            processed items, so none are done twice
         ntp_nt (NTP_NodeTree): owner of the socket
         """
-        
-        if parent is None:
-            items = ntp_nt._node_tree.interface.items_tree
-        else:
-            items = parent.interface_items
-
-        for item in items:
-            if item.parent.index != -1 and item.parent not in panel_dict:
-                continue # child of panel not processed yet
-            if item in items_processed:
+        # (panel, its position in its parent, iterator over its remaining
+        # items and their positions) of the panels being processed, 
+        # innermost last
+        stack = [(None, -1, enumerate(panel_items[None]))]
+
+        # (panel, parent panel, position in the parent) of nested panels,
+        # in the order they're finished
+        moves: list[tuple[bpy.types.NodeTreeInterfacePanel, 
+                          bpy.types.NodeTreeInterfacePanel, int]] = []
+
+        while len(stack) > 0:
+            parent, parent_position, items = stack[-1]
+            position, item = next(items, (-1, None))
+            if item is None:
+                stack.pop()
+                if parent is None:
+                    continue
+                self._write("", 0)
+                grandparent = stack[-1][0]
+                if grandparent is not None:
+                    moves.append((parent, grandparent, parent_position))
                 continue
-            
-            items_processed.add(item)
 
             if item.item_type in {'SOCKET', 'PANEL_TOGGLE'}:
                 self._create_socket(item, parent, panel_dict, ntp_nt)
 
             elif item.item_type == 'PANEL':
-                self._create_panel(
-                    item, 
-                    panel_dict, 
-                    items_processed,
-                    parent, 
-                    ntp_nt
+                self._create_panel(item, panel_dict, ntp_nt)
+                stack.append(
+                    (item, position, enumerate(panel_items.get(item, [])))
                 )
-                if bpy.app.version >= (4, 4, 0) and parent is not None:
-                    nt_var = self._node_tree_vars[ntp_nt._node_tree]
-                    interface_var = f"{nt_var}.interface"
-                    panel_var = panel_dict[item]
-                    parent_var = panel_dict[parent]
-                    self._write(f"{interface_var}.move_to_parent("
-                                f"{panel_var}, {parent_var}, {item.index})")
+
+        # Panels are created at the top level. Moving them once everything
+        # is created places each at its position among its parent's items
+        if bpy.app.version >= (4, 4, 0) and len(moves) > 0:
+            nt_var = self._node_tree_vars[ntp_nt._node_tree]
+            interface_var = f"{nt_var}.interface"
+            self._write("# Move nested panels into their parents")
+            for panel, parent, position in moves:
+                self._write(f"{interface_var}.move_to_parent("
+                            f"{panel_dict[panel]}, {panel_dict[parent]}, "
+                            f"{position})")
+            self._write("", 0)
 
     def _create_socket(
         self, 
@@ -485,21 +788,16 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         self, 
         panel: bpy.types.NodeTreeInterfacePanel,
         panel_dict: dict[bpy.types.NodeTreeInterfacePanel, str],
-        items_processed: set[bpy.types.NodeTreeInterfacePanel], 
-        parent: bpy.types.NodeTreeInterfacePanel, 
         ntp_nt: NTP_NodeTree):
             """
-            Initialize a new tree panel and its subitems
+            Initialize a new tree panel. Its items are created after it by 
+            _process_items()
 
             Helper function to _process_items()
 
             Parameters:
             panel (NodeTreeInterfacePanel): the panel to recreate
             panel_dict (dict[NodeTreeInterfacePanel, str]: panel -> variable
-            items_processed (set[NodeTreeInterfacePanel]): set of already
-                processed items, so none are done twice
-            parent (NodeTreeInterfacePanel): parent panel of the socket
-                (possibly None)
             ntp_nt (NTP_NodeTree): owner of the socket
             """
 
@@ -522,13 +820,6 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
                 description = str_to_py_str(panel.description)
                 self._write(f"{panel_var}.description = {description}")
 
-            panel_dict[panel] = panel_var
-
-            if len(panel.interface_items) > 0:
-                self._process_items(panel, panel_dict, items_processed, ntp_nt)
-            
-            self._write("", 0)
-
     def _set_tree_socket_defaults(
         self, 
         socket_interface: bpy.types.NodeTreeInterfaceSocket,
@@ -547,14 +838,14 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         if not self._operator._include_group_socket_values:
             return
         
-        if type(socket_interface) in NO_DEFAULT_SOCKETS:
+        if socket_interface.interface_type in NO_DEFAULT_SOCKETS:
             return
 
         dv = getattr(socket_interface, "default_value")
 
-        if type(socket_interface) is bpy.types.NodeTreeInterfaceSocketMenu:
+        if socket_interface.interface_type is bpy.types.NodeTreeInterfaceSocketMenu:
             if dv == "":
-                self._operator.report(
+                self._operator._report(
                     {'WARNING'},
                     "NodeToPython: No menu found for socket "
                     f"{socket_interface.name}"
@@ -568,11 +859,12 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
             )
             return
         
-        if type(socket_interface) == bpy.types.NodeTreeInterfaceSocketColor:
+        if socket_interface.interface_type == bpy.types.NodeTreeInterfaceSocketColor:
             dv = vec4_to_py_str(dv)
         elif type(dv) == mathutils.Euler:
             dv = vec3_to_py_str(dv)
-        elif type(dv) == bpy_prop_array:
+        elif type(dv) == tuple:
+            # arrays are copied into tuples by the snapshot
             dv = array_to_py_str(dv)
         elif type(dv) == str:
             dv = str_to_py_str(dv)
@@ -594,7 +886,37 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
             max_val = getattr(socket_interface, "max_value")
             self._write(f"{socket_var}.max_value = {max_val}")
 
-    def _process_node(self, node: bpy.types.Node, ntp_nt: NTP_NodeTree) -> None:
+    def _process_nodes(
+        self, 
+        nodes: list[NodeSnapshot], 
+        ntp_nt: NTP_NodeTree
+    ) -> Generator[None, None, None]:
+        """
+        Processes nodes in order, timing each node type if the export is
+        being profiled
+
+        Parameters:
+        nodes (list[NodeSnapshot]): nodes to process
+        ntp_nt (NTP_NodeTree): the node tree the nodes belong to
+
+        Yields:
+        None, after every NODES_PER_STEP nodes processed
+        """
+        profiler = self._operator._profiler
+        if profiler is None:
+            for i, node in enumerate(nodes, 1):
+                self._process_node(node, ntp_nt)
+                if i % NODES_PER_STEP == 0:
+                    yield
+            return
+        for i, node in enumerate(nodes, 1):
+            start = time.perf_counter()
+            self._process_node(node, ntp_nt)
+            profiler.add_node(node.bl_idname, time.perf_counter() - start)
+            if i % NODES_PER_STEP == 0:
+                yield
+
+    def _process_node(self, node: NodeSnapshot, ntp_nt: NTP_NodeTree) -> None:
         """
         Create node and set settings, defaults, and cosmetics
 
@@ -613,7 +935,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         if node.bl_idname not in ntp_nt._zone_inputs:
             self._set_socket_defaults(node)
 
-    def _create_node(self, node: bpy.types.Node, node_tree_var: str) -> str:
+    def _create_node(self, node: NodeSnapshot, node_tree_var: str) -> str:
         """
         Initializes a new node with location, dimension, and label info
 
@@ -624,20 +946,32 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         node_var (str): variable name for the node
         """
 
-        self._write(f"# Node {node.name}")
-
-        node_var = self._create_var(node.name)
-        self._node_vars[node] = node_var
+        compact = self._setting_rows is not None
+        if not compact:
+            self._write(f"# Node {node.name}")
 
         idname = str_to_py_str(node.bl_idname)
-        self._write(f"{node_var} = {node_tree_var}.nodes.new({idname})")
+        if compact:
+            # Already created and named by the compact node table
+            node_var = self._node_vars[node]
+        elif self._use_node_list:
+            # Large trees index into a list rather than creating a
+            # variable per node
+            node_var = f"{NODE_LIST}[{len(self._node_vars)}]"
+            self._write(f"{NODE_LIST}.append("
+                        f"{node_tree_var}.nodes.new({idname}))")
+        else:
+            node_var = self._create_var(node.name)
+            self._write(f"{node_var} = {node_tree_var}.nodes.new({idname})")
+        self._node_vars[node] = node_var
 
         # label
         if node.label:
             self._write(f"{node_var}.label = {str_to_py_str(node.label)}")
 
         # name
-        self._write(f"{node_var}.name = {str_to_py_str(node.name)}")
+        if not compact:
+            self._write(f"{node_var}.name = {str_to_py_str(node.name)}")
 
         # color
         if node.use_custom_color:
@@ -659,7 +993,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
                             f"{enum_to_py_str(node.warning_propagation)}")
         return node_var
     
-    def _set_settings_defaults(self, node: bpy.types.Node) -> None:
+    def _set_settings_defaults(self, node: NodeSnapshot) -> None:
         """
         Sets the defaults for any settings a node may have
 
@@ -667,131 +1001,78 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         node (Node): the node object we're copying settings from
         node_var (str): name of the variable we're using for the node in our add-on
         """
-        if node.bl_idname not in self._node_settings:
-            self._operator.report({'WARNING'},
+        attributes = self._get_node_attributes(node)
+
+        reference_settings = None
+        elide = self._operator._reference_defaults is not None
+        if elide:
+            reference_settings = self._operator._reference_defaults.get_settings(
+                node, attributes
+            )
+
+        compact = self._setting_rows is not None
+        emit_settings = get_settings_emitter(attributes, elide, compact)
+        emit_settings(self, node, self._node_vars[node], reference_settings)
+
+    def _get_node_attributes(
+        self, 
+        node: NodeSnapshot
+    ) -> tuple[NTPNodeSetting, ...]:
+        """
+        Gets the settings to copy for a node
+
+        Parameters:
+        node (Node): the node we're copying settings from
+
+        Returns:
+        (tuple[NTPNodeSetting, ...]): settings valid for the node's type
+        """
+        attributes = self._operator._node_attributes.get(node.bl_idname)
+        if attributes is not None:
+            return attributes
+
+        resolved_node_settings = get_resolved_node_settings()
+        if node.bl_idname not in resolved_node_settings:
+            self._operator._report({'WARNING'},
                         (f"NodeToPython: couldn't find {node.bl_idname} in "
                          f"settings. Your Blender version may not be supported"))
-            return
+            self._operator._node_attributes[node.bl_idname] = ()
+            return ()
 
-        node_var = self._node_vars[node]
+        return self._validate_node_attributes(
+            node, node.bl_idname, resolved_node_settings[node.bl_idname]
+        )
 
-        node_info = self._node_settings[node.bl_idname]
-        for attr_info in node_info.attributes_:
-            attr_name = attr_info.name_
-            st = attr_info.st_
+    def _validate_node_attributes(
+        self,
+        node: NodeSnapshot,
+        key: str,
+        attributes: tuple[NTPNodeSetting, ...]
+    ) -> tuple[NTPNodeSetting, ...]:
+        """
+        Drops settings a node doesn't actually have, and remembers the result
+        for the rest of the export
 
-            version_gte_min = bpy.app.version >= max(attr_info.min_version_, node_info.min_version_)
-            version_lt_max = bpy.app.version < min(attr_info.max_version_, node_info.max_version_)
-            
-            is_version_valid = version_gte_min and version_lt_max
-            if not is_version_valid:
-                continue
+        Parameters:
+        node (Node): a node of the type we're validating settings for
+        key (str): key to cache the validated settings under
+        attributes (tuple[NTPNodeSetting, ...]): version resolved settings
 
-            if not hasattr(node, attr_name):
-                self._operator.report({'WARNING'},
+        Returns:
+        (tuple[NTPNodeSetting, ...]): settings the node has
+        """
+        valid_attributes = []
+        for attr_info in attributes:
+            if not hasattr(node, attr_info.name_):
+                self._operator._report({'WARNING'},
                             f"NodeToPython: Couldn't find attribute "
-                            f"\"{attr_name}\" for node {node.name} of type "
+                            f"\"{attr_info.name_}\" for nodes of type "
                             f"{node.bl_idname}")
                 continue
-            
-            attr = getattr(node, attr_name, None)
-            if attr is None:
-                continue
+            valid_attributes.append(attr_info)
 
-            setting_str = f"{node_var}.{attr_name}"
-            """
-            A switch statement would've been nice here, 
-            but Blender 3.0 was on Python v3.9
-            """
-            if st == ST.ENUM:
-                if attr != '':
-                    self._write(f"{setting_str} = {enum_to_py_str(attr)}")
-            elif st == ST.ENUM_SET:
-                self._write(f"{setting_str} = {attr}")
-            elif st == ST.STRING:
-                self._write(f"{setting_str} = {str_to_py_str(attr)}")
-            elif st == ST.BOOL or st == ST.INT or st == ST.FLOAT:
-                self._write(f"{setting_str} = {attr}")
-            elif st == ST.VEC1:
-                self._write(f"{setting_str} = {vec1_to_py_str(attr)}")
-            elif st == ST.VEC2:
-                self._write(f"{setting_str} = {vec2_to_py_str(attr)}")
-            elif st == ST.VEC3:
-                self._write(f"{setting_str} = {vec3_to_py_str(attr)}")
-            elif st == ST.VEC4:
-                self._write(f"{setting_str} = {vec4_to_py_str(attr)}")
-            elif st == ST.COLOR:
-                self._write(f"{setting_str} = {color_to_py_str(attr)}")
-            elif st == ST.EULER:
-                self._write(f"{setting_str} = {vec3_to_py_str(attr)}")
-            elif st == ST.MATERIAL:
-                self._set_if_in_blend_file(attr, setting_str, "materials")
-            elif st == ST.OBJECT:
-                self._set_if_in_blend_file(attr, setting_str, "objects")
-            elif st == ST.COLLECTION:
-                self._set_if_in_blend_file(attr, setting_str, "collections")
-            elif st == ST.COLOR_RAMP:
-                self._color_ramp_settings(node, attr_name)
-            elif st == ST.CURVE_MAPPING:
-                self._curve_mapping_settings(node, attr_name)
-            elif st == ST.NODE_TREE:
-                self._node_tree_settings(node, attr_name)
-            elif st == ST.IMAGE:
-                if attr is None:
-                    continue
-                if self._operator._addon_dir != "":
-                    if attr.source in {'FILE', 'GENERATED', 'TILED'}:
-                        if self._save_image(attr):
-                            self._load_image(attr, setting_str)
-                else:
-                    self._set_if_in_blend_file(attr, setting_str, "images")
-
-            elif st == ST.IMAGE_USER:
-                self._image_user_settings(attr, setting_str)
-            elif st == ST.SIM_OUTPUT_ITEMS:
-                self._output_zone_items(attr, setting_str, True)
-            elif st == ST.REPEAT_OUTPUT_ITEMS:
-                self._output_zone_items(attr, setting_str, False)
-            elif st == ST.INDEX_SWITCH_ITEMS:
-                self._index_switch_items(attr, setting_str)
-            elif st == ST.ENUM_DEFINITION:
-                self._enum_definition(attr, setting_str)
-            elif st == ST.BAKE_ITEMS:
-                self._bake_items(attr, setting_str)
-            elif st == ST.CAPTURE_ATTRIBUTE_ITEMS:
-                self._capture_attribute_items(attr, setting_str)
-            elif st == ST.MENU_SWITCH_ITEMS:
-                self._menu_switch_items(attr, setting_str)
-            elif st == ST.FOREACH_GEO_ELEMENT_GENERATION_ITEMS:
-                self._foreach_geo_element_generation_items(attr, setting_str)
-            elif st == ST.FOREACH_GEO_ELEMENT_INPUT_ITEMS:
-                self._foreach_geo_element_input_items(attr, setting_str)
-            elif st == ST.FOREACH_GEO_ELEMENT_MAIN_ITEMS:
-                self._foreach_geo_element_main_items(attr, setting_str)
-            elif st == ST.FORMAT_STRING_ITEMS:
-                self._format_string_items(attr, setting_str)
-            elif st == ST.CLOSURE_INPUT_ITEMS:
-                self._closure_input_items(attr, setting_str)
-            elif st == ST.CLOSURE_OUTPUT_ITEMS:
-                self._closure_output_items(attr, setting_str)
-            elif st == ST.COLOR_MANAGED_DISPLAY_SETTINGS:
-                self._color_managed_display_settings(attr, setting_str)
-            elif st == ST.COLOR_MANAGED_VIEW_SETTINGS:
-                self._color_managed_view_settings(attr, setting_str)
-            elif st == ST.COMPOSITOR_FILE_OUTPUT_ITEMS:
-                self._compositor_file_output_items(attr, setting_str)
-            elif st == ST.EVALUATE_CLOSURE_INPUT_ITEMS:
-                self._evaluate_closure_input_items(attr, setting_str)
-            elif st == ST.EVALUATE_CLOSURE_OUTPUT_ITEMS:
-                self._evaluate_closure_output_items(attr, setting_str)
-            elif st == ST.FIELD_TO_GRID_ITEMS:
-                self._field_to_grid_items(attr, setting_str)
-            elif st == ST.GEOMETRY_VIEWER_ITEMS:
-                self._geometry_viewer_items(attr, setting_str)
-            elif st == ST.COMBINE_BUNDLE_ITEMS:
-                self._combine_bundle_items(attr, setting_str)
-            elif st == ST.SEPARATE_BUNDLE_ITEMS:
-                self._separate_bundle_items(attr, setting_str)
+        self._operator._node_attributes[key] = tuple(valid_attributes)
+        return self._operator._node_attributes[key]
 
     def _set_if_in_blend_file(self, attr, setting_str: str, data_type: str
                               ) -> None:
@@ -803,7 +1084,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         self._write(f"{setting_str} = bpy.data.{data_type}[{name}]",
                     self._operator._inner_indent_level + 1)   
          
-    def _color_ramp_settings(self, node: bpy.types.Node, color_ramp_name: str) -> None:
+    def _color_ramp_settings(self, node: NodeSnapshot, color_ramp_name: str) -> None:
         """
         Replicate a color ramp node
 
@@ -851,7 +1132,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
             color_str = vec4_to_py_str(element.color)
             self._write(f"{element_var}.color = {color_str}\n")
 
-    def _curve_mapping_settings(self, node: bpy.types.Node,
+    def _curve_mapping_settings(self, node: NodeSnapshot,
                                 curve_mapping_name: str) -> None:
         """
         Sets defaults for Float, Vector, and Color curves
@@ -908,7 +1189,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         self._write(f"# Update curve after changes")
         self._write(f"{mapping_var}.update()")
 
-    def _create_curve_map(self, node: bpy.types.Node, i: int, curve: bpy.types.CurveMap,
+    def _create_curve_map(self, node: NodeSnapshot, i: int, curve: bpy.types.CurveMap,
                           curve_mapping_name: str) -> None:
         """
         Helper function to create the ith curve of a node's curve mapping
@@ -961,7 +1242,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         handle = enum_to_py_str(point.handle_type)
         self._write(f"{point_j_var}.handle_type = {handle}")
     
-    def _node_tree_settings(self, node: bpy.types.Node, attr_name: str) -> None:
+    def _node_tree_settings(self, node: NodeSnapshot, attr_name: str) -> None:
         """
         Processes node tree of group node if one is present
 
@@ -1027,7 +1308,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         img_str = img_to_py_str(img)
 
         if not img.has_data:
-            self._operator.report(
+            self._operator._report(
                 {'WARNING'}, 
                 f"{img_str} has no data"
             )
@@ -1042,7 +1323,8 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         
         img_path = f"{img_dir}/{img_str}"
         if not os.path.exists(img_path):
-            img.save_render(img_path)
+            with self._profile("images"):
+                img.save_render(img_path)
         return True
 
     def _load_image(self, img: bpy.types.Image, img_var: str) -> None:
@@ -1402,7 +1684,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
             look_str = enum_to_py_str(view_settings.look)
             self._write(f"{view_settings_str}.look = {look_str}")
 
-    def _hide_hidden_sockets(self, node: bpy.types.Node) -> None:
+    def _hide_hidden_sockets(self, node: NodeSnapshot) -> None:
         """
         Hide hidden sockets
 
@@ -1418,14 +1700,14 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
             if socket.hide is True:
                 self._write(f"{node_var}.outputs[{i}].hide = True")
 
-    def _set_socket_defaults(self, node: bpy.types.Node) -> None:
+    def _set_socket_defaults(self, node: NodeSnapshot) -> None:
         """
         Set input and output socket defaults
         """
         self._set_input_defaults(node)
         self._set_output_defaults(node)
 
-    def _set_input_defaults(self, node: bpy.types.Node) -> None:
+    def _set_input_defaults(self, node: NodeSnapshot) -> None:
         """
         Sets defaults for input sockets
 
@@ -1437,6 +1719,11 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
 
         node_var = self._node_vars[node]
 
+        reference_defaults = None
+        if self._operator._reference_defaults is not None:
+            reference_defaults = \
+                self._operator._reference_defaults.get_input_defaults(node)
+
         for i, input in enumerate(node.inputs):
             if input.bl_idname not in DONT_SET_DEFAULTS and not input.is_linked:
                 if (not self._operator._set_unavailable_defaults) and input.is_unavailable:
@@ -1445,39 +1732,9 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
                 # TODO: this could be cleaner
                 socket_var = f"{node_var}.inputs[{i}]"
 
-                default_val = getattr(input, "default_value")
-                # colors
-                if input.bl_idname == 'NodeSocketColor':
-                    default_val = vec4_to_py_str(default_val)
-
-                # vector types
-                elif "Vector" in input.bl_idname:
-                    if "2D" in input.bl_idname:
-                        default_val = vec2_to_py_str(default_val)
-                    elif "4D" in input.bl_idname:
-                        default_val = vec4_to_py_str(default_val)
-                    else:
-                        default_val = vec3_to_py_str(default_val)
-
-                # rotation types
-                elif input.bl_idname == 'NodeSocketRotation':
-                    default_val = vec3_to_py_str(default_val)
-
-                # strings
-                elif input.bl_idname in {
-                    'NodeSocketString', 
-                    'NodeSocketStringFilePath'
-                }:
-                    default_val = str_to_py_str(default_val)
-
-                #menu
-                elif input.bl_idname == 'NodeSocketMenu':
-                    if default_val == '':
-                        continue
-                    default_val = enum_to_py_str(default_val)
-
                 # images
-                elif input.bl_idname == 'NodeSocketImage':
+                if input.bl_idname == 'NodeSocketImage':
+                    default_val = getattr(input, "default_value")
                     if default_val is not None:
                         if self._operator._mode == 'ADDON':
                             if self._save_image(default_val):
@@ -1487,37 +1744,43 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
                                 )
                         else:
                             self._in_file_inputs(input, socket_var, "images")
-                    default_val = None
 
                 # materials
                 elif input.bl_idname == 'NodeSocketMaterial':
                     self._in_file_inputs(input, socket_var, "materials")
-                    default_val = None
 
                 # collections
                 elif input.bl_idname == 'NodeSocketCollection':
                     self._in_file_inputs(input, socket_var, "collections")
-                    default_val = None
 
                 # objects
                 elif input.bl_idname == 'NodeSocketObject':
                     self._in_file_inputs(input, socket_var, "objects")
-                    default_val = None
 
                 # textures
                 elif input.bl_idname == 'NodeSocketTexture':
                     self._in_file_inputs(input, socket_var, "textures")
-                    default_val = None
 
                 else:
-                    default_val = getattr(input, "default_value")
-
-                if default_val is not None:
-                    self._write(f"# {input.identifier}")
-                    self._write(f"{socket_var}.default_value = {default_val}")
-        self._write("", 0)
+                    default_val = socket_default_to_py_str(input)
+                    if default_val is None:
+                        continue
+                    is_default = (reference_defaults is not None and 
+                        reference_defaults.get(input.identifier) == default_val)
+                    if self._default_rows is not None and not is_default:
+                        self._default_rows.append(
+                            f"({self._node_indices[node]}, {i}, {default_val})"
+                        )
+                        continue
+                    self._write_or_elide(f"# {input.identifier}", is_default)
+                    self._write_or_elide(
+                        f"{socket_var}.default_value = {default_val}", 
+                        is_default
+                    )
+        if self._default_rows is None:
+            self._write("", 0)
 
-    def _set_output_defaults(self, node: bpy.types.Node) -> None:
+    def _set_output_defaults(self, node: NodeSnapshot) -> None:
         """
         Some output sockets need default values set. It's rather annoying
 
@@ -1564,7 +1827,7 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         self._write(f"{socket_var}.default_value = bpy.data.{type}[{name}]",
                     self._operator._inner_indent_level + 1)
 
-    def _process_zones(self, zone_input_list: list[bpy.types.Node]) -> None:
+    def _process_zones(self, zone_input_list: list[NodeSnapshot]) -> None:
         """
         Recreates a zone
         zone_input_list (list[bpy.types.Node]): list of zone input 
@@ -1587,94 +1850,182 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         if zone_input_list:
             self._write("", 0)
 
-    def _get_node_var(
+    def _set_parents(
         self, 
-        node_tree: bpy.types.NodeTree, 
-        node: bpy.types.Node
-    ) -> str:
-        nt_var = self._node_tree_vars[node_tree]
-        return f"{nt_var}.nodes[{str_to_py_str(node.name)}]"
-    
-    def _set_parents(self, node_tree: bpy.types.NodeTree) -> None:
+        node_tree: NodeTreeSnapshot
+    ) -> Generator[None, None, None]:
         """
         Sets parents for all nodes, mostly used to put nodes in frames
 
         Parameters:
         node_tree (NodeTree): node tree we're obtaining nodes from
-        """
+
+        Yields:
+        None, after every NODES_PER_STEP nodes
+        """
+        if self._operator._compact_output:
+            rows = [f"({self._node_indices[node]}, "
+                    f"{self._node_indices[node.parent]})"
+                    for node in node_tree.nodes if node.parent is not None]
+            if rows:
+                self._write(f"# Set parents")
+            yield from self._write_table(f"{INDEX}, {ITEM}", rows, [
+                f"{NODE_LIST}[{INDEX}].parent = {NODE_LIST}[{ITEM}]"
+            ])
+            return
+
         parent_comment = False
-        for node in node_tree.nodes:
+        for i, node in enumerate(node_tree.nodes, 1):
+            if i % NODES_PER_STEP == 0:
+                yield
             if node is not None and node.parent is not None:
                 if not parent_comment:
                     self._write(f"# Set parents")
                     parent_comment = True
-                node_var = self._get_node_var(node_tree, node)
-                parent_var = self._get_node_var(node_tree, node.parent)
+                node_var = self._node_vars[node]
+                parent_var = self._node_vars[node.parent]
                 self._write(f"{node_var}.parent = {parent_var}")
         if parent_comment:
             self._write("", 0)
 
-    def _set_locations(self, node_tree: bpy.types.NodeTree) -> None:
+    def _set_locations(
+        self, 
+        node_tree: NodeTreeSnapshot
+    ) -> Generator[None, None, None]:
         """
         Set locations for all nodes
 
         Parameters:
         node_tree (NodeTree): node tree we're obtaining nodes from
+
+        Yields:
+        None, after every NODES_PER_STEP nodes
         """
 
         self._write(f"# Set locations")
-        for node in node_tree.nodes:
-            node_var = self._get_node_var(node_tree, node)
+        if self._operator._compact_output:
+            rows = [f"({node.location.x}, {node.location.y})"
+                    for node in node_tree.nodes]
+            yield from self._write_table(f"{NODE}, {ITEM}", rows, [
+                f"{NODE}.location = {ITEM}"
+            ], f"zip({NODE_LIST}, {{}})")
+            return
+        for i, node in enumerate(node_tree.nodes, 1):
+            if i % NODES_PER_STEP == 0:
+                yield
+            node_var = self._node_vars[node]
             self._write(f"{node_var}.location "
                         f"= ({node.location.x}, {node.location.y})")
         if node_tree.nodes:
             self._write("", 0)
 
-    def _set_dimensions(self, node_tree: bpy.types.NodeTree) -> None:
+    def _set_dimensions(
+        self, 
+        node_tree: NodeTreeSnapshot
+    ) -> Generator[None, None, None]:
         """
         Set dimensions for all nodes
 
         Parameters:
         node_tree (NodeTree): node tree we're obtaining nodes from
+
+        Yields:
+        None, after every NODES_PER_STEP nodes
         """
         if not self._operator._should_set_dimensions:
             return
 
         self._write(f"# Set dimensions")
-        for node in node_tree.nodes:
-            node_var = self._get_node_var(node_tree, node)
-            self._write(f"{node_var}.width  = {node.width}")
-            self._write(f"{node_var}.height = {node.height}")
+        if self._operator._compact_output:
+            yield from self._set_dimensions_compact(node_tree)
+            return
+        for i, node in enumerate(node_tree.nodes, 1):
+            if i % NODES_PER_STEP == 0:
+                yield
+            node_var = self._node_vars[node]
+
+            reference = None
+            if self._operator._reference_defaults is not None:
+                reference = self._operator._reference_defaults.get_node(node)
+
+            self._write_or_elide(
+                f"{node_var}.width  = {node.width}",
+                reference is not None and reference.width == node.width
+            )
+            self._write_or_elide(
+                f"{node_var}.height = {node.height}",
+                reference is not None and reference.height == node.height
+            )
             self._write("", 0)
         if node_tree.nodes:
             self._write("", 0)
 
-    def _init_links(self, node_tree: bpy.types.NodeTree) -> None:
+    def _set_dimensions_compact(
+        self, 
+        node_tree: NodeTreeSnapshot
+    ) -> Generator[None, None, None]:
+        """
+        Set dimensions for all nodes from a table, leaving out nodes with
+        the same dimensions as a newly created node
+
+        Parameters:
+        node_tree (NodeTree): node tree we're obtaining nodes from
+
+        Yields:
+        None, after every NODES_PER_STEP rows written
+        """
+        rows = []
+        for node in node_tree.nodes:
+            reference = None
+            if self._operator._reference_defaults is not None:
+                reference = self._operator._reference_defaults.get_node(node)
+            if (reference is not None and reference.width == node.width
+                and reference.height == node.height):
+                node_var = self._node_vars[node]
+                self._operator._elide(f"{node_var}.width  = {node.width}")
+                self._operator._elide(f"{node_var}.height = {node.height}")
+                continue
+            rows.append(f"({self._node_indices[node]}, "
+                        f"{node.width}, {node.height})")
+        yield from self._write_table(f"{INDEX}, {ITEM}, {VALUE}", rows, [
+            f"{NODE_LIST}[{INDEX}].width = {ITEM}",
+            f"{NODE_LIST}[{INDEX}].height = {VALUE}"
+        ])
+
+    def _init_links(
+        self, 
+        node_tree: NodeTreeSnapshot
+    ) -> Generator[None, None, None]:
         """
         Create all the links between nodes
 
         Parameters:
         node_tree (NodeTree): node tree to copy, with variable
+
+        Yields:
+        None, after every NODES_PER_STEP links
         """
 
         nt_var = self._node_tree_vars[node_tree]
 
+        # Links are already sorted for multi input sockets
         links = node_tree.links
         if links:
             self._write(f"# Initialize {nt_var} links\n")
-            if hasattr(links[0], "multi_input_sort_id"):
-                # generate links in the correct order for multi input sockets
-                links = sorted(links, key=lambda link: link.multi_input_sort_id)
 
-        for link in links:
+        compact = self._operator._compact_output
+        rows = []
+        for i, link in enumerate(links):
+            if i > 0 and i % NODES_PER_STEP == 0:
+                yield
             if link.from_node is None:
-                self._operator.report(
+                self._operator._report(
                     {'WARNING'},
                     "Link's from_node was None. This shouldn't happen"
                 )
                 continue
             if link.to_node is None:
-                self._operator.report(
+                self._operator._report(
                     {'WARNING'},
                     "Link's to_node was None. This shouldn't happen"
                 )
@@ -1683,41 +2034,45 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
             in_node_var = self._node_vars[link.from_node]
             input_socket = link.from_socket
 
-            """
-            Blender's socket dictionary doesn't guarantee 
-            unique keys, which has caused much wailing and
-            gnashing of teeth. This is a quick fix that
-            doesn't run quick
-            """
-            for i, item in enumerate(link.from_node.outputs.items()):
-                if item[1] == input_socket:
-                    input_idx = i
-                    break
-
             out_node_var = self._node_vars[link.to_node]
             output_socket = link.to_socket
 
-            for i, item in enumerate(link.to_node.inputs.items()):
-                if item[1] == output_socket:
-                    output_idx = i
-                    break
+            if input_socket is None or output_socket is None:
+                self._operator._report(
+                    {'WARNING'},
+                    f"NodeToPython: Couldn't find socket for link "
+                    f"{link.from_node.name} -> {link.to_node.name}"
+                )
+                continue
+
+            if compact:
+                rows.append(f"({self._node_indices[link.from_node]}, "
+                            f"{input_socket.index}, "
+                            f"{self._node_indices[link.to_node]}, "
+                            f"{output_socket.index})")
+                continue
 
             self._write(f"# {in_node_var}.{input_socket.name} "
                         f"-> {out_node_var}.{output_socket.name}")
             
             self._write(f"{nt_var}.links.new(")
             self._write(
-                f"{self._get_node_var(node_tree, link.from_node)}"
-                f".outputs[{input_idx}],",
+                f"{in_node_var}.outputs[{input_socket.index}],",
                 self._operator._inner_indent_level + 1
             )
             self._write(
-                f"{self._get_node_var(node_tree, link.to_node)}"
-                f".inputs[{output_idx}]",
+                f"{out_node_var}.inputs[{output_socket.index}]",
                 self._operator._inner_indent_level + 1
             )
             self._write(")")
 
+        if rows:
+            self._write(f"{NEW_LINK} = {nt_var}.links.new")
+            yield from self._write_table(ITEM, rows, [
+                f"{NEW_LINK}({NODE_LIST}[{ITEM}[0]].outputs[{ITEM}[1]], "
+                f"{NODE_LIST}[{ITEM}[2]].inputs[{ITEM}[3]])"
+            ])
+
         for func in self._write_after_links:
             func()
         self._write_after_links = []
@@ -1729,8 +2084,8 @@ class NodeTreeExporter(metaclass=abc.ABCMeta):
         indent_level: int
     ) -> None:
         node_tree_info = self._operator._node_trees[node_tree]
-        if node_tree in self._node_tree_vars:
-            nt_var = self._node_tree_vars[node_tree]
+        if node_tree_info._snapshot in self._node_tree_vars:
+            nt_var = self._node_tree_vars[node_tree_info._snapshot]
         else:
             nt_var = self._create_var(f"{node_tree.name}")
 
@@ -0,0 +1,147 @@
+import hashlib
+
+import bpy
+import mathutils
+
+from .node_tree_snapshot import NodeSnapshot, NodeTreeSnapshot, StructSnapshot
+from .node_tree_snapshot import to_plain_value
+
+# Size of fingerprints in bytes
+DIGEST_SIZE = 16
+
+# Types of values that are hashed as they are
+_PLAIN_TYPES = {type(None), bool, int, float, str}
+
+# Types of data block properties covered by fingerprint_obj()
+_OBJ_PROPERTY_TYPES = {'BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM'}
+
+def _canonical(value, fingerprints: dict[bpy.types.NodeTree, bytes]):
+    """
+    Converts a snapshotted value into plain, comparable Python values
+
+    Parameters:
+    value: snapshotted value
+    fingerprints (dict[NodeTree, bytes]): fingerprints of the node trees
+        computed so far
+
+    Returns:
+    plain value with a stable repr
+    """
+    value_type = type(value)
+    if value_type in _PLAIN_TYPES:
+        return value
+    if value_type is tuple or value_type is list:
+        if all(type(item) in _PLAIN_TYPES for item in value):
+            return tuple(value)
+        return tuple(_canonical(item, fingerprints) for item in value)
+    if isinstance(value, (mathutils.Vector, mathutils.Euler, mathutils.Color)):
+        return tuple(value)
+    if isinstance(value, StructSnapshot):
+        return tuple((name, _canonical(item, fingerprints))
+                     for name, item in value._properties.items())
+    if isinstance(value, bpy.types.NodeTree):
+        # Nested groups are covered by their contents, not their name
+        if value in fingerprints:
+            return fingerprints[value]
+        library = value.library.filepath if value.library is not None else ""
+        return ("NodeTree", value.name, library)
+    if isinstance(value, bpy.types.ID):
+        # Other data blocks are looked up by name by the generated code
+        return (type(value).__name__, value.name)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    return repr(value)
+
+def fingerprint_node_tree(
+    node_tree: NodeTreeSnapshot,
+    fingerprints: dict[bpy.types.NodeTree, bytes]
+) -> bytes:
+    """
+    Computes a content hash of a node tree snapshot covering node types,
+    settings, socket defaults, links and interface items, in a single pass
+
+    The node tree's own name is left out, and nested groups are covered by
+    their fingerprints, so they have to be fingerprinted first (i.e. in
+    export order). Entries are hashed one at a time, as the repr of a list
+    of them, so fingerprints stamped by earlier exports still match
+
+    Parameters:
+    node_tree (NodeTreeSnapshot): snapshot of the node tree
+    fingerprints (dict[NodeTree, bytes]): fingerprints of the node trees
+        computed so far
+
+    Returns:
+    (bytes): the fingerprint
+    """
+    node_indices: dict[NodeSnapshot, int] = {
+        node: i for i, node in enumerate(node_tree.nodes)
+    }
+
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    hasher.update(f"[{node_tree.bl_idname!r}, "
+                  f"{_canonical(node_tree, fingerprints)!r}".encode())
+
+    def update(entry: tuple) -> None:
+        hasher.update(f", {entry!r}".encode())
+
+    for item in node_tree.interface.items_tree:
+        update((
+            item.item_type,
+            item.interface_type.__name__,
+            item.name,
+            item.index,
+            item.parent.index,
+            _canonical(item, fingerprints)
+        ))
+
+    for node in node_tree.nodes:
+        update((
+            node.bl_idname,
+            node.name,
+            tuple(node.location),
+            node.width,
+            node.height,
+            node_indices.get(node.parent),
+            node_indices.get(node.paired_output),
+            _canonical(node, fingerprints),
+            tuple((socket.identifier, socket.hide, socket.is_unavailable,
+                   _canonical(socket.default_value, fingerprints))
+                  for socket in node.inputs),
+            tuple((socket.identifier, socket.hide, socket.is_unavailable,
+                   _canonical(socket.default_value, fingerprints))
+                  for socket in node.outputs)
+        ))
+
+    for link in node_tree.links:
+        update((
+            node_indices.get(link.from_node),
+            None if link.from_socket is None else link.from_socket.index,
+            node_indices.get(link.to_node),
+            None if link.to_socket is None else link.to_socket.index
+        ))
+
+    hasher.update(b"]")
+    return hasher.digest()
+
+def fingerprint_obj(obj: bpy.types.ID) -> bytes:
+    """
+    Computes a content hash of the settings of the data block a node tree
+    belongs to (material, light, scene, etc.), which are generated along 
+    with the node tree but aren't part of its snapshot
+
+    Parameters:
+    obj (ID): the data block
+
+    Returns:
+    (bytes): the fingerprint
+    """
+    data = []
+    for prop in obj.bl_rna.properties:
+        if prop.type not in _OBJ_PROPERTY_TYPES:
+            continue
+        value = to_plain_value(getattr(obj, prop.identifier, None))
+        data.append((prop.identifier, _canonical(value, {})))
+
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    hasher.update(repr(data).encode())
+    return hasher.digest()
@@ -0,0 +1,92 @@
+import json
+import zlib
+
+# Name of the generated module loading node group functions from the payload
+PAYLOAD_MODULE = "ntp_payload"
+
+# Name of the payload file in the generated add-on
+PAYLOAD_FILE_NAME = "node_trees.bin"
+
+# Identifies payload files, and the version of their layout
+PAYLOAD_MAGIC = b"NTP\x01"
+
+# Source of the generated loader module, indented with four spaces. Node
+# group functions are only decompressed and compiled the first time they're
+# called, so importing the add-on doesn't depend on how many were exported
+LOADER_SOURCE = f'''\
+import json
+import mmap
+import os
+import zlib
+
+_PAYLOAD_PATH = os.path.join(os.path.dirname(__file__), "{PAYLOAD_FILE_NAME}")
+_PAYLOAD_MAGIC = {PAYLOAD_MAGIC!r}
+
+# Memory mapped payload, None until a node group is first loaded
+_payload = None
+
+# Function name -> (offset, size) of its compressed source
+_index = {{}}
+
+# Offset of the compressed sources in the payload
+_data_offset = 0
+
+def _open():
+    global _payload, _data_offset
+    with open(_PAYLOAD_PATH, 'rb') as file:
+        _payload = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if _payload[:4] != _PAYLOAD_MAGIC:
+        close()
+        raise RuntimeError(f"Unsupported node tree payload {{_PAYLOAD_PATH}}")
+    index_size = int.from_bytes(_payload[4:8], 'little')
+    _index.update(json.loads(_payload[8:8 + index_size]))
+    _data_offset = 8 + index_size
+
+def load(module_globals: dict, func: str):
+    """
+    Defines a node group function from the payload in the module calling it,
+    replacing its stub, and returns it
+    """
+    if _payload is None:
+        _open()
+    offset, size = _index[func]
+    start = _data_offset + offset
+    source = zlib.decompress(_payload[start:start + size]).decode()
+    exec(compile(source, f"{{_PAYLOAD_PATH}}:{{func}}", "exec"), module_globals)
+    return module_globals[func]
+
+def close():
+    global _payload
+    if _payload is not None:
+        _payload.close()
+        _payload = None
+        _index.clear()
+'''
+
+def write_payload(path: str, functions: dict[str, str]) -> None:
+    """
+    Writes generated node group functions to a payload file: a magic number,
+    the size of the index, a JSON index of function name -> (offset, size),
+    then each function's source compressed on its own, so it can be read
+    without decompressing the others
+
+    Parameters:
+    path (str): path of the payload file
+    functions (dict[str, str]): function name -> generated source
+    """
+    index: dict[str, tuple[int, int]] = {}
+    chunks: list[bytes] = []
+    offset = 0
+    for func, source in functions.items():
+        chunk = zlib.compress(source.encode(), 9)
+        index[func] = (offset, len(chunk))
+        chunks.append(chunk)
+        offset += len(chunk)
+
+    index_bytes = json.dumps(index).encode()
+    with open(path, 'wb') as file:
+        file.write(PAYLOAD_MAGIC)
+        file.write(len(index_bytes).to_bytes(4, 'little'))
+        file.write(index_bytes)
+        for chunk in chunks:
+            file.write(chunk)
@@ -0,0 +1,525 @@
+from typing import Generator
+
+import bpy
+import mathutils
+
+from bpy.types import bpy_prop_array
+
+from .node_settings import NTPNodeSetting, ST
+from .node_settings_resolver import get_resolved_node_settings
+
+# Nodes or links handled between the steps of an export run step by step,
+# so a large node tree doesn't keep Blender's UI waiting for long
+NODES_PER_STEP = 50
+
+# Node tree properties read by the exporters, if the node tree has them
+TREE_PROPERTIES = (
+    "color_tag",
+    "description",
+    "default_group_node_width",
+    # Geometry nodes
+    "is_modifier",
+    "is_tool",
+    "is_mode_object",
+    "is_mode_edit",
+    "is_mode_sculpt",
+    "is_type_curve",
+    "is_type_mesh",
+    "is_type_point_cloud",
+    "use_wait_for_click",
+    "show_modifier_manage_panel",
+    # Compositor
+    "chunk_size",
+    "edit_quality",
+    "execution_mode",
+    "precision",
+    "render_quality",
+    "use_groupnode_buffer",
+    "use_opencl",
+    "use_two_pass",
+    "use_viewer_border"
+)
+
+# Node tree interface item properties, if the item has them
+INTERFACE_ITEM_PROPERTIES = (
+    "in_out",
+    "bl_socket_idname",
+    "dimensions",
+    "default_value",
+    "min_value",
+    "max_value",
+    "subtype",
+    "default_attribute_name",
+    "attribute_domain",
+    "hide_value",
+    "hide_in_modifier",
+    "force_non_field",
+    "description",
+    "layer_selection_field",
+    "is_inspect_output",
+    "default_input",
+    "is_panel_toggle",
+    "menu_expanded",
+    "structure_type",
+    "optional_label",
+    "default_closed"
+)
+
+# Node properties, if the node has them
+NODE_PROPERTIES = (
+    "label",
+    "use_custom_color",
+    "color",
+    "mute",
+    "hide",
+    "warning_propagation"
+)
+
+COLOR_RAMP_PROPERTIES = ("color_mode", "hue_interpolation", "interpolation")
+COLOR_RAMP_ELEMENT_PROPERTIES = ("position", "alpha", "color")
+
+CURVE_MAPPING_PROPERTIES = (
+    "extend",
+    "tone",
+    "black_level",
+    "white_level",
+    "clip_min_x",
+    "clip_min_y",
+    "clip_max_x",
+    "clip_max_y",
+    "use_clip"
+)
+CURVE_MAP_POINT_PROPERTIES = ("location", "handle_type")
+
+IMAGE_USER_PROPERTIES = (
+    "frame_current",
+    "frame_duration",
+    "frame_offset",
+    "frame_start",
+    "tile",
+    "use_auto_refresh",
+    "use_cyclic"
+)
+
+# Properties of the items of zones, bakes, menu switches, etc.
+ITEM_PROPERTIES = (
+    "name",
+    "socket_type",
+    "data_type",
+    "attribute_domain",
+    "domain",
+    "is_attribute",
+    "description",
+    "structure_type",
+    "auto_remove",
+    "override_node_format",
+    "save_as_render",
+    "vector_socket_dimensions"
+)
+
+DISPLAY_SETTINGS_PROPERTIES = ("display_device", "emulation")
+VIEW_SETTINGS_PROPERTIES = ("view_transform", "look")
+
+_MISSING = object()
+
+class StructSnapshot():
+    """
+    Plain copy of the properties of a Blender struct. Properties are read
+    as attributes, and properties the struct didn't have raise an
+    AttributeError, just like the original struct
+    """
+    __slots__ = ("_properties",)
+
+    def __init__(self, properties: dict):
+        self._properties = properties
+
+    def __getattr__(self, name: str):
+        if name == "_properties":
+            raise AttributeError(name)
+        try:
+            return self._properties[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+class SocketSnapshot():
+    """
+    Plain copy of a node socket
+    """
+    __slots__ = (
+        "bl_idname",
+        "identifier",
+        "name",
+        "index",
+        "hide",
+        "is_linked",
+        "is_unavailable",
+        "default_value"
+    )
+
+class NodeSnapshot(StructSnapshot):
+    """
+    Plain copy of a node. Node settings are read as attributes
+    """
+    __slots__ = (
+        "bl_idname",
+        "name",
+        "location",
+        "width",
+        "height",
+        "parent",
+        "paired_output",
+        "inputs",
+        "outputs",
+        "id_data"
+    )
+
+class LinkSnapshot():
+    """
+    Plain copy of a link between two node sockets
+    """
+    __slots__ = ("from_node", "from_socket", "to_node", "to_socket")
+
+class InterfaceItemSnapshot(StructSnapshot):
+    """
+    Plain copy of a node tree interface socket or panel
+    """
+    __slots__ = (
+        "item_type",
+        "interface_type",
+        "name",
+        "index",
+        "parent",
+        "interface_items"
+    )
+
+class InterfaceSnapshot():
+    """
+    Plain copy of a node tree interface
+    """
+    __slots__ = ("items_tree",)
+
+class NodeTreeSnapshot(StructSnapshot):
+    """
+    Plain copy of a node tree, holding everything needed to generate it
+    """
+    __slots__ = (
+        "node_tree",
+        "name",
+        "bl_idname",
+        "interface",
+        "nodes",
+        "links"
+    )
+
+def to_plain_value(value):
+    """
+    Copies a property value so it no longer refers to Blender data
+
+    Parameters:
+    value: property value
+
+    Returns:
+    plain copy of the value (data blocks are kept as references)
+    """
+    if isinstance(value, bpy_prop_array):
+        return tuple(value)
+    if isinstance(value, (mathutils.Vector, mathutils.Euler, mathutils.Color)):
+        return value.copy()
+    return value
+
+def _snapshot_properties(struct, names: tuple[str, ...]) -> dict:
+    """
+    Copies the properties of a struct
+
+    Parameters:
+    struct: the Blender struct
+    names (tuple[str, ...]): names of the properties to copy
+
+    Returns:
+    (dict): property name -> plain value, for the properties the struct has
+    """
+    properties = {}
+    for name in names:
+        value = getattr(struct, name, _MISSING)
+        if value is not _MISSING:
+            properties[name] = to_plain_value(value)
+    return properties
+
+def _snapshot_struct(struct, names: tuple[str, ...]) -> StructSnapshot:
+    return StructSnapshot(_snapshot_properties(struct, names))
+
+def _snapshot_setting(attr_info: NTPNodeSetting, value):
+    """
+    Copies the value of a node setting
+
+    Parameters:
+    attr_info (NTPNodeSetting): the setting
+    value: the setting's value
+
+    Returns:
+    plain copy of the value
+    """
+    if value is None:
+        return None
+
+    st = attr_info.st_
+    if st == ST.COLOR_RAMP:
+        color_ramp = _snapshot_properties(value, COLOR_RAMP_PROPERTIES)
+        color_ramp["elements"] = [
+            _snapshot_struct(element, COLOR_RAMP_ELEMENT_PROPERTIES)
+            for element in value.elements
+        ]
+        return StructSnapshot(color_ramp)
+    elif st == ST.CURVE_MAPPING:
+        mapping = _snapshot_properties(value, CURVE_MAPPING_PROPERTIES)
+        mapping["curves"] = [
+            StructSnapshot({"points": [
+                _snapshot_struct(point, CURVE_MAP_POINT_PROPERTIES)
+                for point in curve.points
+            ]})
+            for curve in value.curves
+        ]
+        return StructSnapshot(mapping)
+    elif st == ST.IMAGE_USER:
+        return _snapshot_struct(value, IMAGE_USER_PROPERTIES)
+    elif st == ST.COLOR_MANAGED_DISPLAY_SETTINGS:
+        return _snapshot_struct(value, DISPLAY_SETTINGS_PROPERTIES)
+    elif st == ST.COLOR_MANAGED_VIEW_SETTINGS:
+        return _snapshot_struct(value, VIEW_SETTINGS_PROPERTIES)
+    elif st.name.endswith("_ITEMS"):
+        return [_snapshot_struct(item, ITEM_PROPERTIES) for item in value]
+    # plain values and referenced data blocks
+    return to_plain_value(value)
+
+def _snapshot_socket(socket: bpy.types.NodeSocket, index: int) -> SocketSnapshot:
+    socket_snapshot = SocketSnapshot()
+    socket_snapshot.bl_idname = socket.bl_idname
+    socket_snapshot.identifier = socket.identifier
+    socket_snapshot.name = socket.name
+    socket_snapshot.index = index
+    socket_snapshot.hide = socket.hide
+    socket_snapshot.is_linked = socket.is_linked
+    socket_snapshot.is_unavailable = socket.is_unavailable
+    socket_snapshot.default_value = to_plain_value(
+        getattr(socket, "default_value", None)
+    )
+    return socket_snapshot
+
+def _snapshot_node(
+    node: bpy.types.Node,
+    tree_snapshot: NodeTreeSnapshot,
+    sockets: dict[int, SocketSnapshot]
+) -> NodeSnapshot:
+    """
+    Copies a node, its settings, and its sockets
+
+    Parameters:
+    node (Node): node to copy
+    tree_snapshot (NodeTreeSnapshot): snapshot of the node's tree
+    sockets (dict[int, SocketSnapshot]): socket pointer -> socket snapshot,
+        filled in with the node's sockets
+
+    Returns:
+    (NodeSnapshot): the node snapshot
+    """
+    properties = _snapshot_properties(node, NODE_PROPERTIES)
+    for attr_info in get_resolved_node_settings().get(node.bl_idname, ()):
+        value = getattr(node, attr_info.name_, _MISSING)
+        if value is not _MISSING:
+            properties[attr_info.name_] = _snapshot_setting(attr_info, value)
+
+    node_snapshot = NodeSnapshot(properties)
+    node_snapshot.bl_idname = node.bl_idname
+    node_snapshot.name = node.name
+    node_snapshot.parent = None
+    node_snapshot.paired_output = None
+    node_snapshot.id_data = tree_snapshot
+
+    node_snapshot.inputs = []
+    for i, socket in enumerate(node.inputs):
+        socket_snapshot = _snapshot_socket(socket, i)
+        sockets[socket.as_pointer()] = socket_snapshot
+        node_snapshot.inputs.append(socket_snapshot)
+
+    node_snapshot.outputs = []
+    for i, socket in enumerate(node.outputs):
+        socket_snapshot = _snapshot_socket(socket, i)
+        sockets[socket.as_pointer()] = socket_snapshot
+        node_snapshot.outputs.append(socket_snapshot)
+
+    return node_snapshot
+
+def _snapshot_interface(
+    interface: bpy.types.NodeTreeInterface
+) -> InterfaceSnapshot:
+    """
+    Copies a node tree interface
+
+    Parameters:
+    interface (NodeTreeInterface): interface to copy
+
+    Returns:
+    (InterfaceSnapshot): the interface snapshot
+    """
+    items: dict[int, InterfaceItemSnapshot] = {}
+
+    def get_item(item) -> InterfaceItemSnapshot:
+        pointer = item.as_pointer()
+        if pointer not in items:
+            # Only the root panel isn't part of items_tree
+            item_snapshot = InterfaceItemSnapshot({})
+            item_snapshot.item_type = 'PANEL'
+            item_snapshot.interface_type = type(item)
+            item_snapshot.name = item.name
+            item_snapshot.index = item.index
+            item_snapshot.parent = None
+            item_snapshot.interface_items = []
+            items[pointer] = item_snapshot
+        return items[pointer]
+
+    items_tree = []
+    for item in interface.items_tree:
+        item_snapshot = InterfaceItemSnapshot(
+            _snapshot_properties(item, INTERFACE_ITEM_PROPERTIES)
+        )
+        item_snapshot.item_type = item.item_type
+        item_snapshot.interface_type = type(item)
+        item_snapshot.name = item.name
+        item_snapshot.index = item.index
+        item_snapshot.interface_items = []
+        items[item.as_pointer()] = item_snapshot
+        items_tree.append(item_snapshot)
+
+    for item, item_snapshot in zip(interface.items_tree, items_tree):
+        item_snapshot.parent = get_item(item.parent)
+        if item.item_type == 'PANEL':
+            item_snapshot.interface_items = [
+                get_item(child) for child in item.interface_items
+            ]
+
+    interface_snapshot = InterfaceSnapshot()
+    interface_snapshot.items_tree = items_tree
+    return interface_snapshot
+
+def snapshot_node_tree(node_tree: bpy.types.NodeTree) -> NodeTreeSnapshot:
+    """
+    Copies everything needed to generate a node tree all at once, see 
+    snapshot_node_tree_steps()
+
+    Parameters:
+    node_tree (NodeTree): node tree to copy
+
+    Returns:
+    (NodeTreeSnapshot): the node tree snapshot
+    """
+    steps = snapshot_node_tree_steps(node_tree)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def snapshot_node_tree_steps(
+    node_tree: bpy.types.NodeTree
+) -> Generator[None, None, NodeTreeSnapshot]:
+    """
+    Copies everything needed to generate a node tree, so code generation
+    doesn't have to read from Blender
+
+    Referenced data blocks (node trees, images, materials, etc.) are kept
+    as references
+
+    Parameters:
+    node_tree (NodeTree): node tree to copy
+
+    Yields:
+    None, after every NODES_PER_STEP nodes or links copied
+
+    Returns:
+    (NodeTreeSnapshot): the node tree snapshot
+    """
+    tree_snapshot = NodeTreeSnapshot(
+        _snapshot_properties(node_tree, TREE_PROPERTIES)
+    )
+    tree_snapshot.node_tree = node_tree
+    tree_snapshot.name = node_tree.name
+    tree_snapshot.bl_idname = node_tree.bl_idname
+    tree_snapshot.interface = _snapshot_interface(node_tree.interface)
+
+    nodes = node_tree.nodes
+    num_nodes = len(nodes)
+
+    # Bulk read node cosmetics
+    locations = [0.0] * (2 * num_nodes)
+    widths = [0.0] * num_nodes
+    heights = [0.0] * num_nodes
+    nodes.foreach_get("location", locations)
+    nodes.foreach_get("width", widths)
+    nodes.foreach_get("height", heights)
+
+    node_snapshots: dict[int, NodeSnapshot] = {}
+    sockets: dict[int, SocketSnapshot] = {}
+    tree_snapshot.nodes = []
+    for i, node in enumerate(nodes):
+        node_snapshot = _snapshot_node(node, tree_snapshot, sockets)
+        node_snapshot.location = mathutils.Vector(
+            (locations[2 * i], locations[2 * i + 1])
+        )
+        node_snapshot.width = widths[i]
+        node_snapshot.height = heights[i]
+        node_snapshots[node.as_pointer()] = node_snapshot
+        tree_snapshot.nodes.append(node_snapshot)
+        if (i + 1) % NODES_PER_STEP == 0:
+            yield
+
+    # Resolve references between nodes
+    for node, node_snapshot in zip(nodes, tree_snapshot.nodes):
+        if node.parent is not None:
+            node_snapshot.parent = node_snapshots[node.parent.as_pointer()]
+        paired_output = getattr(node, "paired_output", None)
+        if paired_output is not None:
+            node_snapshot.paired_output = \
+                node_snapshots[paired_output.as_pointer()]
+
+    links = node_tree.links
+    if links and hasattr(links[0], "multi_input_sort_id"):
+        # generate links in the correct order for multi input sockets
+        links = sorted(links, key=lambda link: link.multi_input_sort_id)
+
+    tree_snapshot.links = []
+    for i, link in enumerate(links, 1):
+        link_snapshot = LinkSnapshot()
+        link_snapshot.from_node = None
+        link_snapshot.to_node = None
+        if link.from_node is not None:
+            link_snapshot.from_node = \
+                node_snapshots[link.from_node.as_pointer()]
+        if link.to_node is not None:
+            link_snapshot.to_node = node_snapshots[link.to_node.as_pointer()]
+        link_snapshot.from_socket = sockets.get(link.from_socket.as_pointer())
+        link_snapshot.to_socket = sockets.get(link.to_socket.as_pointer())
+        tree_snapshot.links.append(link_snapshot)
+        if i % NODES_PER_STEP == 0:
+            yield
+
+    return tree_snapshot
+
+def uses_images(tree_snapshot: NodeTreeSnapshot) -> bool:
+    """
+    Checks whether any node of a node tree snapshot refers to an image, 
+    either through a setting or an input socket's default value
+
+    Parameters:
+    tree_snapshot (NodeTreeSnapshot): snapshot of the node tree
+
+    Returns:
+    (bool): whether the node tree refers to an image
+    """
+    for node in tree_snapshot.nodes:
+        for value in node._properties.values():
+            if isinstance(value, bpy.types.Image):
+                return True
+        for socket in node.inputs:
+            if isinstance(socket.default_value, bpy.types.Image):
+                return True
+    return False
@@ -1,11 +1,13 @@
 import bpy
 
+from .node_tree_snapshot import NodeSnapshot, NodeTreeSnapshot
+
 class NTP_NodeTree:
-    def __init__(self, node_tree: bpy.types.NodeTree, var: str):
-        # Blender node tree object being copied
-        self._node_tree: bpy.types.NodeTree = node_tree
+    def __init__(self, node_tree: NodeTreeSnapshot, var: str):
+        # Snapshot of the Blender node tree being copied
+        self._node_tree: NodeTreeSnapshot = node_tree
 
         # The variable named for the regenerated node tree
         self._var: str = var
 
-        self._zone_inputs: dict[str, list[bpy.types.Node]] = {}
\ No newline at end of file
+        self._zone_inputs: dict[str, list[NodeSnapshot]] = {}
\ No newline at end of file
@@ -1,15 +1,28 @@
+import contextlib
 import datetime
-from io import StringIO
 import os
 import pathlib
 import shutil
-from typing import TextIO, Callable
+import time
+from typing import Any, Callable, Generator
 
 import bpy
 
 from .node_group_gatherer import *
+from .code_emitter import CodeEmitter
+from .export_cache import ExportCache, cache_key
+from .export_profiler import ExportProfiler, PROFILE_FILE_SUFFIX
 from .license_templates import license_templates
+from .name_scope import NameScope
+from .node_group_reuse import REUSE_FUNC, REUSE_SOURCE, SIGNATURE_FUNC
+from .node_group_reuse import STAMP_FUNC
+from .node_tree_fingerprint import fingerprint_node_tree, fingerprint_obj
+from .node_tree_payload import LOADER_SOURCE, PAYLOAD_FILE_NAME, PAYLOAD_MODULE
+from .node_tree_payload import write_payload
+from .node_tree_snapshot import NodeTreeSnapshot, snapshot_node_tree_steps
+from .node_tree_snapshot import uses_images
 from .ntp_options import NTP_PG_Options
+from .reference_defaults import ReferenceDefaults
 from .utils import *
 
 IMAGE_DIR_NAME = "imgs"
@@ -23,12 +36,33 @@ RESERVED_NAMES = {
     BASE_DIR,
     CLASS,
     CLASSES,
-    NODE_TREE_NAMES
+    NODE_TREE_NAMES,
+    PAYLOAD_MODULE,
+    REUSE_FUNC,
+    SIGNATURE_FUNC,
+    STAMP_FUNC
+}
+
+# Node group type -> bpy.data collection of the exported data blocks
+BLEND_DATA_COLLECTIONS = {
+    NodeGroupType.COMPOSITOR_NODE_GROUP: "node_groups",
+    NodeGroupType.SCENE:                 "scenes",
+    NodeGroupType.GEOMETRY_NODE_GROUP:   "node_groups",
+    NodeGroupType.LIGHT:                 "lights",
+    NodeGroupType.LINE_STYLE:            "linestyles",
+    NodeGroupType.MATERIAL:              "materials",
+    NodeGroupType.SHADER_NODE_GROUP:     "node_groups",
+    NodeGroupType.WORLD:                 "worlds",
 }
 
 MIN_BLENDER_VERSION = (4, 2, 0)
 MAX_BLENDER_VERSION = (5, 1, 0)
 
+# Seconds between steps of an export running in the background, and how 
+# long each of them may take, so the UI keeps redrawing in between
+MODAL_TIMER_INTERVAL = 0.01
+MODAL_STEP_BUDGET = 0.05
+
 class NodeTreeInfo():
     def __init__(self):
         self._func : str = ""
@@ -36,26 +70,34 @@ class NodeTreeInfo():
         self._is_base : bool = False
         # Dictionary acts as an ordered set
         self._dependencies: dict[bpy.types.NodeTree, None] = {}
-        self._base_dependents: set[bpy.types.NodeTree] = set()
         self._lib_dependencies: dict[pathlib.Path, list[bpy.types.NodeTree]] = {}
         self._obj: NTPObject = None
         self._base_tree : bpy.types.NodeTree = None
+        self._snapshot : NodeTreeSnapshot = None
+        # Content hash of the node tree, including nested groups
+        self._fingerprint : bytes = b""
         self._group_type: NodeGroupType = NodeGroupType.GEOMETRY_NODE_GROUP
 
-class NTP_OT_Export(bpy.types.Operator):
-    bl_idname = "ntp.export"
-    bl_label = "Export"
-    bl_description = "Export node group(s) to Python"
-    bl_options = {'REGISTER', 'UNDO'}
+class ExportSession():
+    """
+    State of a single export. Doesn't depend on the UI or on running as an
+    operator, so it's used by both NTP_OT_Export and the Python API
+    """
+    def __init__(self, report: Callable[[set[str], str], None]):
+        # Reports a message to whoever started the export
+        self.report: Callable[[set[str], str], None] = report
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        # Generated script, in script mode
+        self._script: str = ""
+
+        # Path of the add-on zip or blend file written by the export
+        self._output_path: str = ""
 
         # Write functions after nodes are mostly initialized and linked up
         self._write_after_links: list[Callable] = []
 
-        # File (TextIO) or string (StringIO) the add-on/script is generated into
-        self._file: TextIO | StringIO = StringIO()
+        # Buffers the add-on/script modules being generated
+        self._emitter: CodeEmitter = CodeEmitter()
 
         # Path to the directory of the zip file
         self._zip_dir: str = ""
@@ -72,15 +114,19 @@ class NTP_OT_Export(bpy.types.Operator):
         self._outer_indent_level: int = 0
         self._inner_indent_level: int = 1
 
-        # Dictionary to keep track of variables->usage count pairs
-        self._used_vars: dict[str, int] = {}
+        # Variable names used across the whole export. Node tree exporters
+        # create their names in child scopes of it
+        self._names: NameScope = NameScope()
 
         for name in RESERVED_NAMES:
-            self._used_vars[name] = 0
+            self._names.reserve(name)
         
         # Useful information about exported node trees
         self._node_trees: dict[bpy.types.NodeTree, NodeTreeInfo] = {}
 
+        # Node type -> settings to copy, validated once per export
+        self._node_attributes: dict[str, tuple] = {}
+
         # Number of objects we end up exporting
         self._num_objs: int = 0
 
@@ -90,16 +136,121 @@ class NTP_OT_Export(bpy.types.Operator):
         # Set dimensions of generated nodes
         self._should_set_dimensions = True
 
+        # Node trees with more nodes than this store them in a list
+        self._max_node_variables = 1000
+
         # Indentation string (default: four spaces)
         self._indentation = "    "
 
         # Should we link external libraries (True), or recreate them (False)
         self._link_external_node_groups = True
 
+        # Library -> its path relative to Blender's datafiles if it's
+        # essential, otherwise None
+        self._essential_libraries: dict[bpy.types.Library, 
+                                        pathlib.Path | None] = {}
+
+        # Blender's datafiles directory, resolved once per export
+        self._datafiles_path: pathlib.Path | None = None
+
         # Set default values for hidden sockets
         self._set_unavailable_defaults = False
 
-    def execute(self, context: bpy.types.Context):
+        # Skip values equal to those of newly created nodes and data blocks
+        self._elide_defaults = False
+
+        # Nodes and data blocks to compare against when eliding defaults
+        self._reference_defaults: ReferenceDefaults | None = None
+
+        # Number of bytes left out of the generated code by eliding defaults
+        self._elided_bytes: int = 0
+
+        # Reports collected while generating a node tree in its own buffer,
+        # None if reports go straight to Blender
+        self._reports: list[tuple[set[str], str]] | None = None
+
+        # Reuse code generated for unchanged node trees by previous exports
+        self._use_export_cache = False
+
+        # Code generated by previous exports of the add-on
+        self._export_cache: ExportCache | None = None
+
+        # Generate node groups with identical contents only once
+        self._dedupe_node_groups = False
+
+        # Number of node groups merged into an identical one
+        self._num_deduped: int = 0
+
+        # Have generated node groups reuse identical, already generated ones
+        self._reuse_node_groups = False
+
+        # Generate nodes, settings and links from tables of values
+        self._compact_output = False
+
+        # Store generated node group functions in a payload file
+        self._use_payload = False
+
+        # Function name -> generated source of node groups in the payload
+        self._payload: dict[str, str] = {}
+
+        # Should the script generated next to a blend file link the node 
+        # trees (True), or append them (False)
+        self._link_blend_data = False
+
+        # Times the phases of the export, None if it isn't being profiled
+        self._profiler: ExportProfiler | None = None
+
+        # Path of the profile report written by the export
+        self._profile_path: str = ""
+
+        # Number of steps of the export, and how many are done
+        self._num_steps: int = 0
+        self._num_steps_done: int = 0
+
+    def export(
+        self, 
+        gatherer: NodeGroupGatherer, 
+        options: NTP_PG_Options
+    ) -> set[str]:
+        """
+        Exports the gathered data blocks
+
+        Parameters:
+        gatherer (NodeGroupGatherer): data blocks to export
+        options (NTP_PG_Options): export options, or any object with the 
+            same attributes
+
+        Returns:
+        (set[str]): operator result
+        """
+        steps = self.export_steps(gatherer, options)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    def export_steps(
+        self, 
+        gatherer: NodeGroupGatherer, 
+        options: NTP_PG_Options
+    ) -> Generator[float, None, set[str]]:
+        """
+        Exports the gathered data blocks in steps of up to NODES_PER_STEP
+        nodes or links of a node tree, so the export can be spread over 
+        several UI frames. Use cancel() to stop it early
+
+        Parameters:
+        gatherer (NodeGroupGatherer): data blocks to export
+        options (NTP_PG_Options): export options, or any object with the 
+            same attributes
+
+        Yields:
+        (float): progress of the export, from 0 to 1, after each step
+
+        Returns:
+        (set[str]): operator result
+        """
         if bpy.app.version >= MAX_BLENDER_VERSION:
             self.report(
                 {'WARNING'},
@@ -130,9 +281,128 @@ class NTP_OT_Export(bpy.types.Operator):
                 "docs/README.md#supported-versions "
             )
         
-        if not self._setup_options(getattr(context.scene, "ntp_options")):
+        if not self._setup_options(options):
             return {'CANCELLED'}
-        
+
+        if self._profiler is None:
+            return (yield from self._export_steps(gatherer))
+
+        self._profiler.add_phase("gather", gatherer.seconds)
+        self._profiler.start()
+        try:
+            result = yield from self._pause_between_steps(
+                self._export_steps(gatherer)
+            )
+        finally:
+            self._profiler.stop()
+        if result == {'FINISHED'}:
+            self._write_profile()
+        return result
+
+    def _pause_between_steps(
+        self, 
+        steps: Generator[float, None, set[str]]
+    ) -> Generator[float, None, set[str]]:
+        """
+        Pauses the profiler while the export waits between steps, so time 
+        spent elsewhere in Blender isn't profiled
+
+        Parameters:
+        steps (Generator[float, None, set[str]]): the export's steps
+
+        Yields:
+        (float): progress of the export, from 0 to 1, after each step
+
+        Returns:
+        (set[str]): operator result
+        """
+        try:
+            while True:
+                try:
+                    progress = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+                self._profiler.pause()
+                try:
+                    yield progress
+                finally:
+                    self._profiler.resume()
+        finally:
+            steps.close()
+
+    def cancel(self, steps: Generator[float, None, set[str]]) -> None:
+        """
+        Stops an export started with export_steps(), and removes the 
+        partially written add-on. Earlier exports' output is left untouched, 
+        since it's only replaced in the export's last step
+
+        Parameters:
+        steps (Generator[float, None, set[str]]): the export's steps
+        """
+        steps.close()
+        if self._zip_dir != "" and os.path.isdir(self._zip_dir):
+            shutil.rmtree(self._zip_dir)
+
+    def _advance(self) -> float:
+        """
+        Counts a finished step of the export
+
+        Returns:
+        (float): progress of the export, from 0 to 1
+        """
+        self._num_steps_done += 1
+        return self._progress()
+
+    def _progress(self) -> float:
+        """
+        Returns:
+        (float): progress of the export, from 0 to 1
+        """
+        return min(self._num_steps_done / max(self._num_steps, 1), 1.0)
+
+    def _with_progress(
+        self, 
+        steps: Generator[None, None, Any]
+    ) -> Generator[float, None, Any]:
+        """
+        Runs the steps of snapshotting or generating a node tree as steps 
+        of the export, so a large node tree is handled over several steps
+
+        Parameters:
+        steps (Generator[None, None, Any]): steps of handling the node tree
+
+        Yields:
+        (float): progress of the export, from 0 to 1, between the steps
+
+        Returns:
+        (Any): what the steps return
+        """
+        try:
+            while True:
+                try:
+                    next(steps)
+                except StopIteration as stop:
+                    return stop.value
+                yield self._progress()
+        finally:
+            steps.close()
+
+    def _export_steps(
+        self, 
+        gatherer: NodeGroupGatherer
+    ) -> Generator[float, None, set[str]]:
+        """
+        Exports the gathered data blocks, once options are set up
+
+        Parameters:
+        gatherer (NodeGroupGatherer): data blocks to export
+
+        Yields:
+        (float): progress of the export, from 0 to 1, after each step
+
+        Returns:
+        (set[str]): operator result
+        """
         if self._mode == 'ADDON':
             self._outer_indent_level = 2
             self._inner_indent_level = 3
@@ -140,40 +410,83 @@ class NTP_OT_Export(bpy.types.Operator):
             if not self._setup_addon_directories(self._name):
                 return {'CANCELLED'}
 
+            if self._use_export_cache and not self._use_payload:
+                self._export_cache = ExportCache(
+                    self._dir_path, clean_string(self._name)
+                )
+
         elif self._mode == 'SCRIPT':
-            self._file = StringIO("")
             if self._include_imports:
                 self._create_imports()
+            self._create_reuse_funcs()
         
         # Imported here to avoid circular dependency issues
         from .compositor.exporter import CompositorExporter
         from .geometry.exporter import GeometryNodesExporter
         from .shader.exporter import ShaderExporter
 
-        self._calculate_export_order(context)
+        with self._profile("export_order"):
+            self._calculate_export_order(gatherer)
+
+        if self._mode == 'BLEND':
+            return self._export_blend()
+
+        # Each node tree is snapshotted, then generated
+        self._num_steps = 2 * len(self._export_order)
+
+        # Read everything we need from the node trees before generating code.
+        # Fingerprints are only needed to cache, merge or reuse node trees.
+        # Dependencies come first in the export order, so nested groups are
+        # fingerprinted before the node trees using them
+        use_fingerprints = (self._export_cache is not None 
+                            or self._dedupe_node_groups 
+                            or self._reuse_node_groups)
+        fingerprints: dict[bpy.types.NodeTree, bytes] = {}
+        for nt_info in self._export_order:
+            name = nt_info._obj.name
+            with self._profile("snapshot", name):
+                nt_info._snapshot = yield from self._with_progress(
+                    snapshot_node_tree_steps(nt_info._base_tree)
+                )
+            if use_fingerprints:
+                with self._profile("fingerprint", name):
+                    nt_info._fingerprint = fingerprint_node_tree(
+                        nt_info._snapshot, fingerprints
+                    )
+                fingerprints[nt_info._base_tree] = nt_info._fingerprint
+            if self._profiler is not None:
+                self._profiler.count(name, "nodes", 
+                                     len(nt_info._snapshot.nodes))
+                self._profiler.count(name, "links", 
+                                     len(nt_info._snapshot.links))
+            yield self._advance()
+
+        if self._dedupe_node_groups:
+            with self._profile("dedupe"):
+                self._dedupe_node_trees()
 
         if self._mode == 'ADDON':
             # Create files
             for module in self._modules:
-                self._file.close()
-                self._file = open(f"{self._addon_dir}/{module}.py", 'w')
+                self._emitter.set_module(module)
                 self._create_imports()
+                if self._use_payload:
+                    self._write(f"from . import {PAYLOAD_MODULE}\n", 0)
+                self._create_reuse_funcs()
 
             # Import dependencies
             for nt_info in self._export_order:
                 if nt_info._is_base:
-                    self._file.close()
-                    self._file = open(f"{self._addon_dir}/{nt_info._module}.py", 'a')
+                    self._emitter.set_module(nt_info._module)
                     self._import_modules(nt_info)
             
-        # Export objects
-        for nt_info in self._export_order:
-            if self._mode == 'ADDON':
-                self._file.close()
-                self._file = open(f"{self._addon_dir}/{nt_info._module}.py", 'a')
-                self._outer_indent_level = 0
-                self._inner_indent_level = 1
+        if self._elide_defaults:
+            self._reference_defaults = ReferenceDefaults()
 
+        # Create names shared between node trees in export order, so node 
+        # trees can be generated independently of each other afterwards
+        exporters = []
+        for nt_info in self._export_order:
             if nt_info._group_type.is_compositor():
                 exporter = CompositorExporter(self, nt_info)
             elif nt_info._group_type.is_geometry():
@@ -185,19 +498,41 @@ class NTP_OT_Export(bpy.types.Operator):
                     {'ERROR'}, 
                     "Couldn't match group type (should be unreachable)"
                 )
-                return
-            exporter.export()
+                return {'CANCELLED'}
+            exporter._create_func_name()
+            exporters.append(exporter)
+
+        # Export objects
+        try:
+            # Node trees are generated into their own buffers while 
+            # profiling, to count the lines generated for each
+            if self._export_cache is not None or self._profiler is not None:
+                with self._profile("generate"):
+                    yield from self._export_captured(exporters)
+            else:
+                for nt_info, exporter in zip(self._export_order, exporters):
+                    if self._mode == 'ADDON':
+                        self._emitter.set_module(nt_info._module)
+                        self._outer_indent_level = 0
+                        self._inner_indent_level = 1
+                    yield from self._with_progress(exporter.export_steps())
+                    yield self._advance()
+        finally:
+            if self._reference_defaults is not None:
+                self._reference_defaults.clear()
+                self._reference_defaults = None
 
         if self._mode == 'ADDON':
-            self._file.close()
-            self._file = open(f"{self._addon_dir}/__init__.py", 'w')
-            self._create_operator_module_imports()
-            self._create_imports()
-            self._create_menu_func()
-            self._create_registration_funcs()
-            self._create_main_func()
-            self._create_license()
-            self._create_manifest()
+            with self._profile("addon_files"):
+                self._emitter.set_module("__init__")
+                self._create_operator_module_imports()
+                self._create_imports()
+                self._create_menu_func()
+                self._create_registration_funcs()
+                self._create_main_func()
+                self._create_license()
+                self._create_manifest()
+                self._create_payload()
         else:
             # node tree names
             self._write("if __name__ == \"__main__\":", 0)
@@ -207,12 +542,16 @@ class NTP_OT_Export(bpy.types.Operator):
             self._write("", 0)
             for nt_info in self._export_order:
                 self._call_node_tree_creation(nt_info._base_tree, 1)
-            context.window_manager.clipboard = self._file.getvalue()
+            self._script = self._emitter.getvalue()
+
+        if self._export_cache is not None:
+            self._export_cache.save()
 
-        self._file.close()
-        
         if self._mode == 'ADDON':
-            self._zip_addon()
+            with self._profile("write_files"):
+                self._emitter.flush(self._addon_dir)
+            with self._profile("zip"):
+                self._zip_addon()
 
         self._report_finished()
 
@@ -221,14 +560,253 @@ class NTP_OT_Export(bpy.types.Operator):
     def _write(self, string: str, indent_level: int = -1):
         if indent_level == -1:
             indent_level = self._inner_indent_level
-        indent_str = indent_level * self._indentation
-        self._file.write(f"{indent_str}{string}\n")
+        self._emitter.write(string, indent_level)
+
+    def _elide(self, string: str, indent_level: int = -1):
+        """
+        Skips a line that only sets a default value, keeping track of the 
+        bytes saved
+
+        Parameters:
+        string (str): line that would've been written
+        indent_level (int): indentation level of the line
+        """
+        if indent_level == -1:
+            indent_level = self._inner_indent_level
+        indent_str = self._emitter.indent_str(indent_level)
+        self._elided_bytes += len(f"{indent_str}{string}\n".encode())
+
+    def _profile(
+        self, 
+        phase: str, 
+        node_tree: str | None = None
+    ) -> contextlib.AbstractContextManager:
+        """
+        Times a phase of the export, if it's being profiled
+
+        Parameters:
+        phase (str): name of the phase
+        node_tree (str | None): name of the node tree the phase belongs to,
+            or None for export-wide phases
+
+        Returns:
+        (AbstractContextManager): context manager timing the phase
+        """
+        if self._profiler is None:
+            return contextlib.nullcontext()
+        return self._profiler.phase(phase, node_tree)
+
+    def _write_profile(self) -> None:
+        """
+        Writes the profile report next to the export's output, and reports
+        a summary of it. Without a save location (in script mode), or with
+        one relative to an unsaved blend file, only the summary is reported
+        """
+        for line in self._profiler.summarize():
+            self.report({'INFO'}, f"NodeToPython: {line}")
+
+        if self._output_path != "":
+            base_path = os.path.splitext(self._output_path)[0]
+        elif os.path.isabs(self._dir_path):
+            base_path = os.path.join(self._dir_path, clean_string(self._name))
+        else:
+            self.report({'INFO'}, "NodeToPython: Add a save location to "
+                                  "write the profile report")
+            return
+        profile_path = f"{base_path}{PROFILE_FILE_SUFFIX}"
+        try:
+            os.makedirs(os.path.dirname(profile_path) or ".", exist_ok=True)
+            self._profiler.write(profile_path)
+        except OSError as e:
+            self.report({'WARNING'}, 
+                        f"NodeToPython: Couldn't write profile report: {e}")
+            return
+        self._profile_path = profile_path
+        self.report({'INFO'}, 
+                    f"NodeToPython: Profile report written to {profile_path}")
+
+    def _report(self, type: set[str], message: str) -> None:
+        """
+        Reports a message, or collects it if a node tree is being generated 
+        in its own buffer (i.e. to be cached)
+
+        Parameters:
+        type (set[str]): report type, i.e. {'WARNING'}
+        message (str): message to report
+        """
+        if self._reports is not None:
+            self._reports.append((type, message))
+        else:
+            self.report(type, message)
+
+    def _export_captured(
+        self, 
+        exporters: list
+    ) -> Generator[float, None, None]:
+        """
+        Generates each node tree into its own buffer, reusing cached code 
+        and generating the rest, then writes the code out in export order
+
+        Parameters:
+        exporters (list[NodeTreeExporter]): exporters of the node trees, in
+            export order
+
+        Yields:
+        (float): progress of the export, between the steps of generating
+            each node tree
+        """
+        results = [None] * len(exporters)
+        keys: list[str | None] = [None] * len(exporters)
+        if self._export_cache is not None:
+            for i, nt_info in enumerate(self._export_order):
+                # Saving images to the add-on directory can't be replayed
+                if uses_images(nt_info._snapshot):
+                    continue
+                keys[i] = self._get_cache_key(nt_info, exporters[i])
+                results[i] = self._export_cache.get(keys[i], self._names)
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        self._num_steps_done += len(exporters) - len(pending)
+        generated = []
+        for i in pending:
+            with self._profile("generate", self._export_order[i]._obj.name):
+                generated.append((yield from self._with_progress(
+                    self._export_captured_tree(exporters[i])
+                )))
+            yield self._advance()
+
+        for i, result in zip(pending, generated):
+            results[i] = result
+            if keys[i] is not None:
+                self._export_cache.put(keys[i], *result)
+
+        reported: set[tuple[frozenset[str], str]] = set()
+        for nt_info, result in zip(self._export_order, results):
+            code, reports, elided_bytes, _ = result
+            if self._mode == 'ADDON':
+                self._emitter.set_module(nt_info._module)
+            self._emitter.append(code)
+            self._elided_bytes += elided_bytes
+            if self._profiler is not None:
+                self._profiler.count(nt_info._obj.name, "lines", 
+                                     code.count("\n"))
+
+            # Cached node trees repeat the reports made when they were 
+            # generated, i.e. about node types validated once per export
+            for type, message in reports:
+                key = (frozenset(type), message)
+                if key not in reported:
+                    reported.add(key)
+                    self.report(type, message)
+
+    def _export_captured_tree(
+        self,
+        exporter
+    ) -> Generator[
+        None, 
+        None, 
+        tuple[str, list[tuple[set[str], str]], int, dict[str, int | None]]
+    ]:
+        """
+        Generates a node tree into its own buffer instead of the operator's,
+        step by step
+
+        Parameters:
+        exporter (NodeTreeExporter): exporter of the node tree
+
+        Yields:
+        None, between the exporter's steps
+
+        Returns:
+        (tuple[str, list[tuple[set[str], str]], int, dict[str, int | None]]): 
+            generated code, the reports made while generating it, the number
+            of bytes elided, and the export scope's usage counts of the 
+            names used in the node tree's scope
+        """
+        emitter = self._emitter
+        reports = self._reports
+        elided_bytes = self._elided_bytes
+
+        self._emitter = CodeEmitter(self._indentation)
+        self._reports = []
+        self._elided_bytes = 0
+        self._outer_indent_level = 0
+        self._inner_indent_level = 1
+        try:
+            yield from exporter.export_steps()
+            return (self._emitter.getvalue(), self._reports, 
+                    self._elided_bytes, exporter._names.parent_counts())
+        finally:
+            self._emitter = emitter
+            self._reports = reports
+            self._elided_bytes = elided_bytes
+
+    def _get_cache_key(self, nt_info: NodeTreeInfo, exporter) -> str:
+        """
+        Gets the export cache key of a node tree, covering everything the
+        code generated for it depends on
+
+        Parameters:
+        nt_info (NodeTreeInfo): info of the node tree
+        exporter (NodeTreeExporter): exporter of the node tree, with its 
+            function name already created. Names created while generating 
+            are checked against the export's names by the cache instead, 
+            so node trees earlier in the export don't change the key
+
+        Returns:
+        (str): the cache key
+        """
+        obj = nt_info._obj
+        obj_fingerprint = b""
+        if obj is not nt_info._base_tree:
+            obj_fingerprint = fingerprint_obj(obj)
+
+        dependencies = []
+        for dependency in nt_info._dependencies:
+            dependency_info = self._node_trees[dependency]
+            dependencies.append((
+                dependency.name, dependency_info._func, dependency_info._module
+            ))
+        lib_dependencies = [
+            (str(path), [node_tree.name for node_tree in node_trees])
+            for path, node_trees in nt_info._lib_dependencies.items()
+        ]
+
+        options = (
+            self._mode,
+            self._name,
+            self._indentation,
+            self._include_group_socket_values,
+            self._should_set_dimensions,
+            self._max_node_variables,
+            self._link_external_node_groups,
+            self._set_unavailable_defaults,
+            self._elide_defaults,
+            self._reuse_node_groups,
+            self._compact_output
+        )
+        return cache_key(
+            tuple(bpy.app.version),
+            options,
+            nt_info._fingerprint,
+            obj_fingerprint,
+            obj.name,
+            nt_info._snapshot.name,
+            nt_info._group_type.name,
+            nt_info._is_base,
+            nt_info._func,
+            nt_info._module,
+            tuple(dependencies),
+            tuple(lib_dependencies),
+            tuple(exporter._names.items())
+        )
 
     def _setup_options(self, options: NTP_PG_Options) -> bool:
         # General
         self._mode = options.mode
         self._include_group_socket_values = options.set_group_defaults
         self._should_set_dimensions = options.set_node_sizes
+        self._max_node_variables = options.max_node_variables
 
         if options.indentation_type == 'SPACES_2':
             self._indentation = "  "
@@ -238,14 +816,30 @@ class NTP_OT_Export(bpy.types.Operator):
             self._indentation = "        "
         elif options.indentation_type == 'TABS':
             self._indentation = "\t"
+        self._emitter = CodeEmitter(self._indentation)
 
         self._link_external_node_groups = options.link_external_node_groups
 
         self._set_unavailable_defaults = options.set_unavailable_defaults
 
+        self._elide_defaults = options.elide_defaults
+
+
+        self._dedupe_node_groups = options.dedupe_node_groups
+
+        self._reuse_node_groups = options.reuse_node_groups
+
+        self._compact_output = options.compact_output
+
+        if options.profile_export != 'OFF':
+            self._profiler = ExportProfiler(options.profile_export)
+
         #Script
         if options.mode == 'SCRIPT':
             self._include_imports = options.include_imports
+            # Where the profile report is written
+            self._dir_path = bpy.path.abspath(options.dir_path)
+            self._name = options.name
         #Addon
         elif options.mode == 'ADDON':
             self._dir_path = bpy.path.abspath(options.dir_path)
@@ -258,11 +852,18 @@ class NTP_OT_Export(bpy.types.Operator):
             self._should_create_license = options.should_create_license
             self._category = options.category
             self._custom_category = options.custom_category
+            self._use_export_cache = options.use_export_cache
+            self._use_payload = options.use_payload
             if options.menu_id in dir(bpy.types):
                 self._menu_id = options.menu_id
             else:
                 self.report({'ERROR'}, f"{options.menu_id} is not a valid menu")
                 return False
+        #Blend file
+        elif options.mode == 'BLEND':
+            self._dir_path = bpy.path.abspath(options.dir_path)
+            self._name = options.name
+            self._link_blend_data = options.link_blend_data
         return True
 
     def _setup_addon_directories(
@@ -293,6 +894,101 @@ class NTP_OT_Export(bpy.types.Operator):
         
         return True
 
+    def _export_blend(self) -> set[str]:
+        """
+        Writes the exported data blocks and every node tree they depend on 
+        to a .blend file, along with a script appending or linking them by 
+        name. Appending from a blend file is much faster than running 
+        generated code for very large node trees
+
+        Returns:
+        (set[str]): operator result
+        """
+        if not self._dir_path or self._dir_path == "":
+            self.report({'ERROR'},
+                        ("NodeToPython: No save location found. Please select "
+                         "one in the NodeToPython Options panel"))
+            return {'CANCELLED'}
+        os.makedirs(self._dir_path, exist_ok=True)
+
+        # The export order already holds the dependency closure of the 
+        # exported data blocks, nested groups included
+        data_blocks: set[bpy.types.ID] = set()
+        data_names: dict[str, list[str]] = {}
+        for nt_info in self._export_order:
+            if not nt_info._is_base:
+                data_blocks.add(nt_info._base_tree)
+            else:
+                # Node trees of materials, scenes, etc. are written along
+                # with them
+                data_blocks.add(nt_info._obj)
+                collection = BLEND_DATA_COLLECTIONS[nt_info._group_type]
+                data_names.setdefault(collection, []).append(nt_info._obj.name)
+
+        file_name = clean_string(self._name)
+        blend_path = os.path.join(self._dir_path, f"{file_name}.blend")
+        with self._profile("blend_file"):
+            bpy.data.libraries.write(
+                blend_path, data_blocks, path_remap='ABSOLUTE', fake_user=True
+            )
+
+        self._emitter.set_module(file_name)
+        self._create_blend_loader(f"{file_name}.blend", data_names)
+        self._emitter.flush(self._dir_path)
+        self._output_path = blend_path
+
+        self._report_finished()
+        return {'FINISHED'}
+
+    def _create_blend_loader(
+        self, 
+        blend_name: str, 
+        data_names: dict[str, list[str]]
+    ) -> None:
+        """
+        Creates the script loading the data blocks from the blend file
+
+        Parameters:
+        blend_name (str): file name of the blend file, next to the script
+        data_names (dict[str, list[str]]): bpy.data collection -> names of
+            the exported data blocks in it
+        """
+        self._write("import os", 0)
+        self._write("", 0)
+        self._write("import bpy", 0)
+        self._write("", 0)
+        self._write("BLEND_PATH = os.path.join(", 0)
+        self._write("os.path.dirname(os.path.abspath(__file__)), "
+                    f"{str_to_py_str(blend_name)}", 1)
+        self._write(")", 0)
+        self._write("", 0)
+        self._write("# bpy.data collection -> names of the data blocks to load", 0)
+        self._write("DATA_BLOCKS = {", 0)
+        for collection, names in data_names.items():
+            self._write(f"{str_to_py_str(collection)}: [", 1)
+            for name in names:
+                self._write(f"{str_to_py_str(name)},", 2)
+            self._write("],", 1)
+        self._write("}", 0)
+        self._write("", 0)
+        self._write(f"def load(link: bool = {self._link_blend_data}) "
+                    "-> dict[str, list[bpy.types.ID]]:", 0)
+        self._write("\"\"\"", 1)
+        self._write("Appends or links the data blocks by name, along with the "
+                    "node groups they use", 1)
+        self._write("\"\"\"", 1)
+        self._write("with bpy.data.libraries.load(BLEND_PATH, link=link) "
+                    "as (data_src, data_dst):", 1)
+        self._write("for collection, names in DATA_BLOCKS.items():", 2)
+        self._write("available = set(getattr(data_src, collection))", 3)
+        self._write("setattr(data_dst, collection, "
+                    "[name for name in names if name in available])", 3)
+        self._write("return {collection: list(getattr(data_dst, collection))", 1)
+        self._write("for collection in DATA_BLOCKS}", 2)
+        self._write("", 0)
+        self._write("if __name__ == \"__main__\":", 0)
+        self._write("load()", 1)
+
     def _create_imports(self) -> None:
         self._write("import bpy", 0)
         self._write("import mathutils", 0)
@@ -300,13 +996,21 @@ class NTP_OT_Export(bpy.types.Operator):
         self._write("import typing", 0)
         self._write("\n", 0)
     
+    def _create_reuse_funcs(self) -> None:
+        """
+        Writes the functions node group functions use to find and stamp
+        node groups to reuse, if node groups are reused
+        """
+        if not self._reuse_node_groups:
+            return
+        for line in REUSE_SOURCE.splitlines():
+            code = line.lstrip(" ")
+            self._write(code, (len(line) - len(code)) // 4)
+
     def _calculate_export_order(
-        self, context: bpy.types.Context
+        self, gatherer: NodeGroupGatherer
     ) -> None:
         # TODO: this is really messy
-        gatherer = NodeGroupGatherer()
-        gatherer.gather_node_groups(context)
-
         self._num_objs = gatherer.get_number_node_groups()
 
         # Peform topological sort on node groups to determine export order
@@ -328,14 +1032,19 @@ class NTP_OT_Export(bpy.types.Operator):
         self._visited : set[bpy.types.NodeTree] = set()
         self._export_order : list[NodeTreeInfo] = []
 
-        for group_type, groups in gatherer.node_groups.items():
-            for obj in groups:
-                base_tree = get_base_node_tree(obj, group_type)
-                self._topological_sort(base_tree)
+        with self._profile("topological_sort"):
+            for group_type, groups in gatherer.node_groups.items():
+                for obj in groups:
+                    base_tree = get_base_node_tree(obj, group_type)
+                    self._topological_sort(base_tree)
 
-        # Probably a better way algorithmically of handling this,
-        # need to move on though. Should be fast enough for reasonably sized
-        # node tree dependency graphs
+        with self._profile("dependency_closure"):
+            bits, closures = self._close_dependencies()
+
+        # Bits of the node trees used by one, or more than one, base tree
+        used = 0
+        shared = 0
+        counted: set[bpy.types.NodeTree] = set()
         for group_type, groups in gatherer.node_groups.items():
             common_module = ""
             if group_type.is_compositor():
@@ -348,17 +1057,56 @@ class NTP_OT_Export(bpy.types.Operator):
             for obj in groups:
                 base_tree = get_base_node_tree(obj, group_type)
                 nt_info = self._node_trees[base_tree]
+                if base_tree not in counted:
+                    counted.add(base_tree)
+                    shared |= used & closures[base_tree]
+                    used |= closures[base_tree]
+
                 self._modules[nt_info._module] = []
                 for dependency in nt_info._dependencies.keys():
                     dependency_info = self._node_trees[dependency]
-                    base_dependents = dependency_info._base_dependents
-                    base_dependents.add(base_tree)
-                    if len(base_dependents) > 1:
+                    if bits[dependency] & shared:
                         dependency_info._module = common_module
-                        if common_module not in self._used_vars:
-                            self._used_vars[common_module] = 0
+                        if self._names.count(common_module) is None:
+                            self._names.reserve(common_module)
                     self._modules[dependency_info._module] = []
 
+    def _close_dependencies(
+        self
+    ) -> tuple[dict[bpy.types.NodeTree, int], dict[bpy.types.NodeTree, int]]:
+        """
+        Replaces the dependencies of base trees with all of their transitive
+        dependencies, in export order
+
+        Node trees are numbered by their position in the export order, and 
+        sets of them are stored as the bits of an int. The export order puts
+        dependencies first, so all closures are found in one sweep over it
+
+        Returns:
+        (dict[NodeTree, int]): node tree -> its bit
+        (dict[NodeTree, int]): node tree -> bits of its transitive 
+            dependencies
+        """
+        bits: dict[bpy.types.NodeTree, int] = {}
+        closures: dict[bpy.types.NodeTree, int] = {}
+        for i, nt_info in enumerate(self._export_order):
+            closure = 0
+            for dependency in nt_info._dependencies:
+                closure |= bits[dependency] | closures[dependency]
+            bits[nt_info._base_tree] = 1 << i
+            closures[nt_info._base_tree] = closure
+
+        for nt_info in self._export_order:
+            if not nt_info._is_base:
+                continue
+            closure = closures[nt_info._base_tree]
+            nt_info._dependencies = {
+                self._export_order[i]._base_tree: None
+                for i, bit in enumerate(reversed(f"{closure:b}")) 
+                if bit == "1"
+            }
+        return bits, closures
+
     def _topological_sort(
         self, 
         node_tree: bpy.types.NodeTree
@@ -384,11 +1132,41 @@ class NTP_OT_Export(bpy.types.Operator):
 
         node_info = self._node_trees[node_tree]
 
-        def dfs(nt: bpy.types.NodeTree) -> None:
+        def group_trees(nt: bpy.types.NodeTree) -> list[bpy.types.NodeTree]:
+            """
+            Helper function to collect the node trees of a NodeTree's group 
+            nodes in one pass, skipping invalid ones
+
+            Parameters:
+            nt (NodeTree): current node tree in the dependency graph
+
+            Returns:
+            (list[NodeTree]): node trees of its group nodes, in order
+            """
+            node_trees = []
+            for node in nt.nodes:
+                if node.bl_idname != group_node_type:
+                    continue
+                if node.node_tree is None:
+                    self.report(
+                        {'ERROR'}, 
+                        "NodeToPython: Found an invalid node tree. "
+                        "Are all data blocks valid?"
+                    )
+                    continue
+                node_trees.append(node.node_tree)
+            return node_trees
+
+        def enter(nt: bpy.types.NodeTree) -> bool:
             """
-            Helper function to perform depth-first search on a NodeTree
+            Helper function to start visiting a NodeTree in the depth-first 
+            search
+
             Parameters:
             nt (NodeTree): current node tree in the dependency graph
+
+            Returns:
+            (bool): whether its group nodes need to be visited
             """
             if nt is None:
                 self.report(
@@ -396,54 +1174,132 @@ class NTP_OT_Export(bpy.types.Operator):
                     "NodeToPython: Found an invalid node tree. "
                     "Are all data blocks valid?"
                 )
-                return
+                return False
             
             if (self._link_external_node_groups 
                 and nt.library is not None):
-                bpy_lib_path = bpy.path.abspath(nt.library.filepath)
-                lib_path = pathlib.Path(os.path.realpath(bpy_lib_path))
-                bpy_datafiles_path = bpy.path.abspath(
-                    bpy.utils.system_resource('DATAFILES')
-                )
-                datafiles_path = pathlib.Path(os.path.realpath(bpy_datafiles_path))
-                is_lib_essential = lib_path.is_relative_to(datafiles_path)
-                if is_lib_essential:
-                    relative_path = lib_path.relative_to(datafiles_path)
+                relative_path = self._essential_library_path(nt.library)
+                if relative_path is not None:
                     if relative_path not in node_info._lib_dependencies:
                         node_info._lib_dependencies[relative_path] = []
                     node_info._lib_dependencies[relative_path].append(nt)
-                    return
-                else:
-                    print(f"Library {lib_path} didn't seem essential, copying node groups")
-
-            if nt not in self._visited:
-                self._visited.add(nt)
-                if nt not in self._node_trees:
-                    self._node_trees[nt] = NodeTreeInfo()
-                    self._node_trees[nt]._obj = nt
-                    self._node_trees[nt]._module = clean_string(node_info._module)
-                    self._node_trees[nt]._base_tree = nt
-                    self._node_trees[nt]._group_type = group_type
-                group_nodes = [node for node in nt.nodes
-                               if node.bl_idname == group_node_type]
-                for group_node in group_nodes:
-                    node_nt = getattr(group_node, "node_tree")
-                    if node_nt is None:
-                        self.report(
-                            {'ERROR'}, 
-                            "NodeToPython: Found an invalid node tree. "
-                            "Are all data blocks valid?"
-                        )
-                        continue
-                    if node_nt not in self._visited:
-                        dfs(node_nt)
-                    if (node_nt.library is None or 
-                        (not self._link_external_node_groups)
-                    ):
-                        self._node_trees[nt]._dependencies[node_nt] = None
-                self._export_order.append(self._node_trees[nt])
-                node_info._dependencies |= self._node_trees[nt]._dependencies
-        dfs(node_tree)
+                    return False
+
+            if nt in self._visited:
+                return False
+            self._visited.add(nt)
+            if nt not in self._node_trees:
+                self._node_trees[nt] = NodeTreeInfo()
+                self._node_trees[nt]._obj = nt
+                self._node_trees[nt]._module = clean_string(node_info._module)
+                self._node_trees[nt]._base_tree = nt
+                self._node_trees[nt]._group_type = group_type
+            return True
+
+        # Iterative, so long chains of nested groups don't hit the recursion
+        # limit. (node tree, iterator over its group nodes' trees) of the
+        # node trees being visited, innermost last
+        if not enter(node_tree):
+            return
+        stack = [(node_tree, iter(group_trees(node_tree)))]
+        while len(stack) > 0:
+            nt, children = stack[-1]
+            node_nt = next(children, None)
+            if node_nt is not None:
+                if node_nt not in self._visited and enter(node_nt):
+                    stack.append((node_nt, iter(group_trees(node_nt))))
+                    continue
+                if (node_nt.library is None or 
+                    (not self._link_external_node_groups)
+                ):
+                    self._node_trees[nt]._dependencies[node_nt] = None
+                continue
+
+            stack.pop()
+            self._export_order.append(self._node_trees[nt])
+            if len(stack) > 0 and (nt.library is None or 
+                                   (not self._link_external_node_groups)):
+                self._node_trees[stack[-1][0]]._dependencies[nt] = None
+
+    def _essential_library_path(
+        self, 
+        library: bpy.types.Library
+    ) -> pathlib.Path | None:
+        """
+        Checks whether a library is one of Blender's essential asset 
+        libraries, caching the result per library
+
+        Parameters:
+        library (Library): the library to check
+
+        Returns:
+        (pathlib.Path | None): path of the library relative to Blender's 
+            datafiles if it's essential, otherwise None
+        """
+        if library in self._essential_libraries:
+            return self._essential_libraries[library]
+
+        if self._datafiles_path is None:
+            bpy_datafiles_path = bpy.path.abspath(
+                bpy.utils.system_resource('DATAFILES')
+            )
+            self._datafiles_path = pathlib.Path(
+                os.path.realpath(bpy_datafiles_path)
+            )
+
+        bpy_lib_path = bpy.path.abspath(library.filepath)
+        lib_path = pathlib.Path(os.path.realpath(bpy_lib_path))
+        relative_path = None
+        if lib_path.is_relative_to(self._datafiles_path):
+            relative_path = lib_path.relative_to(self._datafiles_path)
+        else:
+            print(f"Library {lib_path} didn't seem essential, copying node groups")
+        self._essential_libraries[library] = relative_path
+        return relative_path
+
+    def _dedupe_node_trees(self) -> None:
+        """
+        Merges node groups with identical contents into the first of them 
+        in export order. Merged node groups aren't generated, and group 
+        nodes using them get the canonical node group through 
+        NODE_TREE_NAMES instead
+
+        Node trees selected for export keep their own generated function.
+        Only node groups are merged, since material, world, light and scene
+        node trees can't be used by group nodes
+        """
+        canonical_trees: dict[tuple[NodeGroupType, bytes], 
+                              bpy.types.NodeTree] = {}
+        duplicates: dict[bpy.types.NodeTree, bpy.types.NodeTree] = {}
+        export_order: list[NodeTreeInfo] = []
+        for nt_info in self._export_order:
+            if not nt_info._group_type.is_group():
+                export_order.append(nt_info)
+                continue
+            node_tree = nt_info._base_tree
+            canonical = canonical_trees.setdefault(
+                (nt_info._group_type, nt_info._fingerprint), node_tree
+            )
+            if canonical is not node_tree and not nt_info._is_base:
+                duplicates[node_tree] = canonical
+                continue
+            export_order.append(nt_info)
+
+        if len(duplicates) == 0:
+            return
+
+        # Dependencies come first in the export order, so a canonical node 
+        # group is always generated before anything using its duplicates
+        for nt_info in export_order:
+            nt_info._dependencies = {
+                duplicates.get(dependency, dependency): None
+                for dependency in nt_info._dependencies
+            }
+        for duplicate, canonical in duplicates.items():
+            self._node_trees[duplicate] = self._node_trees[canonical]
+
+        self._export_order = export_order
+        self._num_deduped = len(duplicates)
 
     def _import_modules(self, node_tree_info: NodeTreeInfo) -> None:
         modules = set()
@@ -463,6 +1319,8 @@ class NTP_OT_Export(bpy.types.Operator):
             if nt_info._module not in visited_modules:
                 visited_modules.add(nt_info._module)
                 module_order.append(nt_info._module)
+        if self._use_payload:
+            module_order.append(PAYLOAD_MODULE)
 
         self._write("if \"bpy\" in locals():", 0)
         self._write("import importlib", 1)
@@ -507,6 +1365,8 @@ class NTP_OT_Export(bpy.types.Operator):
         self._write(f"bpy.types.{self._menu_id}.remove(menu_func)", 1)
         self._write(f"for {CLASS} in {CLASSES}:", 1)
         self._write(f"bpy.utils.unregister_class({CLASS})", 2)
+        if self._use_payload:
+            self._write(f"{PAYLOAD_MODULE}.close()", 1)
         self._write("")
 
     def _create_main_func(self) -> None:
@@ -551,6 +1411,21 @@ class NTP_OT_Export(bpy.types.Operator):
             )
         manifest.close()
 
+    def _create_payload(self) -> None:
+        """
+        Writes the node group functions collected during the export to the 
+        payload file, along with the module loading them
+        """
+        if not self._use_payload:
+            return
+        write_payload(
+            os.path.join(self._addon_dir, PAYLOAD_FILE_NAME), self._payload
+        )
+        self._emitter.set_module(PAYLOAD_MODULE)
+        for line in LOADER_SOURCE.splitlines():
+            code = line.lstrip(" ")
+            self._write(code, (len(line) - len(code)) // 4)
+
     def _call_node_tree_creation(
         self, 
         node_tree: bpy.types.NodeTree,
@@ -579,22 +1454,15 @@ class NTP_OT_Export(bpy.types.Operator):
         Returns:
         clean_name (str): variable name for the node tree
         """
-        if name == "":
-            name = "unnamed"
-        clean_name = clean_string(name)
-        var = clean_name
-        if var in self._used_vars:
-            self._used_vars[var] += 1
-            return f"{clean_name}_{self._used_vars[var]}"
-        else:
-            self._used_vars[var] = 0
-            return clean_name
+        return self._names.create_var(name)
 
     def _zip_addon(self) -> None:
         """
         Zips up the addon and removes the directory
         """
-        shutil.make_archive(self._zip_dir, "zip", self._zip_dir)
+        self._output_path = shutil.make_archive(
+            self._zip_dir, "zip", self._zip_dir
+        )
         shutil.rmtree(self._zip_dir)
 
     def _report_finished(self):
@@ -614,7 +1482,126 @@ class NTP_OT_Export(bpy.types.Operator):
         else:
             location = self._dir_path
             save_obj = self._name
-        self.report({'INFO'}, f"NodeToPython: Saved {save_obj} to {location}")
+        message = f"NodeToPython: Saved {save_obj} to {location}"
+        if self._export_cache is not None:
+            message += (f" (export cache: {self._export_cache.hits} hits, "
+                        f"{self._export_cache.misses} misses)")
+        self.report({'INFO'}, message)
+        if self._num_deduped > 0:
+            self.report(
+                {'INFO'},
+                f"NodeToPython: Merged {self._num_deduped} duplicate "
+                f"node groups"
+            )
+        if self._elide_defaults:
+            self.report(
+                {'INFO'}, 
+                f"NodeToPython: Eliding default values saved "
+                f"{self._elided_bytes} bytes"
+            )
+
+class NTP_OT_Export(bpy.types.Operator):
+    bl_idname = "ntp.export"
+    bl_label = "Export"
+    bl_description = "Export node group(s) to Python"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Export running in the background, when invoked from the UI
+        self._session: ExportSession | None = None
+        self._steps: Generator[float, None, set[str]] | None = None
+        self._timer: bpy.types.Timer | None = None
+
+    def execute(self, context: bpy.types.Context):
+        gatherer = NodeGroupGatherer()
+        gatherer.gather_node_groups(context)
+
+        session = ExportSession(self.report)
+        result = session.export(gatherer, getattr(context.scene, "ntp_options"))
+        self._finish(context, session, result)
+        return result
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        """
+        Runs the export in the background, a few node trees per UI frame, 
+        so Blender keeps redrawing and showing progress. Press Esc to cancel
+        """
+        gatherer = NodeGroupGatherer()
+        gatherer.gather_node_groups(context)
+
+        self._session = ExportSession(self.report)
+        self._steps = self._session.export_steps(
+            gatherer, getattr(context.scene, "ntp_options")
+        )
+
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(
+            MODAL_TIMER_INTERVAL, window=context.window
+        )
+        window_manager.progress_begin(0, 100)
+        context.workspace.status_text_set(
+            "NodeToPython: Exporting... (Esc to cancel)"
+        )
+        window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context: bpy.types.Context, event: bpy.types.Event):
+        """
+        Takes steps of the export on each timer event. Other input is 
+        swallowed, so data the export reads can't be edited, deleted or 
+        undone while it runs
+        """
+        try:
+            if event.type == 'ESC' and event.value == 'PRESS':
+                self.cancel(context)
+                self.report({'WARNING'}, "NodeToPython: Export cancelled")
+                return {'CANCELLED'}
+            if event.type != 'TIMER':
+                return {'RUNNING_MODAL'}
+
+            # At least one step is taken per frame, even if it's over budget
+            deadline = time.perf_counter() + MODAL_STEP_BUDGET
+            try:
+                progress = next(self._steps)
+                while time.perf_counter() < deadline:
+                    progress = next(self._steps)
+            except StopIteration as stop:
+                self._end_modal(context)
+                self._finish(context, self._session, stop.value)
+                return stop.value
+            context.window_manager.progress_update(int(progress * 100))
+            return {'RUNNING_MODAL'}
+        except Exception:
+            self.cancel(context)
+            raise
+
+    def cancel(self, context: bpy.types.Context) -> None:
+        """
+        Stops the background export, removing its partial output
+        """
+        if self._steps is not None:
+            self._session.cancel(self._steps)
+        self._end_modal(context)
+
+    def _end_modal(self, context: bpy.types.Context) -> None:
+        window_manager = context.window_manager
+        if self._timer is not None:
+            window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        window_manager.progress_end()
+        context.workspace.status_text_set(None)
+        self._steps = None
+
+    def _finish(
+        self, 
+        context: bpy.types.Context, 
+        session: ExportSession, 
+        result: set[str]
+    ) -> None:
+        if result == {'FINISHED'} and session._mode == 'SCRIPT':
+            context.window_manager.clipboard = session._script
 
 classes = [
     NTP_OT_Export
@@ -21,7 +21,9 @@ class NTP_PG_Options(bpy.types.PropertyGroup):
         name = "Mode",
         items = [
             ('SCRIPT', "Script", "Copy just the node group to the Blender clipboard"),
-            ('ADDON', "Addon", "Create a full add-on")
+            ('ADDON', "Addon", "Create a full add-on"),
+            ('BLEND', "Blend File", "Write the node groups to a .blend file, "
+                                    "along with a script loading them")
         ]
     )
     set_group_defaults : bpy.props.BoolProperty(
@@ -34,6 +36,13 @@ class NTP_PG_Options(bpy.types.PropertyGroup):
         description = "Set dimensions of generated nodes",
         default = True
     )
+    max_node_variables : bpy.props.IntProperty(
+        name = "Max Node Variables",
+        description = "Node trees with more nodes than this store generated "
+                      "nodes in a list instead of a variable per node",
+        default = 1000,
+        min = 0
+    )
 
     indentation_type: bpy.props.EnumProperty(
         name="Indentation Type",
@@ -58,6 +67,53 @@ class NTP_PG_Options(bpy.types.PropertyGroup):
         description = "Set default values for unavailable sockets",
         default = False
     )
+    elide_defaults : bpy.props.BoolProperty(
+        name = "Elide Default Values",
+        description = "Only generate settings and socket values that differ "
+                      "from a newly created node or data block in this "
+                      "Blender version",
+        default = False
+    )
+    dedupe_node_groups : bpy.props.BoolProperty(
+        name = "Merge Duplicate Node Groups",
+        description = "Generate node groups with identical contents (i.e. "
+                      "copies left behind by appending) only once, and have "
+                      "group nodes use that node group for all of them",
+        default = False
+    )
+    reuse_node_groups : bpy.props.BoolProperty(
+        name = "Reuse Existing Node Groups",
+        description = "Stamp a fingerprint of their contents on generated "
+                      "node groups, and reuse a node group with the same "
+                      "fingerprint instead of generating it again, unless "
+                      "it was edited since it was generated",
+        default = False
+    )
+    compact_output : bpy.props.BoolProperty(
+        name = "Compact Output",
+        description = "Generate nodes, settings, input defaults, locations "
+                      "and links from tables of values looped over by the "
+                      "generated code, instead of a line per value",
+        default = False
+    )
+    profile_export : bpy.props.EnumProperty(
+        name = "Profile Export",
+        description = "Time each phase of the export per node tree, and "
+                      "write a JSON report next to the add-on or blend "
+                      "file (the save location in script mode, if set). "
+                      "Node trees are generated one at a time while "
+                      "profiling",
+        items = [
+            ('OFF', "Off", "Don't profile the export"),
+            ('TIMING', "Timing", "Time phases and count nodes, links and "
+                                 "lines generated"),
+            ('CPROFILE', "cProfile", "Also profile function calls with "
+                                     "cProfile"),
+            ('TRACEMALLOC', "tracemalloc", "Also trace memory allocations "
+                                           "with tracemalloc")
+        ],
+        default = 'OFF'
+    )
 
     #Script properties
     include_imports : bpy.props.BoolProperty(
@@ -166,6 +222,30 @@ class NTP_PG_Options(bpy.types.PropertyGroup):
         description="Set the custom category property for your add-on",
         default = ""
     )
+    use_export_cache: bpy.props.BoolProperty(
+        name = "Cache Generated Code",
+        description = "Keep the code generated for each node tree next to "
+                      "the save location, and reuse it for node trees that "
+                      "haven't changed since the last export",
+        default = False
+    )
+    use_payload: bpy.props.BoolProperty(
+        name = "Node Tree Payload",
+        description = "Store generated node group functions compressed in "
+                      "a single payload file, which the add-on memory maps "
+                      "and only loads node groups from when they're first "
+                      "needed. Node trees are generated one at a time and "
+                      "aren't cached",
+        default = False
+    )
+
+    # Blend file properties
+    link_blend_data: bpy.props.BoolProperty(
+        name = "Link Data Blocks",
+        description = "Have the generated script link the node groups from "
+                      "the .blend file by default, instead of appending them",
+        default = False
+    )
 
 
 classes = [
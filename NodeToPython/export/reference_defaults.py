@@ -0,0 +1,144 @@
+import bpy
+
+from .node_settings import NTPNodeSetting
+from .node_settings_emitter import get_settings_formatter
+from .node_tree_snapshot import NodeSnapshot
+from .utils import *
+
+# Name of the scratch data blocks we compare against
+REFERENCE_NAME = ".ntp_reference"
+
+class ReferenceDefaults():
+    """
+    Newly created nodes and data blocks to compare exported values against,
+    so values Blender already defaults to don't have to be generated
+    """
+    def __init__(self):
+        # Node tree type -> scratch node tree holding the reference nodes
+        self._node_trees: dict[str, bpy.types.NodeTree] = {}
+
+        # (node tree type, node type) -> reference node, None if it
+        # couldn't be created
+        self._nodes: dict[tuple[str, str], bpy.types.Node | None] = {}
+
+        # (node tree type, node type) -> setting name -> formatted value
+        self._settings: dict[tuple[str, str], dict[str, str]] = {}
+
+        # (node tree type, node type) -> input identifier -> formatted value
+        self._input_defaults: dict[tuple[str, str], dict[str, str]] = {}
+
+        # (bpy.data collection, creation arguments) -> reference object
+        self._objs: dict[tuple, bpy.types.ID] = {}
+
+    def get_node(self, node: NodeSnapshot) -> bpy.types.Node | None:
+        """
+        Gets a newly created node of the same type
+
+        Parameters:
+        node (NodeSnapshot): node to get a reference for
+
+        Returns:
+        (Node | None): the reference node, or None if it couldn't be created
+        """
+        key = (node.id_data.bl_idname, node.bl_idname)
+        if key in self._nodes:
+            return self._nodes[key]
+
+        tree_type = node.id_data.bl_idname
+        if tree_type not in self._node_trees:
+            self._node_trees[tree_type] = bpy.data.node_groups.new(
+                REFERENCE_NAME, tree_type
+            )
+        try:
+            reference = self._node_trees[tree_type].nodes.new(node.bl_idname)
+        except RuntimeError:
+            reference = None
+
+        self._nodes[key] = reference
+        return reference
+
+    def get_settings(
+        self,
+        node: NodeSnapshot,
+        attributes: tuple[NTPNodeSetting, ...]
+    ) -> dict[str, str] | None:
+        """
+        Gets the formatted settings of a newly created node of the same type
+
+        Parameters:
+        node (NodeSnapshot): node to get reference settings for
+        attributes (tuple[NTPNodeSetting, ...]): settings we're copying
+
+        Returns:
+        (dict[str, str] | None): setting name -> formatted value, or None
+            if there's no reference node
+        """
+        key = (node.id_data.bl_idname, node.bl_idname)
+        if key not in self._settings:
+            reference = self.get_node(node)
+            if reference is None:
+                return None
+            self._settings[key] = get_settings_formatter(attributes)(reference)
+        return self._settings[key]
+
+    def get_input_defaults(
+        self,
+        node: NodeSnapshot
+    ) -> dict[str, str] | None:
+        """
+        Gets the formatted input socket defaults of a newly created node of
+        the same type
+
+        Parameters:
+        node (NodeSnapshot): node to get reference input defaults for
+
+        Returns:
+        (dict[str, str] | None): socket identifier -> formatted value, or
+            None if there's no reference node
+        """
+        key = (node.id_data.bl_idname, node.bl_idname)
+        if key not in self._input_defaults:
+            reference = self.get_node(node)
+            if reference is None:
+                return None
+
+            input_defaults = {}
+            for input in reference.inputs:
+                if getattr(input, "default_value", None) is None:
+                    continue
+                default_val = socket_default_to_py_str(input)
+                if default_val is not None:
+                    input_defaults[input.identifier] = default_val
+            self._input_defaults[key] = input_defaults
+        return self._input_defaults[key]
+
+    def get_obj(self, data: str, *args) -> bpy.types.ID:
+        """
+        Gets a newly created object, i.e. a material, light, or scene
+
+        Parameters:
+        data (str): name of the bpy.data collection of the object
+        args: extra arguments for creating the object
+
+        Returns:
+        (ID): the reference object
+        """
+        key = (data, *args)
+        if key not in self._objs:
+            self._objs[key] = getattr(bpy.data, data).new(REFERENCE_NAME, *args)
+        return self._objs[key]
+
+    def clear(self) -> None:
+        """
+        Removes all the scratch data blocks
+        """
+        for node_tree in self._node_trees.values():
+            bpy.data.node_groups.remove(node_tree)
+        for (data, *_), obj in self._objs.items():
+            getattr(bpy.data, data).remove(obj)
+
+        self._node_trees.clear()
+        self._nodes.clear()
+        self._settings.clear()
+        self._input_defaults.clear()
+        self._objs.clear()
@@ -2,7 +2,8 @@ import bpy
 
 from ..node_group_gatherer import NodeGroupType
 from ..node_tree_exporter import NodeTreeExporter, NODE_TREE_NAMES
-from ..ntp_operator import NTP_OT_Export, NodeTreeInfo
+from ..node_tree_snapshot import NodeTreeSnapshot
+from ..ntp_operator import ExportSession, NodeTreeInfo
 from ..utils import *
 
 from .node_tree import NTP_ShaderNodeTree, NTP_NodeTree
@@ -17,11 +18,11 @@ SHADER_OP_RESERVED_NAMES = {
 class ShaderExporter(NodeTreeExporter):
     def __init__(
         self, 
-        ntp_operator: NTP_OT_Export,
+        ntp_operator: ExportSession,
         node_tree_info: NodeTreeInfo
     ):
         if not node_tree_info._group_type.is_shader():
-            ntp_operator.report(
+            ntp_operator._report(
                 {'ERROR'},
                 f"Cannot initialize ShaderExporter with group type "
                 f"{node_tree_info._group_type}"
@@ -29,11 +30,11 @@ class ShaderExporter(NodeTreeExporter):
         NodeTreeExporter.__init__(self, ntp_operator, node_tree_info)
 
         for name in SHADER_OP_RESERVED_NAMES:
-            self._used_vars[name] = 0
+            self._names.reserve(name)
 
     def _initialize_ntp_node_tree(
         self, 
-        node_tree: bpy.types.NodeTree,
+        node_tree: NodeTreeSnapshot,
         nt_var: str
     ) -> NTP_NodeTree:
         return NTP_ShaderNodeTree(node_tree, nt_var)
@@ -53,9 +54,6 @@ class ShaderExporter(NodeTreeExporter):
     # NodeTreeExporter interface
     def _initialize_node_tree(self, ntp_node_tree: NTP_NodeTree) -> None:
         nt_name = ntp_node_tree._node_tree.name
-        self._node_tree_info._func = self._operator._create_var(
-            f"{ntp_node_tree._var}_node_group"
-        )
         #initialize node group
         self._write(f"def {self._node_tree_info._func}("
                     f"{NODE_TREE_NAMES}: dict[typing.Callable, str]):", 
@@ -69,6 +67,7 @@ class ShaderExporter(NodeTreeExporter):
             self._write(f"{ntp_node_tree._var}.nodes.remove({NODE})", 
                         self._operator._inner_indent_level + 1)
         else:
+            self._reuse_existing_node_group()
             self._write((f"{ntp_node_tree._var} = bpy.data.node_groups.new("
                          f"type = \'ShaderNodeTree\', "
                          f"name = {str_to_py_str(nt_name)})"))
@@ -127,26 +126,19 @@ class ShaderExporter(NodeTreeExporter):
             "diffuse_color",
             "line_color"
         ]
-        for attr in regular_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {getattr(mat, attr)}",
-                indent_level
-            )
-        for attr in enum_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {enum_to_py_str(getattr(mat, attr))}",
-                indent_level
-            )
-        for attr in vec3_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {vec3_to_py_str(getattr(mat, attr))}",
-                indent_level
-            )
-        for attr in vec4_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {vec4_to_py_str(getattr(mat, attr))}",
-                indent_level
-            )
+        reference = self._get_reference_obj("materials")
+        self._set_obj_settings(
+            mat, reference, regular_attrs, str, indent_level
+        )
+        self._set_obj_settings(
+            mat, reference, enum_attrs, enum_to_py_str, indent_level
+        )
+        self._set_obj_settings(
+            mat, reference, vec3_attrs, vec3_to_py_str, indent_level
+        )
+        self._set_obj_settings(
+            mat, reference, vec4_attrs, vec4_to_py_str, indent_level
+        )
         self._write("", 0)
 
     def _create_light(self):
@@ -264,21 +256,16 @@ class ShaderExporter(NodeTreeExporter):
         elif light.type == 'SUN':
             regular_attrs += sun_regular_attrs
 
-        for attr in regular_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {getattr(light, attr)}",
-                indent_level
-            )
-        for attr in enum_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {enum_to_py_str(getattr(light, attr))}",
-                indent_level
-            )
-        for attr in vec3_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {vec3_to_py_str(getattr(light, attr))}",
-                indent_level
-            )
+        reference = self._get_reference_obj("lights", light_type)
+        self._set_obj_settings(
+            light, reference, regular_attrs, str, indent_level
+        )
+        self._set_obj_settings(
+            light, reference, enum_attrs, enum_to_py_str, indent_level
+        )
+        self._set_obj_settings(
+            light, reference, vec3_attrs, vec3_to_py_str, indent_level
+        )
         
         self._write("", 0)
 
@@ -345,21 +332,16 @@ class ShaderExporter(NodeTreeExporter):
             "color"
         ]
 
-        for attr in regular_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {getattr(linestyle, attr)}",
-                indent_level
-            )
-        for attr in enum_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {enum_to_py_str(getattr(linestyle, attr))}",
-                indent_level
-            )
-        for attr in vec3_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {vec3_to_py_str(getattr(linestyle, attr))}",
-                indent_level
-            )
+        reference = self._get_reference_obj("linestyles")
+        self._set_obj_settings(
+            linestyle, reference, regular_attrs, str, indent_level
+        )
+        self._set_obj_settings(
+            linestyle, reference, enum_attrs, enum_to_py_str, indent_level
+        )
+        self._set_obj_settings(
+            linestyle, reference, vec3_attrs, vec3_to_py_str, indent_level
+        )
         self._write("", 0)
 
     def _create_world(self):
@@ -394,24 +376,17 @@ class ShaderExporter(NodeTreeExporter):
             "lightgroup"
         ]
 
-        for attr in regular_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {getattr(world, attr)}",
-                indent_level
-            )
-        for attr in enum_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {enum_to_py_str(getattr(world, attr))}",
-                indent_level
-            )
-        for attr in vec3_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {vec3_to_py_str(getattr(world, attr))}",
-                indent_level
-            )
-        for attr in str_attrs:
-            self._write(
-                f"{self._obj_var}.{attr} = {str_to_py_str(getattr(world, attr))}",
-                indent_level
-            )
+        reference = self._get_reference_obj("worlds")
+        self._set_obj_settings(
+            world, reference, regular_attrs, str, indent_level
+        )
+        self._set_obj_settings(
+            world, reference, enum_attrs, enum_to_py_str, indent_level
+        )
+        self._set_obj_settings(
+            world, reference, vec3_attrs, vec3_to_py_str, indent_level
+        )
+        self._set_obj_settings(
+            world, reference, str_attrs, str_to_py_str, indent_level
+        )
         self._write("", 0)
\ No newline at end of file
@@ -1,9 +1,10 @@
 import bpy
 
+from ..node_tree_snapshot import NodeTreeSnapshot
 from ..ntp_node_tree import NTP_NodeTree
 
 class NTP_ShaderNodeTree(NTP_NodeTree):
-    def __init__(self, node_tree: bpy.types.ShaderNodeTree, var: str):
+    def __init__(self, node_tree: NodeTreeSnapshot, var: str):
         super().__init__(node_tree, var)
         if bpy.app.version >= (5, 0, 0):
             self._zone_inputs["GeometryNodeRepeatInput"] = []
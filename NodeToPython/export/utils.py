@@ -4,10 +4,13 @@ import mathutils
 
 from bpy.types import bpy_prop_array
 
+import functools
 import keyword
 import re
 
 
+# Names repeat a lot, i.e. between node trees and in their sockets
+@functools.lru_cache(maxsize=65536)
 def clean_string(string: str, lower: bool = True) -> str:
     """
     Cleans up a string for use as a variable or file name
@@ -153,4 +156,48 @@ def img_to_py_str(img : bpy.types.Image) -> str:
     """
     name = img.name.split('.', 1)[0]
     format = img.file_format.lower()
-    return f"{name}.{format}"
\ No newline at end of file
+    return f"{name}.{format}"
+
+def socket_default_to_py_str(socket: bpy.types.NodeSocket) -> str | None:
+    """
+    Converts the default value of a socket holding a plain value (i.e. not
+    a data block) into a string
+
+    Parameters:
+    socket (NodeSocket): socket to convert the default value of
+
+    Returns:
+    (str | None): string version, or None if there's nothing to set
+    """
+    default_val = getattr(socket, "default_value")
+    # colors
+    if socket.bl_idname == 'NodeSocketColor':
+        return vec4_to_py_str(default_val)
+
+    # vector types
+    elif "Vector" in socket.bl_idname:
+        if "2D" in socket.bl_idname:
+            return vec2_to_py_str(default_val)
+        elif "4D" in socket.bl_idname:
+            return vec4_to_py_str(default_val)
+        else:
+            return vec3_to_py_str(default_val)
+
+    # rotation types
+    elif socket.bl_idname == 'NodeSocketRotation':
+        return vec3_to_py_str(default_val)
+
+    # strings
+    elif socket.bl_idname in {
+        'NodeSocketString', 
+        'NodeSocketStringFilePath'
+    }:
+        return str_to_py_str(default_val)
+
+    #menu
+    elif socket.bl_idname == 'NodeSocketMenu':
+        if default_val == '':
+            return None
+        return enum_to_py_str(default_val)
+
+    return f"{default_val}"
@@ -4,6 +4,7 @@ if "bpy" in locals():
     importlib.reload(settings)
     importlib.reload(generation_settings)
     importlib.reload(addon_settings)
+    importlib.reload(blend_settings)
     importlib.reload(compositor)
     importlib.reload(geometry)
     importlib.reload(shader)
@@ -12,6 +13,7 @@ else:
     from . import settings
     from . import generation_settings
     from . import addon_settings
+    from . import blend_settings
     from . import compositor
     from . import geometry
     from . import shader
@@ -22,7 +24,8 @@ modules = [
     main,
     settings,
     generation_settings,
-    addon_settings
+    addon_settings,
+    blend_settings
 ]
 modules += compositor.modules
 modules += geometry.modules
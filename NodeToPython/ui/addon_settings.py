@@ -40,6 +40,8 @@ class NTP_PT_AddonSettings(bpy.types.Panel):
         ]
         if ntp_options.category == 'Custom':
             addon_options.append("custom_category")
+        addon_options.append("use_export_cache")
+        addon_options.append("use_payload")
         for option in addon_options:
             layout.prop(ntp_options, option)
 
@@ -0,0 +1,39 @@
+import bpy
+
+from . import settings
+from ..export.ntp_options import NTP_PG_Options
+
+class NTP_PT_BlendSettings(bpy.types.Panel):
+    bl_idname = "NTP_PT_blend_settings"
+    bl_label = "Blend File Settings"
+    bl_parent_id = settings.NTP_PT_Settings.bl_idname
+    bl_space_type = 'NODE_EDITOR'
+    bl_region_type = 'UI'
+    bl_context = ''
+    bl_category = "NodeToPython"
+    bl_description = ""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+    @classmethod
+    def poll(cls, context):
+        options: NTP_PG_Options = getattr(context.scene, "ntp_options")
+        return options.mode == 'BLEND'
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.operator_context = 'INVOKE_DEFAULT'
+        ntp_options : NTP_PG_Options = getattr(context.scene, "ntp_options")
+
+        blend_options = [
+            "dir_path",
+            "name",
+            "link_blend_data"
+        ]
+        for option in blend_options:
+            layout.prop(ntp_options, option)
+
+classes: list[type] = [
+    NTP_PT_BlendSettings
+]
@@ -1,6 +1,7 @@
 import bpy
 
 from . import panel
+from ...export.node_group_gatherer import invalidate_gathered
 
 def register_props():
     bpy.types.Scene.ntp_scene_slots = bpy.props.CollectionProperty(
@@ -25,6 +26,7 @@ class NTP_PG_SceneSlot(bpy.types.PropertyGroup):
         return scene.use_nodes
 
     def update_scene(self, context):
+        invalidate_gathered()
         if self.scene:
             self.name = self.scene.name
         else:
@@ -59,6 +61,7 @@ class NTP_OT_RemoveSceneSlot(bpy.types.Operator):
 
         if idx >= 0 and idx < len(slots):
             slots.remove(idx)
+            invalidate_gathered()
             context.scene.ntp_scene_slots_index = min(
                 max(0, idx - 1), len(slots) - 1
             )
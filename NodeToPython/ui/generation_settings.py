@@ -18,7 +18,9 @@ class NTP_PT_GenerationSettings(bpy.types.Panel):
         
     @classmethod
     def poll(cls, context):
-        return True
+        options: NTP_PG_Options = getattr(context.scene, "ntp_options")
+        # Blend files store the node trees themselves
+        return options.mode != 'BLEND'
     
     def draw(self, context):
         layout = self.layout
@@ -28,10 +30,15 @@ class NTP_PT_GenerationSettings(bpy.types.Panel):
         generation_options = [
             "set_group_defaults",
             "set_node_sizes", 
+            "max_node_variables",
             "indentation_type",
             "link_external_node_groups"
         ]
         generation_options.append("set_unavailable_defaults")
+        generation_options.append("elide_defaults")
+        generation_options.append("dedupe_node_groups")
+        generation_options.append("reuse_node_groups")
+        generation_options.append("compact_output")
 
         if ntp_options.mode == 'SCRIPT':
             script_options = [
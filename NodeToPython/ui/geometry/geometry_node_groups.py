@@ -1,6 +1,7 @@
 import bpy
 
 from . import panel
+from ...export.node_group_gatherer import invalidate_gathered
 
 def register_props():
     bpy.types.Scene.ntp_geometry_node_group_slots = bpy.props.CollectionProperty(
@@ -32,6 +33,7 @@ class NTP_PG_GeometryNodeGroupSlot(bpy.types.PropertyGroup):
         return node_tree.bl_idname == 'GeometryNodeTree'
     
     def update_node_tree(self, context):
+        invalidate_gathered()
         if self.node_tree:
             self.name = self.node_tree.name
         else:
@@ -66,6 +68,7 @@ class NTP_OT_RemoveGeometryNodeGroupSlot(bpy.types.Operator):
 
         if idx >= 0 and idx < len(slots):
             slots.remove(idx)
+            invalidate_gathered()
             context.scene.ntp_geometry_node_group_slots_index = min(
                 max(0, idx - 1), len(slots) - 1
             )
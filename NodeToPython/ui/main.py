@@ -1,11 +1,30 @@
 import bpy
 
-from ..export.node_group_gatherer import NodeGroupGatherer
+from ..export.node_group_gatherer import gather_cached, invalidate_gathered
 from ..export.ntp_operator import NTP_OT_Export
 from ..export.ntp_options import NTP_PG_Options
 
 import pathlib
 
+# Handlers after which data blocks gathered for the UI may be stale. Undo
+# and loading files replace the data blocks slots point to
+INVALIDATING_HANDLERS = ["load_post", "undo_post", "redo_post"]
+
+@bpy.app.handlers.persistent
+def _invalidate_gathered_handler(*args) -> None:
+    invalidate_gathered()
+
+def register_props():
+    for handler in INVALIDATING_HANDLERS:
+        getattr(bpy.app.handlers, handler).append(_invalidate_gathered_handler)
+
+def unregister_props():
+    for handler in INVALIDATING_HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler)
+        if _invalidate_gathered_handler in handlers:
+            handlers.remove(_invalidate_gathered_handler)
+    invalidate_gathered()
+
 class NTP_PT_Main(bpy.types.Panel):
     bl_idname = "NTP_PT_main"
     bl_label = "Node To Python"
@@ -35,12 +54,12 @@ class NTP_PT_Main(bpy.types.Panel):
         if ntp_options.mode == 'SCRIPT':
             location = "clipboard"
             export_icon = 'COPYDOWN'
-        else: # mode == 'ADDON'
+        else: # mode == 'ADDON' or mode == 'BLEND'
             location = f"{pathlib.PurePath(ntp_options.dir_path).name}/"
             export_icon = 'FILE_FOLDER'
 
-        gatherer = NodeGroupGatherer()
-        gatherer.gather_node_groups(context)
+        # Cached, since the sidebar redraws constantly
+        gatherer = gather_cached(context)
         num_node_groups = gatherer.get_number_node_groups()
 
         if num_node_groups == 1:
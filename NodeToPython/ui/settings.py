@@ -26,7 +26,8 @@ class NTP_PT_Settings(bpy.types.Panel):
         ntp_options : NTP_PG_Options = getattr(context.scene, "ntp_options")
 
         option_list = [
-            "mode"
+            "mode",
+            "profile_export"
         ]
         for option in option_list:
             layout.prop(ntp_options, option)
@@ -1,6 +1,7 @@
 import bpy
 
 from . import panel
+from ...export.node_group_gatherer import invalidate_gathered
 
 def register_props():
     bpy.types.Scene.ntp_light_slots = bpy.props.CollectionProperty(
@@ -25,6 +26,7 @@ class NTP_PG_LightSlot(bpy.types.PropertyGroup):
         return light.use_nodes
 
     def update_light(self, context):
+        invalidate_gathered()
         if self.light:
             self.name = self.light.name
         else:
@@ -59,6 +61,7 @@ class NTP_OT_RemoveLightSlot(bpy.types.Operator):
 
         if idx >= 0 and idx < len(slots):
             slots.remove(idx)
+            invalidate_gathered()
             context.scene.ntp_light_slots_index = min(
                 max(0, idx - 1), len(slots) - 1
             )
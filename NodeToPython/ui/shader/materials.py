@@ -1,6 +1,7 @@
 import bpy
 
 from . import panel
+from ...export.node_group_gatherer import invalidate_gathered
 
 def register_props():
     bpy.types.Scene.ntp_material_slots = bpy.props.CollectionProperty(
@@ -25,6 +26,7 @@ class NTP_PG_MaterialSlot(bpy.types.PropertyGroup):
         return material.use_nodes
 
     def update_material(self, context):
+        invalidate_gathered()
         if self.material:
             self.name = self.material.name
         else:
@@ -59,6 +61,7 @@ class NTP_OT_RemoveMaterialSlot(bpy.types.Operator):
 
         if idx >= 0 and idx < len(slots):
             slots.remove(idx)
+            invalidate_gathered()
             context.scene.ntp_material_slots_index = min(
                 max(0, idx - 1), len(slots) - 1
             )
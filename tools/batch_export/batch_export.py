@@ -0,0 +1,372 @@
+"""
+Exports every .blend file in an asset library with a pool of background
+Blender processes, mirroring the library's layout in the output directory.
+Each worker process exports files one after another, so Blender only starts
+once per worker (or again after a file crashed it).
+
+    python tools/batch_export/batch_export.py LIBRARY_DIR OUTPUT_DIR \
+        --blender /path/to/blender --jobs 8
+
+Use --standin to test the driver without Blender. A summary of per-file
+timings and failures is written to OUTPUT_DIR/batch_summary.json. Anything
+a worker prints to stderr while exporting a file is written to a log next
+to the file's output, which the summary references. Files taking longer
+than --timeout seconds are failed, and their worker is restarted.
+"""
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import TextIO
+
+from worker_protocol import parse_result
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SUMMARY_FILE_NAME = "batch_summary.json"
+
+# Default seconds a file may take to export before its worker is killed
+DEFAULT_TIMEOUT = 600.0
+
+def find_blend_files(library_dir: str) -> list[str]:
+    """
+    Finds the blend files in a library, skipping Blender's backups
+
+    Parameters:
+    library_dir (str): root directory of the library
+
+    Returns:
+    (list[str]): sorted paths of the blend files
+    """
+    blend_paths = []
+    for root, dirs, files in os.walk(library_dir):
+        for file_name in files:
+            if file_name.endswith(".blend"):
+                blend_paths.append(os.path.join(root, file_name))
+    return sorted(blend_paths)
+
+class WorkerProcess():
+    """
+    A worker process exporting the blend files it's sent, one at a time
+    """
+    def __init__(self, command: list[str], timeout: float | None):
+        # Command starting the worker
+        self._command: list[str] = command
+
+        # Seconds a file may take to export, None to wait indefinitely
+        self._timeout: float | None = timeout
+
+        # Running worker, None until the first file is sent
+        self._process: subprocess.Popen | None = None
+
+        # Lines the worker printed to stdout, then None once it exited
+        self._lines: queue.Queue[str | None] = queue.Queue()
+
+        # Threads reading the worker's stdout and stderr
+        self._readers: list[threading.Thread] = []
+
+        # Log of the file being exported, which the worker's stderr is 
+        # written to. Kept open until the next file, for late output
+        self._log: TextIO | None = None
+        self._log_path: str = ""
+        self._log_lock: threading.Lock = threading.Lock()
+
+    def _start(self) -> None:
+        self._process = subprocess.Popen(
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace"
+        )
+        self._lines = queue.Queue()
+        self._readers = [
+            threading.Thread(target=self._read_stdout, 
+                             args=(self._process, self._lines)),
+            threading.Thread(target=self._read_stderr, args=(self._process,))
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def _read_stdout(
+        self, 
+        process: subprocess.Popen, 
+        lines: queue.Queue[str | None]
+    ) -> None:
+        for line in process.stdout:
+            lines.put(line.rstrip("\n"))
+        lines.put(None)
+
+    def _read_stderr(self, process: subprocess.Popen) -> None:
+        for line in process.stderr:
+            with self._log_lock:
+                if self._log is not None:
+                    self._log.write(line)
+                    self._log.flush()
+
+    def _stop(self) -> int:
+        """
+        Waits for the worker to exit, after it finished or was killed
+
+        Returns:
+        (int): the worker's exit code
+        """
+        return_code = self._process.wait()
+        for reader in self._readers:
+            reader.join()
+        self._process = None
+        self._readers = []
+        return return_code
+
+    def _open_log(self, log_path: str) -> None:
+        """
+        Writes the worker's stderr to a new log, closing the previous one.
+        Logs left empty are removed
+
+        Parameters:
+        log_path (str): path of the new log, or "" for none
+        """
+        with self._log_lock:
+            if self._log is not None:
+                self._log.close()
+                if os.path.getsize(self._log_path) == 0:
+                    os.remove(self._log_path)
+            self._log = None
+            self._log_path = log_path
+            if log_path != "":
+                os.makedirs(os.path.dirname(log_path), exist_ok=True)
+                self._log = open(log_path, 'w', encoding="utf-8")
+
+    def export(self, blend_path: str, log_path: str) -> dict:
+        """
+        Has the worker export a blend file, starting the worker if needed
+
+        Parameters:
+        blend_path (str): path of the blend file
+        log_path (str): path of the log the worker's stderr is written to
+
+        Returns:
+        (dict): result of the export, with the path of its log
+        """
+        start = time.perf_counter()
+        self._open_log(log_path)
+        if self._process is None:
+            self._start()
+        try:
+            self._process.stdin.write(f"{blend_path}\n")
+            self._process.stdin.flush()
+        except BrokenPipeError:
+            pass
+
+        error = None
+        while True:
+            wait_seconds = None
+            if self._timeout is not None:
+                wait_seconds = max(start + self._timeout 
+                                   - time.perf_counter(), 0.0)
+            try:
+                line = self._lines.get(timeout=wait_seconds)
+            except queue.Empty:
+                self._process.kill()
+                self._stop()
+                error = f"Timed out after {self._timeout:g} s"
+                break
+            if line is None:
+                # The worker exited without answering, i.e. Blender crashed
+                error = f"Worker exited with code {self._stop()}"
+                break
+            result = parse_result(line)
+            if result is not None:
+                result["log"] = log_path
+                return result
+
+        return {
+            "file": blend_path,
+            "seconds": time.perf_counter() - start,
+            "outputs": [],
+            "error": error,
+            "log": log_path
+        }
+
+    def close(self) -> None:
+        """
+        Lets the worker finish and waits for it to exit
+        """
+        if self._process is not None:
+            self._process.stdin.close()
+            self._stop()
+        self._open_log("")
+
+def log_path_of(blend_path: str, library_dir: str, output_dir: str) -> str:
+    """
+    Gets the path of a blend file's log, next to its output
+
+    Parameters:
+    blend_path (str): path of the blend file
+    library_dir (str): root directory of the library
+    output_dir (str): root directory of the output tree
+
+    Returns:
+    (str): path of the log
+    """
+    rel_path = os.path.relpath(blend_path, library_dir)
+    return os.path.join(output_dir, f"{os.path.splitext(rel_path)[0]}.log")
+
+def run_batch(
+    blend_paths: list[str],
+    worker_command: list[str],
+    num_jobs: int,
+    library_dir: str,
+    output_dir: str,
+    timeout: float | None
+) -> list[dict]:
+    """
+    Spreads blend files over a pool of worker processes
+
+    Parameters:
+    blend_paths (list[str]): blend files to export
+    worker_command (list[str]): command starting a worker
+    num_jobs (int): number of worker processes
+    library_dir (str): root directory of the library
+    output_dir (str): root directory of the output tree, where logs of 
+        what workers printed to stderr are written
+    timeout (float | None): seconds a file may take to export, None to 
+        wait indefinitely
+
+    Returns:
+    (list[dict]): result of each export, in the order they finished. Logs
+        left empty are removed, and their path is None
+    """
+    pending: queue.Queue[str] = queue.Queue()
+    for blend_path in blend_paths:
+        pending.put(blend_path)
+
+    results: list[dict] = []
+    lock = threading.Lock()
+
+    def work() -> None:
+        worker = WorkerProcess(worker_command, timeout)
+        try:
+            while True:
+                try:
+                    blend_path = pending.get_nowait()
+                except queue.Empty:
+                    return
+                result = worker.export(
+                    blend_path, 
+                    log_path_of(blend_path, library_dir, output_dir)
+                )
+                with lock:
+                    results.append(result)
+                    status = "failed" if result["error"] else "done"
+                    print(f"[{len(results)}/{len(blend_paths)}] {status} "
+                          f"{blend_path} ({result['seconds']:.2f} s)")
+        finally:
+            worker.close()
+
+    threads = [threading.Thread(target=work)
+               for _ in range(min(num_jobs, len(blend_paths)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for result in results:
+        if not os.path.exists(result["log"]):
+            result["log"] = None
+    return results
+
+def summarize(results: list[dict], num_jobs: int, wall_seconds: float) -> dict:
+    """
+    Summarizes a batch export
+
+    Parameters:
+    results (list[dict]): result of each export
+    num_jobs (int): number of worker processes
+    wall_seconds (float): duration of the whole batch
+
+    Returns:
+    (dict): the summary
+    """
+    results = sorted(results, key=lambda result: result["file"])
+    failures = [result for result in results if result["error"]]
+    export_seconds = sum(result["seconds"] for result in results)
+    return {
+        "files": len(results),
+        "succeeded": len(results) - len(failures),
+        "failed": len(failures),
+        "jobs": num_jobs,
+        "wall_seconds": wall_seconds,
+        "export_seconds": export_seconds,
+        "files_per_second": len(results) / wall_seconds if wall_seconds else 0,
+        "failures": [{"file": result["file"], "error": result["error"],
+                      "log": result["log"]}
+                     for result in failures],
+        "results": results,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export every .blend file in an asset library"
+    )
+    parser.add_argument("library_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("--blender", default="blender",
+                        help="Blender executable")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes")
+    parser.add_argument("--mode", choices=['SCRIPT', 'ADDON'],
+                        default='SCRIPT',
+                        help="Write a script or an add-on per blend file")
+    parser.add_argument("--standin", action="store_true",
+                        help="Use a stand-in worker that doesn't need Blender")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Seconds a file may take to export before its "
+                             "worker is killed, 0 to wait indefinitely")
+    args = parser.parse_args()
+
+    library_dir = os.path.abspath(args.library_dir)
+    output_dir = os.path.abspath(args.output_dir)
+    worker_args = [library_dir, output_dir, args.mode]
+    if args.standin:
+        worker_command = [
+            sys.executable, os.path.join(TOOLS_DIR, "standin_worker.py"),
+            *worker_args
+        ]
+    else:
+        worker_command = [
+            args.blender, "-b", "--factory-startup",
+            "--python", os.path.join(TOOLS_DIR, "worker.py"),
+            "--", *worker_args
+        ]
+
+    blend_paths = find_blend_files(library_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = run_batch(blend_paths, worker_command, max(args.jobs, 1),
+                        library_dir, output_dir, args.timeout or None)
+    summary = summarize(results, max(args.jobs, 1), time.perf_counter() - start)
+
+    summary_path = os.path.join(output_dir, SUMMARY_FILE_NAME)
+    with open(summary_path, 'w', encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+
+    print(f"{summary['succeeded']}/{summary['files']} files exported in "
+          f"{summary['wall_seconds']:.1f} s with {summary['jobs']} workers "
+          f"({summary['files_per_second']:.1f} files/s)")
+    for failure in summary["failures"]:
+        log = f" (see {failure['log']})" if failure["log"] else ""
+        print(f"FAILED {failure['file']}: {failure['error']}{log}")
+    print(f"Summary written to {summary_path}")
+
+    if summary["failed"] > 0:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Stand-in for worker.py that doesn't need Blender, for testing the batch
+driver. Speaks the same protocol: it answers each blend file path read from
+stdin with a result line. Files whose name contains "fail" report an error,
+files whose name contains "crash" make the worker exit, and files whose
+name contains "hang" never finish. Failures are also printed to stderr.
+
+    python tools/batch_export/standin_worker.py LIBRARY_DIR OUTPUT_DIR MODE
+"""
+import os
+import sys
+import time
+
+from worker_protocol import format_result
+
+# Seconds spent "exporting" each file
+EXPORT_SECONDS = float(os.environ.get("NTP_STANDIN_SECONDS", "0.01"))
+
+def main() -> None:
+    library_dir, output_dir, mode = sys.argv[1:4]
+
+    for line in sys.stdin:
+        blend_path = line.rstrip("\n")
+        if blend_path == "":
+            continue
+        start = time.perf_counter()
+        file_name = os.path.basename(blend_path)
+        if "crash" in file_name:
+            print("Segmentation fault", file=sys.stderr, flush=True)
+            sys.exit(3)
+        if "hang" in file_name:
+            while True:
+                time.sleep(1.0)
+        time.sleep(EXPORT_SECONDS)
+
+        outputs = []
+        error = None
+        if "fail" in file_name:
+            error = "RuntimeError: stand-in failure"
+            print(error, file=sys.stderr, flush=True)
+        else:
+            rel_path = os.path.relpath(blend_path, library_dir)
+            script_path = os.path.join(
+                output_dir, f"{os.path.splitext(rel_path)[0]}.py"
+            )
+            os.makedirs(os.path.dirname(script_path), exist_ok=True)
+            with open(script_path, 'w', encoding="utf-8") as file:
+                file.write(f"# Stand-in {mode} export of {rel_path}\n")
+            outputs.append(script_path)
+        seconds = time.perf_counter() - start
+        print(format_result(blend_path, seconds, outputs, error), flush=True)
+
+if __name__ == "__main__":
+    main()
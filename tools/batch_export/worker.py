@@ -0,0 +1,110 @@
+"""
+Batch export worker, run inside a background Blender process by
+batch_export.py. Reads one .blend file path per line from stdin, exports
+every node group, material, world, scene, light and line style in it, and
+answers each path with a result line on stdout.
+
+    blender -b --factory-startup --python tools/batch_export/worker.py -- \
+        LIBRARY_DIR OUTPUT_DIR MODE
+"""
+import os
+import sys
+import time
+import traceback
+
+import bpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from NodeToPython.export import api
+from NodeToPython.export.node_group_gatherer import NODE_TREE_GROUP_TYPES
+
+from worker_protocol import format_result
+
+def gather_data_blocks() -> list[bpy.types.ID]:
+    """
+    Gets every local data block with a node tree in the open blend file
+
+    Returns:
+    (list[ID]): data blocks to export
+    """
+    data_blocks = [node_group for node_group in bpy.data.node_groups
+                   if node_group.library is None
+                   and node_group.bl_idname in NODE_TREE_GROUP_TYPES]
+    for collection in (bpy.data.materials, bpy.data.worlds, bpy.data.lights,
+                       bpy.data.linestyles):
+        data_blocks += [obj for obj in collection
+                        if obj.library is None
+                        and getattr(obj, "node_tree", None) is not None]
+    for scene in bpy.data.scenes:
+        if bpy.app.version >= (5, 0, 0):
+            node_tree = getattr(scene, "compositing_node_group", None)
+        else:
+            node_tree = scene.node_tree if scene.use_nodes else None
+        if scene.library is None and node_tree is not None:
+            data_blocks.append(scene)
+    return data_blocks
+
+def export_file(
+    blend_path: str,
+    library_dir: str,
+    output_dir: str,
+    mode: str
+) -> list[str]:
+    """
+    Exports a blend file into the output tree, mirroring its location in the
+    library
+
+    Parameters:
+    blend_path (str): path of the blend file
+    library_dir (str): root directory of the library
+    output_dir (str): root directory of the output tree
+    mode (str): 'SCRIPT' or 'ADDON'
+
+    Returns:
+    (list[str]): paths of the files written
+    """
+    bpy.ops.wm.open_mainfile(filepath=blend_path, load_ui=False)
+    data_blocks = gather_data_blocks()
+    if len(data_blocks) == 0:
+        return []
+
+    rel_path = os.path.relpath(blend_path, library_dir)
+    rel_dir, file_name = os.path.split(rel_path)
+    stem = os.path.splitext(file_name)[0]
+    dir_path = os.path.join(output_dir, rel_dir)
+    os.makedirs(dir_path, exist_ok=True)
+
+    if mode == 'SCRIPT':
+        result = api.export(data_blocks)
+        script_path = os.path.join(dir_path, f"{stem}.py")
+        with open(script_path, 'w', encoding="utf-8") as file:
+            file.write(result.script)
+        return [script_path]
+
+    options = api.ExportOptions(mode='ADDON', dir_path=dir_path, name=stem)
+    return [api.export(data_blocks, options).path]
+
+def main() -> None:
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    library_dir, output_dir, mode = argv[:3]
+
+    for line in sys.stdin:
+        blend_path = line.rstrip("\n")
+        if blend_path == "":
+            continue
+        start = time.perf_counter()
+        outputs = []
+        error = None
+        try:
+            outputs = export_file(blend_path, library_dir, output_dir, mode)
+        except Exception as e:
+            # The traceback ends up in the file's log
+            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - start
+        print(format_result(blend_path, seconds, outputs, error), flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Line protocol between batch_export.py and its workers. The driver writes one
+blend file path per line to a worker's stdin, and the worker answers each
+with a result line on stdout, prefixed so it can be told apart from
+anything else printed (i.e. Blender's own output).
+"""
+import json
+
+# Prefix of result lines
+RESULT_PREFIX = "NTP_RESULT "
+
+def format_result(
+    blend_path: str, 
+    seconds: float, 
+    outputs: list[str], 
+    error: str | None
+) -> str:
+    """
+    Formats the result of exporting a blend file
+
+    Parameters:
+    blend_path (str): path of the blend file
+    seconds (float): time spent exporting it
+    outputs (list[str]): paths of the files written
+    error (str | None): why the export failed, None if it succeeded
+
+    Returns:
+    (str): the result line
+    """
+    result = {
+        "file": blend_path, 
+        "seconds": seconds, 
+        "outputs": outputs, 
+        "error": error
+    }
+    return f"{RESULT_PREFIX}{json.dumps(result)}"
+
+def parse_result(line: str) -> dict | None:
+    """
+    Parses a line printed by a worker
+
+    Parameters:
+    line (str): the line, without its line break
+
+    Returns:
+    (dict | None): the result, or None if the line isn't a result line
+    """
+    if not line.startswith(RESULT_PREFIX):
+        return None
+    return json.loads(line[len(RESULT_PREFIX):])
@@ -0,0 +1,57 @@
+"""
+Compares how long it takes to recreate a large node tree by running the 
+generated script, and by appending it from the .blend file written in BLEND
+mode.
+
+Run from the command line with
+    blender -b --factory-startup --python tools/benchmarks/blend_output.py -- 20000
+where the optional argument is the number of nodes in the exported tree.
+"""
+import os
+import runpy
+import sys
+import tempfile
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import NodeToPython
+from NodeToPython.export.utils import clean_string
+
+from snapshot import create_tree
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    num_nodes = int(argv[0]) if argv else 20000
+
+    NodeToPython.register()
+    scene = bpy.context.scene
+    options = scene.ntp_options
+    slot = scene.ntp_geometry_node_group_slots.add()
+    slot.node_tree = create_tree(num_nodes)
+
+    options.mode = 'SCRIPT'
+    bpy.ops.ntp.export()
+    script = bpy.context.window_manager.clipboard
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        options.mode = 'BLEND'
+        options.dir_path = dir_path
+        bpy.ops.ntp.export()
+        loader_path = os.path.join(dir_path, f"{clean_string(options.name)}.py")
+        loader = runpy.run_path(loader_path)
+
+        start = time.perf_counter()
+        exec(compile(script, "<ntp benchmark>", "exec"), {"__name__": "__main__"})
+        script_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loader["load"]()
+        blend_time = time.perf_counter() - start
+
+    print(f"{num_nodes} nodes")
+    print(f"Script: {script_time * 1000:.2f} ms")
+    print(f"Blend:  {blend_time * 1000:.2f} ms")
@@ -0,0 +1,53 @@
+"""
+Compares the generated script of a large node tree with and without compact
+output: its size, how long Python takes to compile it, and how long Blender
+takes to run it.
+
+Run from the command line with
+    blender -b --factory-startup --python tools/benchmarks/compact_output.py -- 2000
+where the optional argument is the number of nodes in the exported tree.
+"""
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import NodeToPython
+
+from snapshot import create_tree
+
+def export_script(compact_output: bool) -> str:
+    bpy.context.scene.ntp_options.compact_output = compact_output
+    bpy.ops.ntp.export()
+    return bpy.context.window_manager.clipboard
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    num_nodes = int(argv[0]) if argv else 2000
+
+    NodeToPython.register()
+    scene = bpy.context.scene
+    scene.ntp_options.mode = 'SCRIPT'
+    slot = scene.ntp_geometry_node_group_slots.add()
+    slot.node_tree = create_tree(num_nodes)
+
+    print(f"{num_nodes} nodes")
+    for compact_output in (False, True):
+        script = export_script(compact_output)
+
+        start = time.perf_counter()
+        code = compile(script, "<ntp benchmark>", "exec")
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exec(code, {"__name__": "__main__"})
+        run_time = time.perf_counter() - start
+
+        label = "Compact:" if compact_output else "Default:"
+        print(f"{label} {len(script.encode()) / 1024:.1f} KiB, "
+              f"compile {compile_time * 1000:.2f} ms, "
+              f"run {run_time * 1000:.2f} ms")
@@ -0,0 +1,118 @@
+"""
+Checks that the export cache only regenerates the node trees that changed,
+using the fake bpy in fake_blender/ so Blender isn't needed. Exports an
+add-on of synthetic geometry node groups twice with the export cache, then
+again after editing one group, and again after adding a group that's
+exported before the others, and checks the cache hits and misses and that
+the output matches an export without the cache each time. Exits with status
+1 if any check fails.
+
+Run from the command line with
+    python tools/benchmarks/export_cache.py 50 100
+where the optional arguments are the number of node groups and the number
+of nodes in each.
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import zipfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", ".."))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "fake_blender"))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import bpy
+
+from NodeToPython.export import api
+
+from synthetic_trees import _available_idnames, _make_tree
+
+def make_groups(num_groups: int, num_nodes: int) -> list[bpy.types.NodeTree]:
+    rng = random.Random(0)
+    idnames = _available_idnames(
+        ("GeometryNode", "FunctionNode", "ShaderNodeMath"), set()
+    )
+    return [_make_tree(rng, 'GeometryNodeTree', f"Group {i}", num_nodes,
+                       idnames, [])
+            for i in range(num_groups)]
+
+def export(
+    groups: list[bpy.types.NodeTree],
+    dir_path: str,
+    use_export_cache: bool
+) -> tuple[str, int, int, float]:
+    """
+    Exports node groups as an add-on
+
+    Parameters:
+    groups (list[NodeTree]): node groups to export
+    dir_path (str): directory to save the add-on and export cache to
+    use_export_cache (bool): whether to use the export cache
+
+    Returns:
+    (tuple[str, int, int, float]): contents of the add-on's files, cache
+        hits, cache misses and seconds taken
+    """
+    options = api.ExportOptions(mode='ADDON', dir_path=dir_path,
+                                name="Cache Test",
+                                use_export_cache=use_export_cache)
+    start = time.perf_counter()
+    result = api.export(groups, options)
+    seconds = time.perf_counter() - start
+
+    with zipfile.ZipFile(result.path) as zip_file:
+        files = "".join(f"# {name}\n{zip_file.read(name).decode()}"
+                        for name in sorted(zip_file.namelist()))
+    hits, misses = 0, 0
+    for type, message in result.reports:
+        match = re.search(r"export cache: (\d+) hits, (\d+) misses", message)
+        if match is not None:
+            hits, misses = int(match[1]), int(match[2])
+    return files, hits, misses, seconds
+
+if __name__ == "__main__":
+    num_groups = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    num_nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    groups = make_groups(num_groups, num_nodes)
+    failed = False
+    with tempfile.TemporaryDirectory() as cached_dir, \
+         tempfile.TemporaryDirectory() as uncached_dir:
+        def check(label: str, expected_hits: int, expected_misses: int):
+            global failed
+            files, hits, misses, seconds = export(groups, cached_dir, True)
+            uncached_files, _, _, uncached_seconds = export(
+                groups, uncached_dir, False
+            )
+            ok = ((hits, misses) == (expected_hits, expected_misses)
+                  and files == uncached_files)
+            failed = failed or not ok
+            print(f"{label}: {hits} hits, {misses} misses "
+                  f"(expected {expected_hits}, {expected_misses}), "
+                  f"{seconds * 1000:.1f} ms, without cache "
+                  f"{uncached_seconds * 1000:.1f} ms, "
+                  f"{'same' if files == uncached_files else 'DIFFERENT'} "
+                  f"output")
+
+        check("First export", 0, num_groups)
+        check("Unchanged", num_groups, 0)
+
+        edited = groups[num_groups // 2]
+        edited.nodes[1].location = (edited.nodes[1].location[0] + 100.0,
+                                    edited.nodes[1].location[1])
+        check(f"Edited {edited.name}", num_groups - 1, 1)
+
+        rng = random.Random(1)
+        idnames = _available_idnames(
+            ("GeometryNode", "FunctionNode", "ShaderNodeMath"), set()
+        )
+        groups.insert(0, _make_tree(rng, 'GeometryNodeTree', "Added Group",
+                                    num_nodes, idnames, []))
+        check("Added a group before the others", num_groups, 1)
+
+    print("FAILED" if failed else "OK")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,53 @@
+"""
+Stand-in for Blender's bpy module, covering only what the exporters touch
+"""
+from . import app, path, props, types, utils
+
+class _DataCollection(types.bpy_prop_collection):
+    """
+    Stand-in for a bpy.data collection. Data blocks created with new() get
+    the properties in defaults, standing in for Blender's own defaults
+    """
+    def __init__(self, type_name: str):
+        super().__init__()
+        # Type of the data blocks created with new()
+        self._type_name: str = type_name
+
+        # Property -> value of data blocks created with new()
+        self.defaults: dict[str, object] = {}
+
+    def new(self, name: str, type: str | None = None) -> types.bpy_struct:
+        properties = dict(self.defaults)
+        type_name = self._type_name
+        if type_name == "NodeTree":
+            # node_groups.new() takes the node tree type
+            type_name = type
+            properties.update(bl_idname=type, nodes=types.Nodes(),
+                              links=types.bpy_prop_collection())
+        elif type is not None:
+            # i.e. lights.new() takes the light type
+            properties["type"] = type
+        data_block = getattr(types, type_name)(name=name, library=None,
+                                               **properties)
+        self.append(data_block)
+        return data_block
+
+    def remove(self, data_block: types.bpy_struct) -> None:
+        list.remove(self, data_block)
+
+class _BlendData():
+    """
+    Stand-in for bpy.data, with empty collections
+    """
+    def __init__(self):
+        self.node_groups = _DataCollection("NodeTree")
+        self.materials = _DataCollection("Material")
+        self.images = _DataCollection("Image")
+        self.libraries = _DataCollection("Library")
+        self.scenes = _DataCollection("Scene")
+        self.lights = _DataCollection("Light")
+        self.linestyles = _DataCollection("FreestyleLineStyle")
+        self.worlds = _DataCollection("World")
+
+data = _BlendData()
+context = None
@@ -0,0 +1,21 @@
+import os
+
+version: tuple[int, int, int] = tuple(
+    int(part) 
+    for part in os.environ.get("NTP_FAKE_BLENDER_VERSION", "4.5.0").split(".")
+)
+
+class _Handlers():
+    """
+    Stand-in for bpy.app.handlers, with empty handler lists
+    """
+    def __init__(self):
+        self.load_post: list = []
+        self.undo_post: list = []
+        self.redo_post: list = []
+
+    @staticmethod
+    def persistent(func):
+        return func
+
+handlers = _Handlers()
@@ -0,0 +1,6 @@
+import os
+
+def abspath(path: str) -> str:
+    if path.startswith("//"):
+        return os.path.abspath(os.path.join(".", path[2:]))
+    return path
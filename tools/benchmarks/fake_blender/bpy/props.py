@@ -0,0 +1,24 @@
+"""
+Property definitions, deferred like in Blender: calling a property function
+returns an object holding the function and its keyword arguments
+"""
+
+class _PropertyDeferred():
+    def __init__(self, function, keywords: dict):
+        self.function = function
+        self.keywords = keywords
+
+def _property_function(name: str):
+    def function(**keywords) -> _PropertyDeferred:
+        return _PropertyDeferred(function, keywords)
+    function.__name__ = name
+    return function
+
+BoolProperty = _property_function("BoolProperty")
+CollectionProperty = _property_function("CollectionProperty")
+EnumProperty = _property_function("EnumProperty")
+FloatProperty = _property_function("FloatProperty")
+IntProperty = _property_function("IntProperty")
+IntVectorProperty = _property_function("IntVectorProperty")
+PointerProperty = _property_function("PointerProperty")
+StringProperty = _property_function("StringProperty")
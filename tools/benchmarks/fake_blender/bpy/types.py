@@ -0,0 +1,133 @@
+"""
+Blender types as plain attribute bags. Any type name can be accessed, and is
+created on first access
+"""
+
+class bpy_struct():
+    # Last pointer handed out, so structs have unique, stable pointers
+    _last_pointer: int = 0
+
+    def __init__(self, **properties):
+        bpy_struct._last_pointer += 1
+        self._pointer = bpy_struct._last_pointer
+        for name, value in properties.items():
+            setattr(self, name, value)
+
+    def as_pointer(self) -> int:
+        return self._pointer
+
+    @property
+    def bl_rna(self) -> "bpy_struct":
+        """
+        RNA description built from the struct's attributes
+        """
+        rna_types = {bool: 'BOOLEAN', int: 'INT', float: 'FLOAT', str: 'STRING'}
+        properties = []
+        for name, value in vars(self).items():
+            if name.startswith("_"):
+                continue
+            rna_type = rna_types.get(type(value), 'POINTER')
+            if isinstance(value, tuple):
+                rna_type = 'FLOAT'
+            properties.append(bpy_struct(identifier=name, type=rna_type))
+        return bpy_struct(properties=properties)
+
+class bpy_prop_array(tuple):
+    pass
+
+class bpy_prop_collection(list):
+    def get(self, key: str, default=None):
+        for value in self:
+            if getattr(value, "name", None) == key:
+                return value
+        return default
+
+    def items(self) -> list[tuple[str, object]]:
+        return [(getattr(value, "name", ""), value) for value in self]
+
+    def values(self) -> list:
+        return list(self)
+
+    def foreach_get(self, attr: str, seq: list) -> None:
+        flat = []
+        for value in self:
+            item = getattr(value, attr)
+            if isinstance(item, tuple):
+                flat.extend(item)
+            else:
+                flat.append(item)
+        seq[:] = flat
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            value = self.get(key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return list.__getitem__(self, key)
+
+class Nodes(bpy_prop_collection):
+    """
+    Stand-in for a node tree's nodes, creating nodes with Blender's default
+    size and without sockets or settings
+    """
+    def new(self, type: str) -> bpy_struct:
+        node = __getattr__("Node")(
+            bl_idname=type, name=type, width=140.0, height=100.0,
+            inputs=bpy_prop_collection(), outputs=bpy_prop_collection()
+        )
+        self.append(node)
+        return node
+
+    def remove(self, node: bpy_struct) -> None:
+        list.remove(self, node)
+
+class Operator(bpy_struct):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.reports: list[tuple[set[str], str]] = []
+
+    def report(self, type: set[str], message: str) -> None:
+        self.reports.append((type, message))
+
+class PropertyGroup(bpy_struct):
+    pass
+
+class Panel(bpy_struct):
+    pass
+
+# Type name -> created type
+_types: dict[str, type] = {
+    "bpy_struct": bpy_struct,
+    "bpy_prop_array": bpy_prop_array,
+    "bpy_prop_collection": bpy_prop_collection,
+    "Nodes": Nodes,
+    "Operator": Operator,
+    "PropertyGroup": PropertyGroup,
+    "Panel": Panel,
+}
+
+# Type name -> name of its base type, for types used in isinstance checks
+_BASES: dict[str, str] = {
+    "ID": "bpy_struct",
+    "NodeTree": "ID",
+    "CompositorNodeTree": "NodeTree",
+    "GeometryNodeTree": "NodeTree",
+    "ShaderNodeTree": "NodeTree",
+    "TextureNodeTree": "NodeTree",
+}
+for _id_type in ("Collection", "FreestyleLineStyle", "Image", "Library", 
+                 "Light", "Material", "Object", "Scene", "Text", "World"):
+    _BASES[_id_type] = "ID"
+
+def __getattr__(name: str) -> type:
+    if name.startswith("__"):
+        raise AttributeError(name)
+    if name not in _types:
+        base = __getattr__(_BASES[name]) if name in _BASES else bpy_struct
+        _types[name] = type(name, (base,), {})
+    return _types[name]
+
+def __dir__() -> list[str]:
+    # Menus the generated add-ons can be registered to
+    return sorted(set(_types) | {"NODE_MT_add"})
@@ -0,0 +1,11 @@
+import os
+import tempfile
+
+def register_class(cls) -> None:
+    pass
+
+def unregister_class(cls) -> None:
+    pass
+
+def system_resource(type: str) -> str:
+    return os.path.join(tempfile.gettempdir(), "ntp_fake_blender", type.lower())
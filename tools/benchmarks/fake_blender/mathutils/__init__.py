@@ -0,0 +1,40 @@
+"""
+Stand-in for Blender's mathutils module. Vectors, Eulers and Colors are 
+immutable tuples, which is all the exporters need
+"""
+
+class _Sequence(tuple):
+    def __new__(cls, values=(0.0, 0.0, 0.0)):
+        return super().__new__(cls, values)
+
+    def copy(self):
+        return type(self)(self)
+
+class Vector(_Sequence):
+    @property
+    def x(self) -> float:
+        return self[0]
+
+    @property
+    def y(self) -> float:
+        return self[1]
+
+    @property
+    def z(self) -> float:
+        return self[2]
+
+class Euler(_Sequence):
+    pass
+
+class Color(_Sequence):
+    @property
+    def r(self) -> float:
+        return self[0]
+
+    @property
+    def g(self) -> float:
+        return self[1]
+
+    @property
+    def b(self) -> float:
+        return self[2]
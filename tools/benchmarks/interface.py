@@ -0,0 +1,94 @@
+"""
+Compares ordering a node tree's interface items by rescanning each panel's
+items for every panel against grouping them by parent in a single pass, on a
+synthetic interface built with the fake bpy in fake_blender/. Also reports
+how long the exporter takes to generate the interface.
+
+Run from the command line with
+    python tools/benchmarks/interface.py 1000 100
+where the optional arguments are the numbers of sockets and panels.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", ".."))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "fake_blender"))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import bpy
+
+from NodeToPython.export import api
+
+from synthetic_trees import make_interface_tree
+
+def scan_order(node_tree: bpy.types.NodeTree) -> list[str]:
+    items_tree = node_tree.interface.items_tree
+    order = []
+    processed = set()
+
+    def process(parent) -> None:
+        items = items_tree if parent is None else parent.interface_items
+        for item in items:
+            if item.parent.index != -1 and item.parent not in processed:
+                continue
+            if item in processed:
+                continue
+            processed.add(item)
+            order.append(item.name)
+            if item.item_type == 'PANEL':
+                process(item)
+    process(None)
+    return order
+
+def grouped_order(node_tree: bpy.types.NodeTree) -> list[str]:
+    panel_items = {None: []}
+    for item in node_tree.interface.items_tree:
+        parent = item.parent if item.parent.index != -1 else None
+        panel_items.setdefault(parent, []).append(item)
+
+    order = []
+    stack = [iter(panel_items[None])]
+    while len(stack) > 0:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+        order.append(item.name)
+        if item.item_type == 'PANEL':
+            stack.append(iter(panel_items.get(item, [])))
+    return order
+
+def time_func(func, node_tree: bpy.types.NodeTree) -> tuple[float, list]:
+    start = time.perf_counter()
+    result = func(node_tree)
+    return time.perf_counter() - start, result
+
+def time_export(node_tree: bpy.types.NodeTree) -> float:
+    with tempfile.TemporaryDirectory() as dir_path:
+        options = api.ExportOptions(mode='SCRIPT', dir_path=dir_path,
+                                    name="Interface Benchmark",
+                                    profile_export='TIMING')
+        result = api.export([node_tree], options)
+        with open(result.profile_path, 'r', encoding="utf-8") as file:
+            profile = json.load(file)
+    return profile["node_tree_phases"]["interface"]
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    num_sockets = int(argv[0]) if len(argv) > 0 else 1000
+    num_panels = int(argv[1]) if len(argv) > 1 else 100
+
+    node_tree = make_interface_tree(num_sockets, num_panels)
+    scan_time, scanned = time_func(scan_order, node_tree)
+    grouped_time, grouped = time_func(grouped_order, node_tree)
+    if scanned != grouped:
+        raise AssertionError("Grouped interface order doesn't match scan")
+
+    print(f"{num_sockets} sockets, {num_panels} panels")
+    print(f"Scan:    {scan_time * 1000:.2f} ms")
+    print(f"Grouped: {grouped_time * 1000:.2f} ms")
+    print(f"Export:  {time_export(node_tree) * 1000:.2f} ms")
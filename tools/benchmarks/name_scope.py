@@ -0,0 +1,120 @@
+"""
+Compares creating variable names by copying the export's names for every
+node tree, like the exporters used to, against creating them in a child
+NameScope per node tree, on a synthetic export. Node trees get repeating
+names like Blender's "Math.001", and each node tree's function name is
+created in the export's scope after its names, like the exporters do.
+
+Copying costs time per node tree and global name, while a child scope
+costs a lookup in its parent per name, so both are measured with the names
+spread over few large node trees and over many small ones.
+
+Run from the command line with
+    python tools/benchmarks/name_scope.py 100000 1000,10000 5
+where the optional arguments are the total number of names, the numbers of
+node trees to spread them over and the number of runs, of which the
+fastest is reported. Runs of both alternate, so the machine's load affects
+them alike.
+"""
+import copy
+import os
+import random
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", ".."))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "fake_blender"))
+
+from NodeToPython.export.name_scope import NameScope
+from NodeToPython.export.utils import clean_string
+
+BASE_NAMES = ["Math", "Group Input", "Group Output", "Mix", "Set Position",
+              "Vector Math", "Reroute", "Frame", "Combine XYZ", "Value"]
+
+def make_names(num_names: int, num_trees: int) -> list[list[str]]:
+    rng = random.Random(0)
+    names = []
+    for i in range(num_trees):
+        tree_names = [f"Tree {i}"]
+        for j in range(num_names // num_trees - 1):
+            base_name = rng.choice(BASE_NAMES)
+            tree_names.append(f"{base_name}.{j % 200:03d}" if j % 3 else base_name)
+        names.append(tree_names)
+    return names
+
+class CopiedNames():
+    """
+    Variable names of an exporter before NameScope, copied from the export's
+    """
+    def __init__(self, used_vars: dict[str, int]):
+        self._used_vars: dict[str, int] = copy.copy(used_vars)
+
+    def create_var(self, name: str) -> str:
+        if name == "":
+            name = "unnamed"
+        clean_name = clean_string(name)
+        var = clean_name
+        if var in self._used_vars:
+            self._used_vars[var] += 1
+            return f"{clean_name}_{self._used_vars[var]}"
+        else:
+            self._used_vars[var] = 0
+            return clean_name
+
+def copy_names(names: list[list[str]]) -> list[str]:
+    export_names = CopiedNames({})
+    created = []
+    for tree_names in names:
+        tree_names_copy = CopiedNames(export_names._used_vars)
+        for name in tree_names:
+            created.append(tree_names_copy.create_var(name))
+        created.append(export_names.create_var(
+            f"{created[-len(tree_names)]}_node_group"
+        ))
+    return created
+
+def scope_names(names: list[list[str]]) -> list[str]:
+    export_names = NameScope()
+    created = []
+    for tree_names in names:
+        tree_scope = NameScope(export_names)
+        for name in tree_names:
+            created.append(tree_scope.create_var(name))
+        created.append(export_names.create_var(
+            f"{created[-len(tree_names)]}_node_group"
+        ))
+    return created
+
+def time_funcs(
+    funcs: list, 
+    names: list[list[str]], 
+    num_runs: int
+) -> list[tuple[float, list[str]]]:
+    best_times = [float("inf")] * len(funcs)
+    results = [None] * len(funcs)
+    for _ in range(num_runs):
+        for i, func in enumerate(funcs):
+            clean_string.cache_clear()
+            start = time.perf_counter()
+            results[i] = func(names)
+            best_times[i] = min(best_times[i], time.perf_counter() - start)
+    return list(zip(best_times, results))
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    num_names = int(argv[0]) if len(argv) > 0 else 100000
+    tree_counts = argv[1] if len(argv) > 1 else "1000,10000"
+    num_runs = int(argv[2]) if len(argv) > 2 else 5
+
+    for num_trees in map(int, tree_counts.split(",")):
+        names = make_names(num_names, num_trees)
+        (copy_time, copied), (scope_time, scoped) = time_funcs(
+            [copy_names, scope_names], names, num_runs
+        )
+        if copied != scoped:
+            raise AssertionError("Name scopes don't match copied names")
+
+        print(f"{len(copied)} names in {num_trees} node trees")
+        print(f"Copy:  {copy_time * 1000:.2f} ms")
+        print(f"Scope: {scope_time * 1000:.2f} ms")
@@ -0,0 +1,74 @@
+"""
+Measures how much of an export is spent snapshotting node trees into plain
+Python objects, compared to generating code from the snapshot.
+
+Run from the command line with
+    blender -b --factory-startup --python tools/benchmarks/snapshot.py -- 2000
+where the optional argument is the number of nodes in the exported tree.
+"""
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import NodeToPython
+from NodeToPython.export import ntp_operator
+
+def create_tree(num_nodes: int) -> bpy.types.GeometryNodeTree:
+    node_tree = bpy.data.node_groups.new(
+        type='GeometryNodeTree', name="Snapshot Benchmark"
+    )
+    node_tree.interface.new_socket(
+        name="Value", in_out='INPUT', socket_type='NodeSocketFloat'
+    )
+    node_tree.interface.new_socket(
+        name="Value", in_out='OUTPUT', socket_type='NodeSocketFloat'
+    )
+    group_input = node_tree.nodes.new('NodeGroupInput')
+    group_output = node_tree.nodes.new('NodeGroupOutput')
+
+    prev_socket = group_input.outputs[0]
+    for i in range(num_nodes):
+        math = node_tree.nodes.new('ShaderNodeMath')
+        math.operation = 'MULTIPLY_ADD' if i % 2 else 'ADD'
+        math.location = (i * 200.0, 0.0)
+        math.inputs[1].default_value = i * 0.5
+        node_tree.links.new(prev_socket, math.inputs[0])
+        prev_socket = math.outputs[0]
+    node_tree.links.new(prev_socket, group_output.inputs[0])
+    return node_tree
+
+class SnapshotTimer():
+    def __init__(self, snapshot_func):
+        self._snapshot_func = snapshot_func
+        self.elapsed = 0.0
+
+    def __call__(self, node_tree):
+        start = time.perf_counter()
+        snapshot = self._snapshot_func(node_tree)
+        self.elapsed += time.perf_counter() - start
+        return snapshot
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    num_nodes = int(argv[0]) if argv else 2000
+
+    NodeToPython.register()
+    scene = bpy.context.scene
+    scene.ntp_options.mode = 'SCRIPT'
+    slot = scene.ntp_geometry_node_group_slots.add()
+    slot.node_tree = create_tree(num_nodes)
+
+    timer = SnapshotTimer(ntp_operator.snapshot_node_tree)
+    ntp_operator.snapshot_node_tree = timer
+
+    start = time.perf_counter()
+    bpy.ops.ntp.export()
+    total_time = time.perf_counter() - start
+
+    print(f"{num_nodes} nodes")
+    print(f"Snapshot: {timer.elapsed * 1000:.2f} ms")
+    print(f"Emit:     {(total_time - timer.elapsed) * 1000:.2f} ms")
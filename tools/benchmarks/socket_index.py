@@ -0,0 +1,95 @@
+"""
+Compares resolving link socket indices by scanning each node's sockets against
+looking them up in a socket index built once per node.
+
+Run from the command line with
+    blender -b --factory-startup --python tools/benchmarks/socket_index.py -- 200
+where the optional argument is the number of items added to each node.
+"""
+import sys
+import time
+
+import bpy
+
+def create_group(num_items: int) -> bpy.types.GeometryNodeTree:
+    group = bpy.data.node_groups.new(type='GeometryNodeTree', name="Wide Group")
+    for i in range(num_items):
+        group.interface.new_socket(
+            name=f"Input {i}", in_out='INPUT', socket_type='NodeSocketFloat'
+        )
+        group.interface.new_socket(
+            name=f"Output {i}", in_out='OUTPUT', socket_type='NodeSocketFloat'
+        )
+    return group
+
+def create_tree(num_items: int) -> bpy.types.GeometryNodeTree:
+    node_tree = bpy.data.node_groups.new(
+        type='GeometryNodeTree', name="Socket Index Benchmark"
+    )
+    group = node_tree.nodes.new('GeometryNodeGroup')
+    group.node_tree = create_group(num_items)
+
+    bake = node_tree.nodes.new('GeometryNodeBake')
+    capture = node_tree.nodes.new('GeometryNodeCaptureAttribute')
+    menu_switch = node_tree.nodes.new('GeometryNodeMenuSwitch')
+    for i in range(num_items):
+        bake.bake_items.new('FLOAT', f"Bake {i}")
+        capture.capture_items.new('FLOAT', f"Capture {i}")
+        menu_switch.enum_items.new(f"Item {i}")
+
+    chain = [group, bake, capture, menu_switch, group]
+    for from_node, to_node in zip(chain, chain[1:]):
+        outputs = [socket for socket in from_node.outputs if socket.enabled]
+        inputs = [socket for socket in to_node.inputs if socket.enabled]
+        for from_socket, to_socket in zip(outputs, inputs):
+            node_tree.links.new(from_socket, to_socket)
+    return node_tree
+
+def scan_indices(node_tree: bpy.types.NodeTree) -> list[tuple[int, int]]:
+    indices = []
+    for link in node_tree.links:
+        for i, item in enumerate(link.from_node.outputs.items()):
+            if item[1] == link.from_socket:
+                input_idx = i
+                break
+        for i, item in enumerate(link.to_node.inputs.items()):
+            if item[1] == link.to_socket:
+                output_idx = i
+                break
+        indices.append((input_idx, output_idx))
+    return indices
+
+def lookup_indices(node_tree: bpy.types.NodeTree) -> list[tuple[int, int]]:
+    socket_indices: dict[int, int] = {}
+    for node in node_tree.nodes:
+        for i, socket in enumerate(node.inputs):
+            socket_indices[socket.as_pointer()] = i
+        for i, socket in enumerate(node.outputs):
+            socket_indices[socket.as_pointer()] = i
+
+    indices = []
+    for link in node_tree.links:
+        indices.append((
+            socket_indices[link.from_socket.as_pointer()],
+            socket_indices[link.to_socket.as_pointer()]
+        ))
+    return indices
+
+def time_func(func, node_tree: bpy.types.NodeTree) -> tuple[float, list]:
+    start = time.perf_counter()
+    result = func(node_tree)
+    return time.perf_counter() - start, result
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    num_items = int(argv[0]) if argv else 200
+
+    node_tree = create_tree(num_items)
+    scan_time, scanned = time_func(scan_indices, node_tree)
+    lookup_time, looked_up = time_func(lookup_indices, node_tree)
+    if scanned != looked_up:
+        raise AssertionError("Socket index lookup doesn't match scan")
+
+    print(f"{len(node_tree.links)} links, {num_items} items per node")
+    print(f"Scan:   {scan_time * 1000:.2f} ms")
+    print(f"Lookup: {lookup_time * 1000:.2f} ms")
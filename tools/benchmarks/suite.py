@@ -0,0 +1,280 @@
+"""
+Benchmarks the exporters on synthetic geometry, shader and compositor node
+trees of increasing size, using the fake bpy in fake_blender/ so Blender
+isn't needed. For each tree kind and size, reports how long each phase of
+the export takes (snapshotting the node trees, fingerprinting them,
+generating code, and everything else), the peak memory allocated during
+each phase, and the size of the generated script.
+
+Run from the command line with
+    python tools/benchmarks/suite.py --sizes 100 1000 --kinds geometry
+Export options can be set with --option, i.e. --option compact_output=True
+
+Results can be stored as a baseline, and later runs compared against it:
+    python tools/benchmarks/suite.py --save-baseline baseline.json
+    python tools/benchmarks/suite.py --baseline baseline.json --tolerance 0.2
+The comparison exits with status 1 if any measurement got worse by more than
+the tolerance. The largest trees take several minutes to build and export,
+so pass smaller --sizes for quick checks. Timings depend on the machine, so
+baselines should only be compared on the machine they were recorded on.
+"""
+import argparse
+import ast
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", ".."))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "fake_blender"))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from NodeToPython.export import api
+from NodeToPython.export import ntp_operator
+from NodeToPython.export.node_tree_exporter import NodeTreeExporter
+
+from synthetic_trees import TREE_KINDS
+
+# Phases timed on their own, with the function running each
+PHASES = ["snapshot", "fingerprint", "generation"]
+
+# Timings below this many seconds are too noisy to compare with a baseline
+MIN_COMPARED_SECONDS = 0.05
+
+# Version of the baseline file layout
+BASELINE_VERSION = 1
+
+class PhaseRecorder():
+    """
+    Measures the time and peak memory of each export phase, by wrapping the
+    functions running them while it's active
+    """
+    def __init__(self, trace_memory: bool):
+        # Whether to measure peak memory with tracemalloc
+        self._trace_memory: bool = trace_memory
+
+        # Phase -> seconds spent in it
+        self.seconds: dict[str, float] = {phase: 0.0 for phase in PHASES}
+
+        # Phase -> peak bytes allocated while in it, relative to the start
+        # of the export
+        self.peak_bytes: dict[str, int] = {phase: 0 for phase in PHASES}
+
+        # Bytes allocated when the export started
+        self._start_bytes: int = 0
+
+        # Peak bytes allocated outside of the phases
+        self._other_peak: int = 0
+
+        # (owner, attribute, original function) of each wrapped function
+        self._originals: list[tuple[object, str, object]] = []
+
+    def _wrap(self, owner, attr: str, phase: str) -> None:
+        original = getattr(owner, attr)
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            if self._trace_memory:
+                self._other_peak = max(self._other_peak,
+                                       tracemalloc.get_traced_memory()[1])
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.seconds[phase] += time.perf_counter() - start
+                if self._trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    self.peak_bytes[phase] = max(self.peak_bytes[phase],
+                                                 peak - self._start_bytes)
+                    tracemalloc.reset_peak()
+
+        self._originals.append((owner, attr, original))
+        setattr(owner, attr, wrapper)
+
+    def __enter__(self) -> "PhaseRecorder":
+        self._wrap(ntp_operator, "snapshot_node_tree", "snapshot")
+        self._wrap(ntp_operator, "fingerprint_node_tree", "fingerprint")
+        self._wrap(NodeTreeExporter, "export", "generation")
+        if self._trace_memory:
+            tracemalloc.start()
+            self._start_bytes = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._trace_memory:
+            self._other_peak = max(self._other_peak,
+                                   tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        for owner, attr, original in reversed(self._originals):
+            setattr(owner, attr, original)
+        self._originals.clear()
+
+    def total_peak_bytes(self) -> int:
+        """
+        Returns:
+        (int): peak bytes allocated during the whole export, relative to its
+            start
+        """
+        return max(self._other_peak - self._start_bytes,
+                   *self.peak_bytes.values())
+
+def run_case(
+    kind: str,
+    num_nodes: int,
+    options: dict,
+    repeat: int
+) -> dict:
+    """
+    Exports a synthetic tree, timing the fastest of several runs, then once
+    more measuring memory
+
+    Parameters:
+    kind (str): tree kind, a key of TREE_KINDS
+    num_nodes (int): number of nodes in the tree
+    options (dict): export options
+    repeat (int): number of timed runs
+
+    Returns:
+    (dict): seconds per phase, peak bytes per phase and output bytes
+    """
+    data_block = TREE_KINDS[kind](num_nodes)
+    export_options = api.ExportOptions(mode='SCRIPT', **options)
+
+    best = None
+    for _ in range(repeat):
+        with PhaseRecorder(trace_memory=False) as recorder:
+            start = time.perf_counter()
+            result = api.export([data_block], export_options)
+            total = time.perf_counter() - start
+        seconds = dict(recorder.seconds)
+        seconds["other"] = total - sum(recorder.seconds.values())
+        seconds["total"] = total
+        if best is None or total < best["total"]:
+            best = seconds
+
+    with PhaseRecorder(trace_memory=True) as recorder:
+        api.export([data_block], export_options)
+    peak_bytes = dict(recorder.peak_bytes)
+    peak_bytes["total"] = recorder.total_peak_bytes()
+
+    return {
+        "seconds": best,
+        "peak_bytes": peak_bytes,
+        "output_bytes": len(result.script.encode()),
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Finds measurements that got worse than the baseline by more than the
+    tolerance
+
+    Parameters:
+    results (dict): case -> measurements of this run
+    baseline (dict): case -> measurements of the baseline
+    tolerance (float): allowed relative increase, i.e. 0.2 for 20%
+
+    Returns:
+    (list[str]): a description of each regression
+    """
+    regressions = []
+    def check(case: str, name: str, value: float, base: float) -> None:
+        if value > base * (1.0 + tolerance):
+            regressions.append(f"{case} {name}: {base:.6g} -> {value:.6g} "
+                               f"({(value / base - 1.0) * 100:+.1f}%)")
+
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        base = baseline[case]
+        for phase, seconds in result["seconds"].items():
+            base_seconds = base["seconds"].get(phase, 0.0)
+            if base_seconds >= MIN_COMPARED_SECONDS:
+                check(case, f"{phase} time", seconds, base_seconds)
+        for phase, peak in result["peak_bytes"].items():
+            base_peak = base["peak_bytes"].get(phase, 0)
+            if base_peak > 0:
+                check(case, f"{phase} peak memory", peak, base_peak)
+        check(case, "output size", result["output_bytes"],
+              base["output_bytes"])
+    return regressions
+
+def parse_option(option: str) -> tuple[str, object]:
+    name, _, value = option.partition("=")
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+def print_result(case: str, result: dict) -> None:
+    seconds = result["seconds"]
+    peak_bytes = result["peak_bytes"]
+    phases = ", ".join(
+        f"{phase} {seconds[phase] * 1000:.1f} ms"
+        + (f" / {peak_bytes[phase] / 2**20:.1f} MiB"
+           if phase in peak_bytes else "")
+        for phase in PHASES + ["other"]
+    )
+    print(f"{case}: {seconds['total'] * 1000:.1f} ms, "
+          f"{peak_bytes['total'] / 2**20:.1f} MiB peak, "
+          f"{result['output_bytes'] / 1024:.1f} KiB output ({phases})")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the exporters on synthetic node trees"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100, 1000, 10000, 100000],
+                        help="Numbers of nodes in the exported trees")
+    parser.add_argument("--kinds", nargs="+", choices=list(TREE_KINDS),
+                        default=list(TREE_KINDS),
+                        help="Kinds of trees to export")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of timed runs, the fastest is kept")
+    parser.add_argument("--option", action="append", default=[],
+                        metavar="NAME=VALUE",
+                        help="Export option, may be given multiple times")
+    parser.add_argument("--save-baseline", metavar="FILE",
+                        help="Store the results as a baseline")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Compare the results with a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative regression from the baseline")
+    args = parser.parse_args()
+
+    options = dict(parse_option(option) for option in args.option)
+
+    results = {}
+    for kind in args.kinds:
+        for num_nodes in args.sizes:
+            case = f"{kind}/{num_nodes}"
+            results[case] = run_case(kind, num_nodes, options,
+                                     max(args.repeat, 1))
+            print_result(case, results[case])
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding="utf-8") as file:
+            json.dump({"version": BASELINE_VERSION, "options": options,
+                       "results": results}, file, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("version") != BASELINE_VERSION:
+            sys.exit(f"Unsupported baseline {args.baseline}")
+        if baseline.get("options", {}) != options:
+            print(f"Warning: baseline was recorded with options "
+                  f"{baseline.get('options', {})}")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions compared to {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,571 @@
+"""
+Synthetic geometry, shader and compositor node trees of any size, built on
+the fake bpy in fake_blender/ so exporters can be benchmarked without
+Blender. Trees have nested groups, a frame, links, interface panels and
+sockets, and every tenth node is alternately a color ramp or a curve mapping
+node. Geometry trees also have repeat zones. The same size and seed always
+produce the same tree.
+"""
+import random
+
+import bpy
+import mathutils
+from bpy.types import bpy_prop_collection
+
+from NodeToPython.export.node_settings import node_settings, ST, NTPNodeSetting
+
+def _struct(type_name: str, **properties) -> bpy.types.bpy_struct:
+    return getattr(bpy.types, type_name)(**properties)
+
+# Socket idname -> function creating a default value, None for sockets
+# without one
+SOCKET_TYPES = {
+    'NodeSocketFloat': lambda rng: round(rng.random(), 3),
+    'NodeSocketInt': lambda rng: rng.randint(0, 10),
+    'NodeSocketBool': lambda rng: rng.random() > 0.5,
+    'NodeSocketVector':
+        lambda rng: mathutils.Vector((round(rng.random(), 3), 0.0, 1.0)),
+    'NodeSocketColor':
+        lambda rng: bpy.types.bpy_prop_array((1.0, 0.5, 0.25, 1.0)),
+    'NodeSocketString': lambda rng: "text \"quoted\"",
+    'NodeSocketGeometry': None,
+    'NodeSocketRotation': lambda rng: mathutils.Euler((0.0, 0.1, 0.2)),
+    'NodeSocketMenu': lambda rng: "A",
+}
+
+# Interface socket type -> default value, None for sockets without one
+INTERFACE_SOCKET_TYPES = {
+    'NodeTreeInterfaceSocketFloat': 0.5,
+    'NodeTreeInterfaceSocketGeometry': None,
+    'NodeTreeInterfaceSocketColor':
+        bpy.types.bpy_prop_array((1.0, 1.0, 1.0, 1.0)),
+    'NodeTreeInterfaceSocketVector': mathutils.Vector((0.0, 0.0, 0.0)),
+}
+
+# Tree type -> (group node, color ramp node, curve mapping node)
+SPECIAL_NODES = {
+    'GeometryNodeTree':
+        ('GeometryNodeGroup', 'ShaderNodeValToRGB', 'ShaderNodeFloatCurve'),
+    'ShaderNodeTree':
+        ('ShaderNodeGroup', 'ShaderNodeValToRGB', 'ShaderNodeRGBCurve'),
+    'CompositorNodeTree':
+        ('CompositorNodeGroup', 'CompositorNodeValToRGB',
+         'CompositorNodeCurveRGB'),
+}
+
+# Material properties read by the shader exporter
+MATERIAL_PROPERTIES = {
+    "alpha_threshold": 0.5,
+    "blend_method": 'OPAQUE',
+    "diffuse_color": bpy.types.bpy_prop_array((0.8, 0.8, 0.8, 1.0)),
+    "displacement_method": 'BUMP',
+    "line_color": bpy.types.bpy_prop_array((0.0, 0.0, 0.0, 1.0)),
+    "line_priority": 0,
+    "max_vertex_displacement": 0.0,
+    "metallic": 0.0,
+    "paint_active_slot": 0,
+    "paint_clone_slot": 0,
+    "pass_index": 0,
+    "preview_render_type": 'SPHERE',
+    "refraction_depth": 0.0,
+    "roughness": 0.4,
+    "shadow_method": 'OPAQUE',
+    "show_transparent_back": True,
+    "specular_color": mathutils.Color((1.0, 1.0, 1.0)),
+    "specular_intensity": 0.5,
+    "surface_render_method": 'DITHERED',
+    "thickness_mode": 'SPHERE',
+    "use_backface_culling": False,
+    "use_backface_culling_lightprobe_volume": True,
+    "use_backface_culling_shadow": False,
+    "use_preview_world": False,
+    "use_raytrace_refraction": False,
+    "use_screen_refraction": False,
+    "use_sss_translucency": False,
+    "use_thickness_from_shadow": False,
+    "use_transparency_overlap": True,
+    "use_transparent_shadow": False,
+    "volume_intersection_method": 'FAST',
+}
+
+# New materials, i.e. the exporter's reference material when eliding
+# defaults, get the same properties
+bpy.data.materials.defaults.update(MATERIAL_PROPERTIES)
+
+# Compositor node group properties read by the compositor exporter
+COMPOSITOR_TREE_PROPERTIES = {
+    "chunk_size": 'AUTO',
+    "edit_quality": 'HIGH',
+    "execution_mode": 'CPU',
+    "precision": 'AUTO',
+    "render_quality": 'HIGH',
+    "use_groupnode_buffer": True,
+    "use_two_pass": False,
+}
+
+def _available_settings(bl_idname: str) -> list[NTPNodeSetting]:
+    """
+    Gets the settings a node has in the fake Blender's version
+
+    Parameters:
+    bl_idname (str): node type
+
+    Returns:
+    (list[NTPNodeSetting]): settings of the node
+    """
+    version = bpy.app.version
+    node_info = node_settings[bl_idname]
+    return [attr for attr in node_info.attributes_
+            if max(attr.min_version_, node_info.min_version_) <= version
+            < min(attr.max_version_, node_info.max_version_)]
+
+def _available_idnames(prefixes: tuple[str, ...],
+                       excluded: set[str]) -> list[str]:
+    """
+    Gets the node types that can be created on their own in the fake
+    Blender's version, i.e. without groups and zones
+
+    Parameters:
+    prefixes (tuple[str, ...]): prefixes of the node types
+    excluded (set[str]): node types to leave out
+
+    Returns:
+    (list[str]): sorted node types
+    """
+    version = bpy.app.version
+    return sorted(
+        bl_idname for bl_idname, node_info in node_settings.items()
+        if bl_idname.startswith(prefixes) and bl_idname not in excluded
+        and not bl_idname.endswith(("Group", "Input", "Output"))
+        and node_info.min_version_ <= version < node_info.max_version_
+    )
+
+def _setting_value(
+    rng: random.Random,
+    attr: NTPNodeSetting,
+    groups: list[bpy.types.NodeTree]
+):
+    """
+    Creates a value for a node setting
+
+    Parameters:
+    rng (random.Random): random number generator
+    attr (NTPNodeSetting): setting to create a value for
+    groups (list[NodeTree]): node groups group nodes can use
+
+    Returns:
+    value of the setting
+    """
+    st = attr.st_
+    if st == ST.ENUM:
+        return rng.choice(['ADD', 'MULTIPLY', ''])
+    if st == ST.ENUM_SET:
+        return {'X'}
+    if st == ST.STRING:
+        return "str"
+    if st == ST.BOOL:
+        return rng.random() > 0.5
+    if st == ST.INT:
+        return rng.randint(0, 5)
+    if st == ST.FLOAT:
+        return round(rng.random(), 4)
+    if st == ST.VEC1:
+        return bpy.types.bpy_prop_array((0.5,))
+    if st == ST.VEC2:
+        return mathutils.Vector((0.5, 0.25))
+    if st in {ST.VEC3, ST.EULER}:
+        return mathutils.Vector((0.5, 0.25, 1.0))
+    if st == ST.VEC4:
+        return bpy.types.bpy_prop_array((0.5, 0.25, 1.0, 1.0))
+    if st == ST.COLOR:
+        return mathutils.Color((0.5, 0.25, 1.0))
+    if st in {ST.MATERIAL, ST.OBJECT, ST.COLLECTION}:
+        return _struct("ID", name="Data Block") if rng.random() < 0.5 else None
+    if st == ST.COLOR_RAMP:
+        elements = [
+            _struct("ColorRampElement", position=position, alpha=1.0,
+                    color=bpy.types.bpy_prop_array(
+                        (position, position, position, 1.0)))
+            for position in (0.0, 0.5, 1.0)
+        ]
+        return _struct("ColorRamp", color_mode='RGB',
+                       hue_interpolation='NEAR', interpolation='LINEAR',
+                       elements=elements)
+    if st == ST.CURVE_MAPPING:
+        curves = [
+            _struct("CurveMap", points=[
+                _struct("CurveMapPoint", handle_type='AUTO',
+                        location=mathutils.Vector((x, x)))
+                for x in (0.0, 0.4, 1.0)
+            ])
+            for _ in range(4)
+        ]
+        return _struct("CurveMapping", extend='EXTRAPOLATED', tone='STANDARD',
+                       black_level=mathutils.Vector((0.0, 0.0, 0.0)),
+                       white_level=mathutils.Vector((1.0, 1.0, 1.0)),
+                       clip_min_x=0.0, clip_min_y=0.0,
+                       clip_max_x=1.0, clip_max_y=1.0,
+                       use_clip=True, curves=curves)
+    if st == ST.NODE_TREE:
+        return rng.choice(groups) if groups else None
+    if st == ST.IMAGE_USER:
+        return _struct("ImageUser", frame_current=1, frame_duration=1,
+                       frame_offset=0, frame_start=1, tile=0,
+                       use_auto_refresh=False, use_cyclic=False)
+    if st.name.endswith("_ITEMS"):
+        return bpy_prop_collection(
+            _struct("Item", name=f"Item {i}", socket_type='FLOAT',
+                    data_type='FLOAT', attribute_domain='POINT',
+                    domain='POINT', is_attribute=False, description="",
+                    structure_type='AUTO', auto_remove=True,
+                    override_node_format=False, save_as_render=True,
+                    vector_socket_dimensions=3)
+            for i in range(rng.randint(1, 3))
+        )
+    if st == ST.COLOR_MANAGED_DISPLAY_SETTINGS:
+        return _struct("ColorManagedDisplaySettings",
+                       display_device="sRGB", emulation='OFF')
+    if st == ST.COLOR_MANAGED_VIEW_SETTINGS:
+        return _struct("ColorManagedViewSettings",
+                       view_transform="Standard", look="None")
+    return None
+
+def _make_socket(
+    rng: random.Random,
+    name: str,
+    identifier: str,
+    is_output: bool
+) -> bpy.types.NodeSocket:
+    bl_idname = rng.choice(list(SOCKET_TYPES))
+    socket = _struct("NodeSocket", name=name, identifier=identifier,
+                     bl_idname=bl_idname, is_output=is_output,
+                     hide=rng.random() < 0.1, is_linked=False,
+                     is_unavailable=rng.random() < 0.05)
+    if SOCKET_TYPES[bl_idname] is not None:
+        socket.default_value = SOCKET_TYPES[bl_idname](rng)
+    return socket
+
+def _make_node(
+    rng: random.Random,
+    bl_idname: str,
+    name: str,
+    groups: list[bpy.types.NodeTree],
+    num_inputs: int = 3,
+    num_outputs: int = 2
+) -> bpy.types.Node:
+    """
+    Creates a node with random sockets and settings
+
+    Parameters:
+    rng (random.Random): random number generator
+    bl_idname (str): node type
+    name (str): name of the node
+    groups (list[NodeTree]): node groups group nodes can use
+    num_inputs (int): number of input sockets
+    num_outputs (int): number of output sockets
+
+    Returns:
+    (Node): the node
+    """
+    location = mathutils.Vector((rng.randint(-500, 500) * 1.0,
+                                 rng.randint(-500, 500) * 1.0))
+    node = _struct("Node", name=name, bl_idname=bl_idname,
+                   label=name if rng.random() < 0.2 else "",
+                   location=location, width=140.0, height=100.0, parent=None,
+                   use_custom_color=rng.random() < 0.1,
+                   color=mathutils.Color((0.1, 0.2, 0.3)),
+                   mute=rng.random() < 0.05, hide=False,
+                   warning_propagation='ALL')
+    node.inputs = bpy_prop_collection(
+        _make_socket(rng, f"Input {i % 2}", f"input_{i}", False)
+        for i in range(num_inputs)
+    )
+    node.outputs = bpy_prop_collection(
+        _make_socket(rng, f"Output {i % 2}", f"output_{i}", True)
+        for i in range(num_outputs)
+    )
+    # Exported from their output's default value
+    if bl_idname.endswith(("NodeRGB", "NodeNormal")):
+        node.outputs[0].default_value = bpy.types.bpy_prop_array(
+            (0.1, 0.2, 0.3, 1.0)
+        )
+    elif bl_idname.endswith("NodeValue"):
+        node.outputs[0].default_value = 0.5
+    for attr in _available_settings(bl_idname):
+        setattr(node, attr.name_, _setting_value(rng, attr, groups))
+    return node
+
+def _make_interface(
+    rng: random.Random,
+    num_sockets: int,
+    num_panels: int
+) -> bpy.types.NodeTreeInterface:
+    """
+    Creates a node tree interface with sockets spread over nested panels
+
+    Parameters:
+    rng (random.Random): random number generator
+    num_sockets (int): number of sockets
+    num_panels (int): number of panels
+
+    Returns:
+    (NodeTreeInterface): the interface
+    """
+    root = _struct("NodeTreeInterfacePanel", index=-1, name="root",
+                   interface_items=bpy_prop_collection())
+
+    def add(item, parent) -> None:
+        item.parent = parent
+        parent.interface_items.append(item)
+
+    panels = []
+    for i in range(num_panels):
+        panel = _struct("NodeTreeInterfacePanel", item_type='PANEL',
+                        name=f"Panel {i}", default_closed=i % 2 == 0,
+                        description="", interface_items=bpy_prop_collection())
+        add(panel, rng.choice(panels) if panels and rng.random() < 0.5
+                   else root)
+        panels.append(panel)
+
+    for i in range(num_sockets):
+        socket_type = rng.choice(list(INTERFACE_SOCKET_TYPES))
+        socket = _struct(
+            socket_type, item_type='SOCKET', name=f"Socket {i}",
+            in_out=rng.choice(['INPUT', 'OUTPUT']),
+            bl_socket_idname=socket_type.replace("NodeTreeInterfaceSocket",
+                                                 "NodeSocket"),
+            default_attribute_name="", attribute_domain='POINT',
+            hide_value=False, hide_in_modifier=False, force_non_field=False,
+            description="", layer_selection_field=False,
+            is_inspect_output=False, default_input='VALUE',
+            is_panel_toggle=False, menu_expanded=False,
+            structure_type='AUTO', optional_label=False
+        )
+        default_value = INTERFACE_SOCKET_TYPES[socket_type]
+        if default_value is not None:
+            socket.default_value = default_value
+            if socket_type == 'NodeTreeInterfaceSocketFloat':
+                socket.min_value = 0.0
+                socket.max_value = 1.0
+                socket.subtype = 'NONE'
+        add(socket, rng.choice(panels) if panels and rng.random() < 0.7
+                    else root)
+
+    # Flatten in preorder, like Blender's items_tree
+    items = []
+    def flatten(panel) -> None:
+        for item in panel.interface_items:
+            items.append(item)
+            if item.item_type == 'PANEL':
+                flatten(item)
+    flatten(root)
+    for index, item in enumerate(items):
+        item.index = index
+    return _struct("NodeTreeInterface", items_tree=bpy_prop_collection(items))
+
+def _link_nodes(
+    rng: random.Random,
+    nodes: list[bpy.types.Node],
+    num_links: int
+) -> bpy_prop_collection:
+    links = bpy_prop_collection()
+    for _ in range(num_links):
+        from_node, to_node = rng.sample(nodes, 2)
+        if len(from_node.outputs) == 0 or len(to_node.inputs) == 0:
+            continue
+        to_socket = rng.choice(to_node.inputs)
+        to_socket.is_linked = True
+        links.append(_struct("NodeLink", from_node=from_node, to_node=to_node,
+                             from_socket=rng.choice(from_node.outputs),
+                             to_socket=to_socket,
+                             multi_input_sort_id=rng.randint(0, 3)))
+    return links
+
+def _make_tree(
+    rng: random.Random,
+    tree_type: str,
+    name: str,
+    num_nodes: int,
+    idnames: list[str],
+    groups: list[bpy.types.NodeTree]
+) -> bpy.types.NodeTree:
+    """
+    Creates a node tree
+
+    Parameters:
+    rng (random.Random): random number generator
+    tree_type (str): node tree type, i.e. 'GeometryNodeTree'
+    name (str): name of the node tree
+    num_nodes (int): number of nodes, not counting zones and the frame
+    idnames (list[str]): node types to pick from
+    groups (list[NodeTree]): node groups to use in group nodes, every
+        seventh node is a group node if there are any
+
+    Returns:
+    (NodeTree): the node tree
+    """
+    tree = _struct(tree_type, name=name, bl_idname=tree_type,
+                   color_tag='NONE', description="Synthetic node tree",
+                   default_group_node_width=140, library=None,
+                   is_modifier=True, is_tool=False, use_wait_for_click=False,
+                   show_modifier_manage_panel=False)
+    if tree_type == 'CompositorNodeTree':
+        for prop_name, value in COMPOSITOR_TREE_PROPERTIES.items():
+            setattr(tree, prop_name, value)
+    group_idname, color_ramp_idname, curve_idname = SPECIAL_NODES[tree_type]
+
+    nodes = []
+    for i in range(num_nodes):
+        if groups and i % 7 == 0:
+            bl_idname = group_idname
+        elif i % 20 == 10:
+            bl_idname = color_ramp_idname
+        elif i % 20 == 0:
+            bl_idname = curve_idname
+        else:
+            bl_idname = rng.choice(idnames)
+        nodes.append(_make_node(rng, bl_idname, f"{bl_idname} {i}", groups))
+
+    if tree_type == 'GeometryNodeTree':
+        for i in range(max(1, num_nodes // 50)):
+            zone_input = _make_node(rng, 'GeometryNodeRepeatInput',
+                                    f"Repeat Input {i}", [])
+            zone_output = _make_node(rng, 'GeometryNodeRepeatOutput',
+                                     f"Repeat Output {i}", [])
+            zone_input.paired_output = zone_output
+            nodes += [zone_input, zone_output]
+
+    frame = _make_node(rng, 'NodeFrame', "Frame", [], 0, 0)
+    for node in nodes[:len(nodes) // 4]:
+        node.parent = frame
+    nodes.append(frame)
+    for node in nodes:
+        node.id_data = tree
+
+    tree.nodes = bpy_prop_collection(nodes)
+    tree.links = _link_nodes(rng, nodes[:-1], num_nodes)
+    tree.interface = _make_interface(rng,
+                                     max(4, min(num_nodes // 50, 64)),
+                                     max(1, min(num_nodes // 500, 8)))
+    return tree
+
+def _make_groups(
+    rng: random.Random,
+    tree_type: str,
+    num_nodes: int,
+    idnames: list[str],
+    depth: int = 2
+) -> list[bpy.types.NodeTree]:
+    """
+    Creates levels of nested node groups, two per level, each using the
+    groups of the level below
+
+    Parameters:
+    rng (random.Random): random number generator
+    tree_type (str): node tree type
+    num_nodes (int): number of nodes of the tree using the groups
+    idnames (list[str]): node types to pick from
+    depth (int): number of levels
+
+    Returns:
+    (list[NodeTree]): the top level groups
+    """
+    groups = []
+    num_group_nodes = max(10, num_nodes // 10)
+    for level in range(depth):
+        groups = [_make_tree(rng, tree_type, f"Group {level}.{i}",
+                             num_group_nodes, idnames, groups)
+                  for i in range(2)]
+    return groups
+
+def make_geometry_tree(num_nodes: int, seed: int = 0) -> bpy.types.NodeTree:
+    """
+    Creates a geometry node group with nested groups and repeat zones
+
+    Parameters:
+    num_nodes (int): number of nodes in the group
+    seed (int): seed of the random number generator
+
+    Returns:
+    (NodeTree): the geometry node group
+    """
+    rng = random.Random(seed)
+    idnames = _available_idnames(
+        ("GeometryNode", "FunctionNode", "ShaderNodeMath"), set()
+    )
+    groups = _make_groups(rng, 'GeometryNodeTree', num_nodes, idnames)
+    return _make_tree(rng, 'GeometryNodeTree', "Synthetic Geometry",
+                      num_nodes, idnames, groups)
+
+def make_shader_material(num_nodes: int, seed: int = 0) -> bpy.types.Material:
+    """
+    Creates a material with nested shader node groups
+
+    Parameters:
+    num_nodes (int): number of nodes in the material's node tree
+    seed (int): seed of the random number generator
+
+    Returns:
+    (Material): the material
+    """
+    rng = random.Random(seed)
+    # Image textures need images, and are left out
+    idnames = [bl_idname for bl_idname
+               in _available_idnames(("ShaderNode",), set())
+               if not bl_idname.startswith("ShaderNodeTex")
+               or bl_idname == 'ShaderNodeTexNoise']
+    groups = _make_groups(rng, 'ShaderNodeTree', num_nodes, idnames)
+    node_tree = _make_tree(rng, 'ShaderNodeTree', "Shader Nodetree",
+                           num_nodes, idnames, groups)
+    return _struct("Material", name="Synthetic Material",
+                   node_tree=node_tree, **MATERIAL_PROPERTIES)
+
+def make_compositor_tree(num_nodes: int, seed: int = 0) -> bpy.types.NodeTree:
+    """
+    Creates a compositor node group with nested groups
+
+    Parameters:
+    num_nodes (int): number of nodes in the group
+    seed (int): seed of the random number generator
+
+    Returns:
+    (NodeTree): the compositor node group
+    """
+    rng = random.Random(seed)
+    # Image and render layer nodes need data blocks, and are left out
+    idnames = _available_idnames(
+        ("CompositorNode",), {'CompositorNodeImage', 'CompositorNodeRLayers'}
+    )
+    groups = _make_groups(rng, 'CompositorNodeTree', num_nodes, idnames)
+    return _make_tree(rng, 'CompositorNodeTree', "Synthetic Compositor",
+                      num_nodes, idnames, groups)
+
+def make_interface_tree(
+    num_sockets: int,
+    num_panels: int,
+    seed: int = 0
+) -> bpy.types.NodeTree:
+    """
+    Creates a small geometry node group with a large interface
+
+    Parameters:
+    num_sockets (int): number of interface sockets
+    num_panels (int): number of interface panels
+    seed (int): seed of the random number generator
+
+    Returns:
+    (NodeTree): the geometry node group
+    """
+    rng = random.Random(seed)
+    idnames = _available_idnames(("GeometryNode",), set())
+    tree = _make_tree(rng, 'GeometryNodeTree', "Synthetic Interface", 10,
+                      idnames, [])
+    tree.interface = _make_interface(rng, num_sockets, num_panels)
+    return tree
+
+# Tree kind -> function creating a data block of that kind to export
+TREE_KINDS = {
+    "geometry": make_geometry_tree,
+    "shader": make_shader_material,
+    "compositor": make_compositor_tree,
+}